@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Agenda lookup: decisions (with their WHY), resources and documents
+from block metadata (see Neo4jClient.agenda)
+
+Usage:
+    python3 agenda.py decision --concept postgres
+    python3 agenda.py resource --contains auth --days 30
+    python3 agenda.py document --session <session_id> --limit 20
+    python3 agenda.py --backfill    # index blocks of propositions written before the agenda existed
+"""
+
+import sys
+import os
+import argparse
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from storage import Neo4jClient
+from config import Neo4jConfig
+
+
+def print_item(kind, item):
+    print(f"\n• [{(item['timestamp'] or '')[:16]}] {item['content']}")
+    if kind == "decision":
+        print(f"   Decision: {item.get('decision_choice')}")
+        print(f"   WHY: {item.get('decision_reason') or '?'}")
+        if item.get('decision_alternatives'):
+            print(f"   Rejected: {', '.join(item['decision_alternatives'])}")
+    elif kind == "resource":
+        print(f"   URL: {item.get('resource_url')}"
+              + (f" ({item['resource_title']})" if item.get('resource_title') else ""))
+    elif kind == "document":
+        print(f"   File: {item.get('doc_location') or item.get('doc_filename')}"
+              + (f" - {item['doc_purpose']}" if item.get('doc_purpose') else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Typed block lookup over the knowledge graph")
+    parser.add_argument("kind", nargs="?", choices=["decision", "resource", "document"])
+    parser.add_argument("--concept", help="Only items about this concept")
+    parser.add_argument("--session", help="Only this conversation")
+    parser.add_argument("--days", type=int, help="Only the last N days")
+    parser.add_argument("--contains", help="Substring of the choice / URL / file name")
+    parser.add_argument("--limit", type=int, default=20, help="Page size")
+    parser.add_argument("--all", action="store_true", help="Follow pagination to the end")
+    parser.add_argument("--backfill", action="store_true", help="Index blocks of existing propositions")
+    args = parser.parse_args()
+
+    if not args.kind and not args.backfill:
+        parser.error("kind is required (or use --backfill)")
+
+    print("\n" + "="*60)
+    print(f"🗂️  AGENDA: {'backfill' if args.backfill else args.kind}")
+    print("="*60)
+
+    with Neo4jClient(Neo4jConfig.URI, Neo4jConfig.USER, Neo4jConfig.PASSWORD) as neo4j:
+        if args.backfill:
+            neo4j.setup_schema()
+            print(f"✅ {neo4j.index_blocks()} propositions with blocks indexed: {neo4j.agenda_counts()}")
+            return
+
+        since = (datetime.now() - timedelta(days=args.days)).isoformat() if args.days else None
+        cursor, shown = None, 0
+        while True:
+            page = neo4j.agenda(
+                args.kind,
+                concept=args.concept,
+                session_id=args.session,
+                since=since,
+                contains=args.contains,
+                limit=args.limit,
+                cursor=cursor
+            )
+            for item in page['items']:
+                print_item(args.kind, item)
+            shown += len(page['items'])
+            cursor = page['next_cursor']
+            if cursor is None or not args.all:
+                break
+
+        print(f"\n📊 {shown} items" + (" (more: --all)" if cursor else ""))
+
+
+if __name__ == "__main__":
+    main()
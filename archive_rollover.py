@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Seal finished months of the SQLite archive into read-only segments
+data/archive_segments/YYYY-MM.db (compressed, compacted, chmod 444)
+
+Reads stay transparent through storage.SegmentedArchiveDB.
+
+Usage:
+    python3 archive_rollover.py                 # seal all but the newest HOT_PERIODS months
+    python3 archive_rollover.py --keep 3        # keep 3 months hot
+    python3 archive_rollover.py --list          # show segments only
+"""
+
+import sys
+import os
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from storage import SegmentedArchiveDB
+from config import SQLiteConfig
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Roll finished months into sealed archive segments")
+    parser.add_argument("--keep", type=int, default=SQLiteConfig.HOT_PERIODS, help="Months kept hot")
+    parser.add_argument("--list", action="store_true", help="Only list segments")
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("🧊 ARCHIVE ROLLOVER")
+    print("="*60)
+
+    archive = SegmentedArchiveDB(
+        SQLiteConfig.DATABASE_PATH,
+        SQLiteConfig.SEGMENTS_DIR,
+        compression=SQLiteConfig.COMPRESSION,
+        compress_min_bytes=SQLiteConfig.COMPRESS_MIN_BYTES,
+        materialized_lineage=SQLiteConfig.MATERIALIZED_LINEAGE
+    )
+    try:
+        print(f"🔥 Hot months: {', '.join(archive.get_periods()) or '-'}")
+
+        if not args.list:
+            start = time.time()
+            sealed = archive.rollover(keep_periods=args.keep)
+            print(f"✅ Sealed {len(sealed)} month(s) in {time.time() - start:.1f}s")
+
+        for segment in archive.list_segments():
+            print(f"   {segment['period']}  {segment['messages']:>7} msgs  {segment['propositions']:>8} props  "
+                  f"{segment['stored_bytes'] / 1e6:>7.1f} MB  {segment['path']}")
+
+        stats = archive.get_stats()
+        print(f"📊 Total: {stats['messages']} messages, {stats['propositions']} propositions "
+              f"across {stats['segments']['sealed']} sealed segment(s) + hot")
+    finally:
+        archive.close()
+
+    print("="*60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Retrieval benchmarks against the live Neo4j graph
+
+hybrid: recall@k + latency of vector-only vs full-text-only vs hybrid (RRF)
+        on two query sets sampled from the graph:
+        - identifier queries: a block field (URL, filename, decision) as the
+          query; relevant = every proposition mentioning it
+        - semantic queries: a proposition's own embedding; relevant = itself
+filtered: filtered vector search (filter-first / oversampling) vs naive
+          top-k post-filtering - results returned, candidates scanned, latency
+agenda: typed block lookup (Neo4jClient.agenda) vs CONTAINS scans over the
+        block_metadata JSON, on a synthetic tenant ("benchmark") populated
+        to --populate propositions through the normal batch write path
+
+Usage:
+    python3 benchmark_retrieval.py hybrid
+    python3 benchmark_retrieval.py hybrid --queries 200 --k 10 --lexical-weight 2
+    python3 benchmark_retrieval.py filtered --speaker user --type fact --days 7
+    python3 benchmark_retrieval.py agenda --populate 1000000
+    python3 benchmark_retrieval.py agenda --cleanup
+"""
+
+import sys
+import os
+import json
+import time
+import uuid
+import argparse
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from storage import Neo4jClient, EmbeddingGenerator
+from config import Neo4jConfig, RetrievalConfig
+
+
+IDENTIFIER_FIELDS = ("resource_url", "doc_filename", "decision_choice")
+
+BENCH_TENANT = "benchmark"
+BENCH_SESSIONS = 200
+BENCH_CONCEPTS = 2000
+
+
+def percentile_ms(samples, q):
+    return float(np.percentile(samples, q)) * 1000 if samples else 0.0
+
+
+def sample_identifier_queries(neo4j, n):
+    """(identifier, relevant ids) pairs from block metadata."""
+    with neo4j.driver.session() as session:
+        rows = session.run("""
+            MATCH (p:Proposition)
+            WHERE p.block_metadata IS NOT NULL AND p.block_metadata <> '{}'
+            RETURN p.block_metadata AS block_metadata
+            ORDER BY rand()
+            LIMIT $n
+        """, {"n": n * 3}).data()
+
+        identifiers = []
+        for row in rows:
+            blocks = json.loads(row['block_metadata'])
+            for field in IDENTIFIER_FIELDS:
+                if blocks.get(field) and blocks[field] not in identifiers:
+                    identifiers.append(blocks[field])
+                    break
+            if len(identifiers) >= n:
+                break
+
+        queries = []
+        for identifier in identifiers:
+            relevant = session.run("""
+                MATCH (p:Proposition)
+                WHERE p.content CONTAINS $text OR p.block_metadata CONTAINS $text
+                RETURN collect(p.id) AS ids
+            """, {"text": identifier}).single()['ids']
+            queries.append((identifier, set(relevant)))
+    return queries
+
+
+def sample_semantic_queries(neo4j, n):
+    """(content, embedding, {own id}) triples."""
+    with neo4j.driver.session() as session:
+        rows = session.run("""
+            MATCH (p:Proposition)
+            WHERE p.embedding IS NOT NULL
+            RETURN p.id AS id, p.content AS content, p.embedding AS embedding
+            ORDER BY rand()
+            LIMIT $n
+        """, {"n": n}).data()
+    return [(r['content'], r['embedding'], {r['id']}) for r in rows]
+
+
+def run_methods(neo4j, queries, args):
+    """queries: (text, embedding, relevant ids) → per-method recall / latency."""
+    methods = {
+        "vector": lambda text, emb: neo4j.vector_search(emb, k=args.k, min_similarity=0.0),
+        "fulltext": lambda text, emb: neo4j.fulltext_search(text, k=args.k),
+        "hybrid": lambda text, emb: neo4j.hybrid_search(
+            text, emb,
+            k=args.k,
+            candidates=args.candidates,
+            lexical_weight=args.lexical_weight,
+            vector_weight=args.vector_weight,
+            rrf_k=args.rrf_k
+        )
+    }
+
+    report = {}
+    for name, method in methods.items():
+        recalls, latencies = [], []
+        for text, embedding, relevant in queries:
+            start = time.perf_counter()
+            hits = method(text, embedding)
+            latencies.append(time.perf_counter() - start)
+            found = {h['id'] for h in hits}
+            recalls.append(len(found & relevant) / min(len(relevant), args.k) if relevant else 0.0)
+        report[name] = {
+            "recall": float(np.mean(recalls)) if recalls else 0.0,
+            "p50_ms": percentile_ms(latencies, 50),
+            "p95_ms": percentile_ms(latencies, 95)
+        }
+    return report
+
+
+def print_report(title, report, k):
+    print(f"\n{title}")
+    print("-" * 60)
+    for name, row in report.items():
+        print(f"   {name:<9} recall@{k}={row['recall']:.3f}  p50={row['p50_ms']:7.1f}ms  p95={row['p95_ms']:7.1f}ms")
+
+
+def bench_hybrid(neo4j, args):
+    print("🔎 Sampling queries...")
+    identifier_queries = sample_identifier_queries(neo4j, args.queries)
+    semantic_queries = sample_semantic_queries(neo4j, args.queries)
+
+    if identifier_queries:
+        print(f"🧮 Embedding {len(identifier_queries)} identifier queries...")
+        embeddings = EmbeddingGenerator().generate_batch([text for text, _ in identifier_queries])
+        identifier_queries = [(text, emb, relevant) for (text, relevant), emb in zip(identifier_queries, embeddings)]
+
+    # Warm up caches/connection pool so the first query doesn't skew p95
+    for text, embedding, _ in (identifier_queries + semantic_queries)[:5]:
+        neo4j.hybrid_search(text, embedding, k=args.k)
+
+    print_report(f"📏 Identifier queries ({len(identifier_queries)})", run_methods(neo4j, identifier_queries, args), args.k)
+    print_report(f"📏 Semantic queries ({len(semantic_queries)})", run_methods(neo4j, semantic_queries, args), args.k)
+
+
+def bench_filtered(neo4j, args):
+    filters = {
+        "speaker": args.speaker,
+        "types": [args.type] if args.type else None,
+        "is_weak": False,
+        "since": (datetime.now() - timedelta(days=args.days)).isoformat() if args.days else None
+    }
+    print(f"🔎 Filters: {filters}")
+
+    queries = sample_semantic_queries(neo4j, args.queries)
+    naive_counts, naive_latencies = [], []
+    filtered_counts, filtered_latencies, scanned, strategies = [], [], [], {}
+
+    for _, embedding, _ in queries:
+        # Naive: plain top-k, then drop what the filter rejects
+        start = time.perf_counter()
+        hits = neo4j.vector_search(embedding, k=args.k, min_similarity=args.min_similarity)
+        naive_latencies.append(time.perf_counter() - start)
+        naive_counts.append(sum(
+            1 for h in hits
+            if (not filters["speaker"] or h['speaker'] == filters["speaker"])
+            and (not filters["types"] or h['type'] in filters["types"])
+            and not h['is_weak']
+        ))
+
+        start = time.perf_counter()
+        result = neo4j.filtered_vector_search(embedding, k=args.k, min_similarity=args.min_similarity, **filters)
+        filtered_latencies.append(time.perf_counter() - start)
+        filtered_counts.append(len(result['results']))
+        if result['candidates_scanned'] is not None:
+            scanned.append(result['candidates_scanned'])
+        strategies[result['strategy']] = strategies.get(result['strategy'], 0) + 1
+
+    print(f"\n📏 {len(queries)} queries, k={args.k} (naive ignores the time range)")
+    print("-" * 60)
+    print(f"   post-filter  results={np.mean(naive_counts):5.2f}  "
+          f"p50={percentile_ms(naive_latencies, 50):7.1f}ms  p95={percentile_ms(naive_latencies, 95):7.1f}ms")
+    print(f"   filtered     results={np.mean(filtered_counts):5.2f}  "
+          f"p50={percentile_ms(filtered_latencies, 50):7.1f}ms  p95={percentile_ms(filtered_latencies, 95):7.1f}ms  "
+          f"scanned≈{np.mean(scanned) if scanned else float('nan'):.0f}  {strategies}")
+
+
+def populate_agenda(neo4j, total, batch_size=5000, seed=0):
+    """Top the benchmark tenant up to `total` synthetic propositions.
+
+    Mix: 5% decisions, 5% resources, 3% documents; Zipf-distributed
+    concepts; timestamps over the last year; no embeddings.
+    """
+    with neo4j.driver.session() as session:
+        existing = session.run(
+            "MATCH (p:Proposition) WHERE p.tenant_id = $tenant RETURN count(p) AS count",
+            {"tenant": BENCH_TENANT}
+        ).single()['count']
+    if existing >= total:
+        print(f"📦 Benchmark tenant already has {existing} propositions")
+        return
+
+    print(f"📦 Populating {total - existing} synthetic propositions (have {existing})...")
+    neo4j.setup_schema()
+    rng = np.random.default_rng(seed + existing)
+    now = datetime.now()
+    start = time.time()
+    written = existing
+    while written < total:
+        n = min(batch_size, total - written)
+        kinds = rng.random(n)
+        concepts = np.minimum(rng.zipf(1.3, size=(n, 3)), BENCH_CONCEPTS)
+        ages = rng.random(n) * 365 * 86400
+        sessions = rng.integers(0, BENCH_SESSIONS, n)
+
+        rows = []
+        for i in range(n):
+            number = written + i
+            blocks = {}
+            if kinds[i] < 0.05:
+                blocks = {"decision_choice": f"option {number % 97}", "decision_reason": f"because of constraint {number % 31}",
+                          "decision_alternatives": [f"option {(number + 1) % 97}"], "decision_confidence": "high"}
+            elif kinds[i] < 0.10:
+                blocks = {"resource_url": f"https://docs.example.com/{number % 500}/page-{number}",
+                          "resource_type": "docs", "resource_title": f"Page {number}"}
+            elif kinds[i] < 0.13:
+                blocks = {"doc_filename": f"config_{number % 300}.yaml", "doc_location": f"/srv/app/config_{number % 300}.yaml",
+                          "doc_purpose": "service configuration"}
+            rows.append({
+                "id": str(uuid.uuid4()),
+                "content": f"Synthetic proposition {number}",
+                "embedding": None,
+                "type": "decision" if "decision_choice" in blocks else "statement",
+                "certainty": "high",
+                "concepts": [f"concept_{c}" for c in sorted(set(concepts[i]))],
+                "source_message_id": f"bench_msg_{number}",
+                "source_semantic_unit_id": f"bench_su_{number}",
+                "speaker": "user" if i % 2 else "assistant",
+                "timestamp": (now - timedelta(seconds=float(ages[i]))).isoformat(),
+                "block_metadata": blocks,
+                "session_id": f"bench-{sessions[i]:04d}",
+                "tenant_id": BENCH_TENANT
+            })
+        written += neo4j.create_propositions_batch(rows)
+        rate = (written - existing) / (time.time() - start)
+        print(f"   {written}/{total} ({rate:.0f}/s)", end="\r", flush=True)
+    print()
+
+
+def cleanup_agenda(neo4j, batch_size=10000):
+    """Delete the benchmark tenant (Concept nodes left without ABOUT edges too)."""
+    total = 0
+    with neo4j.driver.session() as session:
+        while True:
+            deleted = session.run("""
+                MATCH (p:Proposition) WHERE p.tenant_id = $tenant
+                WITH p LIMIT $limit
+                DETACH DELETE p
+                RETURN count(*) AS count
+            """, {"tenant": BENCH_TENANT, "limit": batch_size}).single()['count']
+            total += deleted
+            if deleted < batch_size:
+                break
+        session.run("MATCH (c:Concept) WHERE NOT (c)<-[:ABOUT]-() DETACH DELETE c")
+    print(f"🗑️  Deleted {total} benchmark propositions")
+
+
+def bench_agenda(neo4j, args):
+    if args.cleanup:
+        cleanup_agenda(neo4j)
+        return
+    if args.populate:
+        populate_agenda(neo4j, args.populate)
+
+    print(f"📊 Agenda items: {neo4j.agenda_counts()}")
+    rng = np.random.default_rng(1)
+    since = (datetime.now() - timedelta(days=30)).isoformat()
+
+    def legacy(kind_field, concept=None, session_id=None, contains=None, skip=0):
+        where = [f"p.block_metadata CONTAINS '\"{kind_field}\"'"]
+        if concept:
+            where.append("$concept IN p.concepts")
+        if session_id:
+            where.append("p.session_id = $session_id")
+        if contains:
+            where.append("p.block_metadata CONTAINS $contains")
+        with neo4j.driver.session() as session:
+            return session.run(f"""
+                MATCH (p:Proposition)
+                WHERE {" AND ".join(where)}
+                RETURN p.id AS id, p.content AS content, p.block_metadata AS block_metadata
+                ORDER BY p.timestamp DESC
+                SKIP $skip LIMIT $limit
+            """, {"concept": concept, "session_id": session_id, "contains": contains,
+                   "skip": skip, "limit": args.page_size}).data()
+
+    def deep_page(kind):
+        cursor = None
+        for _ in range(args.pages):
+            page = neo4j.agenda(kind, limit=args.page_size, cursor=cursor)
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+        return page
+
+    def concept():
+        return f"concept_{min(int(rng.zipf(1.3)), BENCH_CONCEPTS)}"
+
+    def session_id():
+        return f"bench-{rng.integers(0, BENCH_SESSIONS):04d}"
+
+    shapes = [
+        ("decisions, newest page",
+         lambda: neo4j.agenda("decision", limit=args.page_size),
+         lambda: legacy("decision_choice")),
+        ("decisions about concept",
+         lambda: neo4j.agenda("decision", concept=concept(), limit=args.page_size),
+         lambda: legacy("decision_choice", concept=concept())),
+        ("resources in session",
+         lambda: neo4j.agenda("resource", session_id=session_id(), limit=args.page_size),
+         lambda: legacy("resource_url", session_id=session_id())),
+        ("resources, last 30 days",
+         lambda: neo4j.agenda("resource", since=since, limit=args.page_size),
+         None),
+        ("URL contains",
+         lambda: neo4j.agenda("resource", contains=f"/{rng.integers(0, 500)}/", limit=args.page_size),
+         lambda: legacy("resource_url", contains=f"/{rng.integers(0, 500)}/")),
+        (f"documents, page {args.pages}",
+         lambda: deep_page("document"),
+         lambda: legacy("doc_filename", skip=(args.pages - 1) * args.page_size))
+    ]
+
+    print(f"\n📏 {args.queries} queries per shape, page size {args.page_size}")
+    print("-" * 60)
+    for name, agenda_query, legacy_query in shapes:
+        agenda_query()  # Warm up plan cache
+        latencies = []
+        for _ in range(args.queries):
+            start = time.perf_counter()
+            agenda_query()
+            latencies.append(time.perf_counter() - start)
+        line = f"   {name:<24} agenda p50={percentile_ms(latencies, 50):7.1f}ms p95={percentile_ms(latencies, 95):7.1f}ms"
+
+        if legacy_query is not None and not args.skip_legacy:
+            legacy_latencies = []
+            for _ in range(max(1, args.queries // 10)):
+                start = time.perf_counter()
+                legacy_query()
+                legacy_latencies.append(time.perf_counter() - start)
+            line += f" | CONTAINS scan p50={percentile_ms(legacy_latencies, 50):8.1f}ms"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Retrieval benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    hybrid = sub.add_parser("hybrid", help="Vector vs full-text vs hybrid (RRF)")
+    hybrid.add_argument("--queries", type=int, default=100, help="Queries per set")
+    hybrid.add_argument("--k", type=int, default=10)
+    hybrid.add_argument("--candidates", type=int, default=RetrievalConfig.HYBRID_CANDIDATES)
+    hybrid.add_argument("--lexical-weight", type=float, default=RetrievalConfig.LEXICAL_WEIGHT)
+    hybrid.add_argument("--vector-weight", type=float, default=RetrievalConfig.VECTOR_WEIGHT)
+    hybrid.add_argument("--rrf-k", type=int, default=RetrievalConfig.RRF_K)
+
+    filtered = sub.add_parser("filtered", help="Filtered vector search vs post-filtering")
+    filtered.add_argument("--queries", type=int, default=100)
+    filtered.add_argument("--k", type=int, default=10)
+    filtered.add_argument("--min-similarity", type=float, default=0.0)
+    filtered.add_argument("--speaker", choices=["user", "assistant"])
+    filtered.add_argument("--type", help="Proposition type, e.g. fact")
+    filtered.add_argument("--days", type=int, help="Only the last N days")
+
+    agenda = sub.add_parser("agenda", help="Typed block lookup vs CONTAINS scans")
+    agenda.add_argument("--populate", type=int, default=0, help="Top the benchmark tenant up to N propositions")
+    agenda.add_argument("--cleanup", action="store_true", help="Delete the benchmark tenant and exit")
+    agenda.add_argument("--queries", type=int, default=50, help="Queries per shape")
+    agenda.add_argument("--page-size", type=int, default=50)
+    agenda.add_argument("--pages", type=int, default=20, help="Depth of the deep-pagination shape")
+    agenda.add_argument("--skip-legacy", action="store_true", help="Don't run the (slow) CONTAINS baseline")
+
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print(f"⏱️  RETRIEVAL BENCHMARK: {args.command}")
+    print("="*60)
+
+    with Neo4jClient(Neo4jConfig.URI, Neo4jConfig.USER, Neo4jConfig.PASSWORD) as neo4j:
+        if args.command == "hybrid":
+            bench_hybrid(neo4j, args)
+        elif args.command == "filtered":
+            bench_filtered(neo4j, args)
+        elif args.command == "agenda":
+            bench_agenda(neo4j, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Build / refresh cluster summaries for tiered retrieval
+(see SummaryConfig / storage/summaries.py / Neo4jClient.tiered_search)
+
+Run periodically (e.g. nightly): only new or grown clusters are
+re-summarized, new propositions are just linked to their cluster.
+
+Usage:
+    python3 build_summaries.py            # incremental refresh
+    python3 build_summaries.py --retrain  # re-cluster, rewrite every summary
+    python3 build_summaries.py --stats    # cluster stats only
+"""
+
+import sys
+import os
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from dotenv import load_dotenv
+from langchain_anthropic import ChatAnthropic
+
+from storage import Neo4jClient, EmbeddingGenerator, LocalVectorStore, ClusterSummaries
+from config import Neo4jConfig, ExtractionConfig, EmbeddingConfig, VectorStoreConfig, SummaryConfig
+
+load_dotenv()
+
+
+SUMMARY_PROMPT = """These statements were extracted from past conversations and cluster around one theme.
+Write a summary of 2-4 sentences that names the theme and keeps the specifics a later question
+could need (decisions and their reasons, names, tools, URLs, files). Do not invent anything.
+
+Statements (most central first):
+{statements}
+
+Summary:"""
+
+
+def make_summarizer():
+    llm = ChatAnthropic(
+        model=SummaryConfig.MODEL,
+        temperature=0.0,
+        max_tokens=300,
+        api_key=ExtractionConfig.ANTHROPIC_API_KEY
+    )
+
+    def summarize(contents):
+        statements = "\n".join(f"- {content}" for content in contents)
+        return llm.invoke(SUMMARY_PROMPT.format(statements=statements)).content.strip()
+
+    return summarize
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build cluster summaries for tiered retrieval")
+    parser.add_argument("--retrain", action="store_true", help="Re-cluster and rewrite every summary")
+    parser.add_argument("--stats", action="store_true", help="Only print cluster stats")
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("🗂️  CLUSTER SUMMARIES")
+    print("="*60)
+
+    summaries = ClusterSummaries(
+        LocalVectorStore(VectorStoreConfig.PATH, EmbeddingConfig.DIMENSIONS, VectorStoreConfig.BLOCK_ROWS),
+        clusters=SummaryConfig.CLUSTERS,
+        min_cluster_size=SummaryConfig.MIN_CLUSTER_SIZE,
+        max_members=SummaryConfig.MAX_MEMBERS,
+        stale_fraction=SummaryConfig.STALE_FRACTION,
+        growth_factor=SummaryConfig.GROWTH_FACTOR
+    )
+
+    if args.stats:
+        print(f"📊 {summaries.get_stats()}")
+        return
+
+    with Neo4jClient(Neo4jConfig.URI, Neo4jConfig.USER, Neo4jConfig.PASSWORD) as neo4j:
+        neo4j.setup_schema()
+        result = summaries.refresh(
+            neo4j,
+            summarize=make_summarizer(),
+            embed=EmbeddingGenerator().generate_batch,
+            retrain=args.retrain
+        )
+
+    print(f"✅ {result['summarized']} clusters summarized, {result['linked']} new members linked, "
+          f"{result['deleted']} stale summaries deleted ({result['seconds']}s)")
+    print(f"📊 {summaries.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ Clean ALL storage - Neo4j + SQLite
 Fresh start for ReSemantic
 """
 import os
+import shutil
 from neo4j import GraphDatabase
 
 # Neo4j config
@@ -16,6 +17,10 @@ SQLITE_DBS = [
     "./data/resemantic_archive.db",
     "./langgraph_studio/data/resemantic_archive.db"
 ]
+SQLITE_SEGMENT_DIRS = [
+    "./data/archive_segments",
+    "./langgraph_studio/data/archive_segments"
+]
 
 def clean_neo4j():
     """Delete all nodes and relationships from Neo4j."""
@@ -66,6 +71,10 @@ def clean_sqlite():
         if os.path.exists(db_path):
             try:
                 os.remove(db_path)
+                # WAL mode side files
+                for suffix in ("-wal", "-shm"):
+                    if os.path.exists(db_path + suffix):
+                        os.remove(db_path + suffix)
                 print(f"✅ Deleted: {db_path}")
                 deleted += 1
             except Exception as e:
@@ -73,6 +82,13 @@ def clean_sqlite():
         else:
             print(f"⚪ Not found: {db_path}")
     
+    # Sealed monthly archive segments
+    for segments_dir in SQLITE_SEGMENT_DIRS:
+        if os.path.isdir(segments_dir):
+            shutil.rmtree(segments_dir)
+            print(f"✅ Deleted: {segments_dir}")
+            deleted += 1
+
     if deleted > 0:
         print(f"✅ Deleted {deleted} SQLite database(s)")
     else:
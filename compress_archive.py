@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Compress the SQLite archive in place
+Large messages/reasoning (zstd) + metadata JSON (zstd with a trained dictionary)
+
+Usage:
+    python3 compress_archive.py                  # compress plain rows
+    python3 compress_archive.py --train-dict     # train dictionary, re-encode all
+    python3 compress_archive.py --vacuum         # also return freed pages to the OS
+"""
+
+import sys
+import os
+import time
+import argparse
+import sqlite3
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from storage import ArchiveDB
+from config import SQLiteConfig
+
+
+def print_stats(archive: ArchiveDB):
+    for column, stats in archive.get_compression_stats().items():
+        print(f"   {column:<32} {stats['stored_bytes'] / 1e6:>8.1f} MB stored / "
+              f"{stats['raw_bytes'] / 1e6:>8.1f} MB raw  (x{stats['ratio']})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compress archive text/JSON columns")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--train-dict", action="store_true", help="Train a metadata dictionary first")
+    parser.add_argument("--dict-size", type=int, default=32768)
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM afterwards (needs exclusive access)")
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("🗜️  COMPRESS ARCHIVE")
+    print("="*60)
+
+    archive = ArchiveDB(
+        SQLiteConfig.DATABASE_PATH,
+        compression=SQLiteConfig.COMPRESSION,
+        compress_min_bytes=SQLiteConfig.COMPRESS_MIN_BYTES
+    )
+    try:
+        print("📊 Before:")
+        print_stats(archive)
+
+        start = time.time()
+        if args.train_dict:
+            dict_id = archive.train_compression_dictionary(dict_size=args.dict_size)
+            print(f"📖 Trained dictionary #{dict_id}")
+
+        report = archive.compress_existing(batch_size=args.batch_size, recompress=args.train_dict)
+        for column, rows in report.items():
+            print(f"   {column}: {rows} rows rewritten")
+        print(f"⏱️  {time.time() - start:.1f}s")
+
+        print("📊 After:")
+        print_stats(archive)
+    finally:
+        archive.close()
+
+    if args.vacuum:
+        print("🧹 VACUUM...")
+        conn = sqlite3.connect(SQLiteConfig.DATABASE_PATH)
+        conn.execute("VACUUM")
+        conn.close()
+
+    print(f"💾 File size: {os.path.getsize(SQLiteConfig.DATABASE_PATH) / 1e6:.1f} MB")
+    print("="*60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -43,6 +43,15 @@ class ChatConfig:
     ENABLE_REASONING_DISPLAY = os.getenv("ENABLE_REASONING", "false").lower() == "true"
     REASONING_MODEL = "claude-3-5-sonnet-20241022"  # Model with extended thinking support
 
+    # Memory-augmented turns (graph retrieval injected into the prompt)
+    MEMORY_ENABLED = os.getenv("CHAT_MEMORY", "false").lower() == "true"
+    MEMORY_BUDGET_MS = int(os.getenv("CHAT_MEMORY_BUDGET_MS", "150"))  # Embed + retrieve, else no memory
+    MEMORY_MAX_RESULTS = 8  # Propositions injected per turn
+    MEMORY_MAX_CHARS = 1500  # Content budget of the memory section
+
+    # Owner of this CLI's conversations (multi-user deployments)
+    TENANT_ID = os.getenv("CHAT_TENANT_ID", "default")
+
 
 # ═══════════════════════════════════════════════════════════════════
 # EMBEDDING CONFIGURATION
@@ -75,12 +84,62 @@ class Neo4jConfig:
     # Graph Structure
     SIMILARITY_THRESHOLD = 0.4  # Minimum similarity for COHERENT edges
     TOP_K_NEIGHBORS = 10  # Maximum semantic neighbors per proposition
+    MAX_COHERENT_DEGREE = 20  # Degree cap: older nodes evict their weakest edge beyond this
 
     # Edge Types
     TEMPORAL_EDGE = "NEXT"
     SEMANTIC_EDGE = "COHERENT"
 
 
+class RetrievalConfig:
+    """Configuration for Neo4jClient.retrieve (vector seeds + COHERENT expansion)."""
+
+    SEEDS = 5  # Vector-search seeds
+    MAX_HOPS = 2  # COHERENT expansion depth
+    FAN_OUT = 4  # Neighbours followed per node and hop
+    MIN_WEIGHT = 0.5  # Minimum COHERENT weight followed
+    DECAY = 0.7  # Score multiplier per hop
+    MIN_SIMILARITY = 0.3  # Minimum seed similarity
+
+    # Hybrid lexical + vector search (reciprocal rank fusion)
+    HYBRID_CANDIDATES = 50  # Hits taken from each index
+    LEXICAL_WEIGHT = 1.0
+    VECTOR_WEIGHT = 1.0
+    RRF_K = 60  # RRF damping constant
+
+    # Result cache (invalidated by graph writes in this process)
+    CACHE_SIZE = 1024  # Cached retrievals (0 = disabled)
+    CACHE_TTL = 300.0  # Seconds; bounds staleness from other processes' writes
+
+    # Tiered retrieval: cluster summaries first, members only for specific queries
+    TIERED = os.getenv("TIERED_RETRIEVAL", "false").lower() == "true"
+    SUMMARIES = 3  # Summaries per query
+    MEMBER_CANDIDATES = 20  # Members scored per summary
+    MAX_DETAILS = 5  # Member propositions per query
+    DRILL_MARGIN = 0.05  # Member must beat its summary's similarity by this
+
+
+class PPRConfig:
+    """Configuration for personalized PageRank over the in-memory graph snapshot."""
+
+    SNAPSHOT_PATH = "data/graph_snapshot.npz"
+    NEXT_WEIGHT = 0.3  # NEXT edge weight (COHERENT edges use their similarity)
+    ALPHA = 0.15  # Restart probability
+    SEEDS = 10  # Vector-search seeds
+    FULL_EXPORT_INTERVAL = 3600.0  # Seconds between full exports (deltas in between)
+
+
+class SummaryConfig:
+    """Configuration for offline cluster summaries (storage/summaries.py, build_summaries.py)."""
+
+    MODEL = os.getenv("SUMMARY_MODEL", "claude-3-5-haiku-20241022")
+    CLUSTERS = 0  # Thematic clusters (0 = auto, ~sqrt(N)/2)
+    MIN_CLUSTER_SIZE = 5  # Smaller clusters get no summary
+    MAX_MEMBERS = 30  # Central members shown to the summarizer
+    STALE_FRACTION = 0.25  # Re-summarize a cluster after this relative growth
+    GROWTH_FACTOR = 4.0  # Re-cluster after the store grew this much
+
+
 # ═══════════════════════════════════════════════════════════════════
 # SQLITE CONFIGURATION
 # ═══════════════════════════════════════════════════════════════════
@@ -89,6 +148,44 @@ class SQLiteConfig:
     """Configuration for SQLite archival storage."""
 
     DATABASE_PATH = "data/resemantic_archive.db"
+    EMBEDDING_CODEC = "f32"  # "f32" | "f32+zlib" | "f32+zstd"
+    MATERIALIZED_LINEAGE = os.getenv("MATERIALIZED_LINEAGE", "false").lower() == "true"
+    LINEAGE_CACHE_SIZE = 4096  # LRU entries (0 = disabled)
+    COMPRESSION = "zstd"  # "zstd" (zlib if zstandard missing) | "zlib" | "none"
+    COMPRESS_MIN_BYTES = 256  # Shorter text stays plain TEXT
+    SEGMENTS_DIR = "data/archive_segments"  # Sealed monthly segments
+    HOT_PERIODS = 1  # Months kept in the hot archive (incl. the current one)
+
+
+class OutboxConfig:
+    """Configuration for archive-first writes with asynchronous Neo4j projection."""
+
+    ENABLED = os.getenv("OUTBOX_ENABLED", "false").lower() == "true"
+    BATCH_SIZE = 500  # Outbox entries applied per Neo4j round
+    POLL_INTERVAL = 0.5  # Seconds between polls when idle
+    MAX_BACKOFF = 30.0  # Seconds, after repeated Neo4j failures
+    MAX_ATTEMPTS = 5  # Failures before an entry is dead-lettered (outbox_dead)
+
+
+# ═══════════════════════════════════════════════════════════════════
+# LOCAL VECTOR STORE CONFIGURATION
+# ═══════════════════════════════════════════════════════════════════
+
+class VectorStoreConfig:
+    """Configuration for the memory-mapped local embedding mirror."""
+
+    ENABLED = os.getenv("VECTOR_STORE_ENABLED", "true").lower() == "true"
+    PATH = "data/proposition_vectors"  # -> .f32 (matrix) + .ids (id map)
+    BLOCK_ROWS = 65536  # Rows scored per block in brute-force kNN / centroid assignment
+
+
+class ANNIndexConfig:
+    """Configuration for the in-process IVF approximate kNN index (needs the local vector store)."""
+
+    ENABLED = os.getenv("ANN_INDEX_ENABLED", "false").lower() == "true"
+    NLIST = 0  # Number of clusters (0 = auto, ~4*sqrt(N))
+    NPROBE = 8  # Clusters scanned per query (recall ↑, latency ↑)
+    MIN_TRAIN_ROWS = 4096  # Below this, queries fall back to exact search
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -113,7 +210,13 @@ __all__ = [
     'ChatConfig',
     'EmbeddingConfig',
     'Neo4jConfig',
+    'RetrievalConfig',
+    'PPRConfig',
+    'SummaryConfig',
     'SQLiteConfig',
+    'OutboxConfig',
+    'VectorStoreConfig',
+    'ANNIndexConfig',
     'LangSmithConfig'
 ]
 
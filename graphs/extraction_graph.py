@@ -27,6 +27,8 @@ class BatchExtractionState(TypedDict):
     assistant_reasoning: str
     conversation_history: List[Dict]
     timestamp: str
+    session_id: str
+    tenant_id: str
     user_message_id: str
     assistant_message_id: str
     user_semantic_unit: Dict
@@ -46,6 +46,8 @@ class ExtractionStateV2(TypedDict):
     assistant_reasoning: str  # CRITICAL for V2!
     conversation_history: List[Dict]
     timestamp: str
+    session_id: str
+    tenant_id: str
     user_message_id: str
     assistant_message_id: str
     
@@ -6,9 +6,120 @@ Split into 3 separate responsibilities:
 3. create_edges - Create temporal + semantic edges
 """
 
-from typing import Dict
-from storage import Neo4jClient, ArchiveDB, EmbeddingGenerator
-from config import Neo4jConfig, EmbeddingConfig
+import threading
+import uuid
+from datetime import datetime
+from typing import Dict, List
+from storage import Neo4jClient, SegmentedArchiveDB, EmbeddingGenerator, LocalVectorStore, IVFIndex, OutboxProjector
+from config import Neo4jConfig, EmbeddingConfig, SQLiteConfig, VectorStoreConfig, ANNIndexConfig, OutboxConfig
+
+
+# Process-wide local vector mirror (loaded once, appended every turn)
+_vector_store = None
+_vector_store_lock = threading.Lock()
+
+
+def get_vector_store() -> LocalVectorStore:
+    """Get the shared local vector store (lazy-loaded, one per process)."""
+    global _vector_store
+    with _vector_store_lock:
+        if _vector_store is None:
+            _vector_store = LocalVectorStore(
+                VectorStoreConfig.PATH,
+                EmbeddingConfig.DIMENSIONS,
+                block_rows=VectorStoreConfig.BLOCK_ROWS
+            )
+    return _vector_store
+
+
+# Process-wide ANN index over the mirror (optional, see ANNIndexConfig)
+_ann_index = None
+
+
+def get_ann_index() -> IVFIndex:
+    """Get the shared IVF index (lazy-loaded from disk, one per process)."""
+    global _ann_index
+    store = get_vector_store()
+    with _vector_store_lock:
+        if _ann_index is None:
+            _ann_index = IVFIndex(
+                store,
+                nlist=ANNIndexConfig.NLIST,
+                nprobe=ANNIndexConfig.NPROBE,
+                min_train_rows=ANNIndexConfig.MIN_TRAIN_ROWS
+            )
+    return _ann_index
+
+
+def get_archive() -> SegmentedArchiveDB:
+    """
+    Get the shared archive (concurrent threads funnel writes through its writer).
+
+    Segmented: reads (lineage, FTS, graph rows for the projector) keep
+    seeing months sealed by archive_rollover.py.
+    """
+    return SegmentedArchiveDB.shared(
+        SQLiteConfig.DATABASE_PATH,
+        segments_dir=SQLiteConfig.SEGMENTS_DIR,
+        embedding_codec=SQLiteConfig.EMBEDDING_CODEC,
+        materialized_lineage=SQLiteConfig.MATERIALIZED_LINEAGE,
+        lineage_cache_size=SQLiteConfig.LINEAGE_CACHE_SIZE,
+        compression=SQLiteConfig.COMPRESSION,
+        compress_min_bytes=SQLiteConfig.COMPRESS_MIN_BYTES
+    )
+
+
+# Process-wide outbox projector (see OutboxConfig)
+_projector = None
+_projector_lock = threading.Lock()
+
+
+def get_projector() -> OutboxProjector:
+    """Get the shared outbox projector (started on first use, one per process)."""
+    global _projector
+    with _projector_lock:
+        if _projector is None:
+            _projector = OutboxProjector(
+                get_archive(),
+                Neo4jClient(
+                    uri=Neo4jConfig.URI,
+                    user=Neo4jConfig.USER,
+                    password=Neo4jConfig.PASSWORD
+                ),
+                k=Neo4jConfig.TOP_K_NEIGHBORS,
+                min_similarity=Neo4jConfig.SIMILARITY_THRESHOLD,
+                max_degree=Neo4jConfig.MAX_COHERENT_DEGREE,
+                neighbor_search=find_similar,
+                batch_size=OutboxConfig.BATCH_SIZE,
+                poll_interval=OutboxConfig.POLL_INTERVAL,
+                max_backoff=OutboxConfig.MAX_BACKOFF,
+                max_attempts=OutboxConfig.MAX_ATTEMPTS
+            )
+            _projector.start()
+    return _projector
+
+
+def turn_seqs(timestamp: str, count: int) -> List[int]:
+    """Conversation positions for a turn's propositions.
+
+    Turn start in epoch milliseconds, times 1000, plus the position within
+    the turn: increasing across turns of a session even when background
+    extractions finish out of order (link_turn orders the chain by it).
+    """
+    base = int(datetime.fromisoformat(timestamp).timestamp() * 1000) * 1000
+    return [base + i for i in range(count)]
+
+
+def find_similar(neo4j: Neo4jClient, embedding, k: int, min_similarity: float):
+    """
+    Top-k similar propositions: local ANN index if enabled, else Neo4j.
+
+    Returns:
+        List of {"id", "similarity", ...} sorted by similarity (desc)
+    """
+    if ANNIndexConfig.ENABLED:
+        return get_ann_index().search(embedding, k=k, min_similarity=min_similarity)
+    return neo4j.vector_search(query_embedding=embedding, k=k, min_similarity=min_similarity)
 
 
 def generate_embeddings(state: dict) -> Dict:
@@ -69,94 +180,135 @@ def generate_embeddings(state: dict) -> Dict:
 def store_propositions(state: dict) -> Dict:
     """Node 2: Store propositions in Neo4j + SQLite archive.
 
-    Input: all_propositions, proposition_embeddings
+    With OutboxConfig.ENABLED the turn only commits to SQLite (rows + graph
+    outbox entries); the projector writes Neo4j in the background.
+
+    Input: all_propositions, proposition_embeddings, session_id, tenant_id, timestamp
     Output: stored_proposition_ids
     """
     import time
     start = time.time()
 
-    # Initialize storage clients
-    neo4j = Neo4jClient(
-        uri=Neo4jConfig.URI,
-        user=Neo4jConfig.USER,
-        password=Neo4jConfig.PASSWORD
-    )
+    # Initialize storage clients (no Bolt connection in outbox mode)
+    neo4j = None
+    if not OutboxConfig.ENABLED:
+        neo4j = Neo4jClient(
+            uri=Neo4jConfig.URI,
+            user=Neo4jConfig.USER,
+            password=Neo4jConfig.PASSWORD
+        )
 
-    archive = ArchiveDB()
+    archive = get_archive()
     stored_ids = []
 
     try:
-        # 1. Store messages in archive
-        archive.store_message(
-            state['user_message_id'],
-            "user",
-            state['user_message'],
-            state['timestamp']
-        )
-
-        archive.store_message(
-            state['assistant_message_id'],
-            "assistant",
-            state['assistant_message'],
-            state['timestamp']
-        )
+        all_props = state.get('all_propositions', [])
+        embeddings = state.get('proposition_embeddings', [])
 
-        # 1.5 Store reasoning if available (as special message in archive)
+        # Proposition IDs are assigned here so the archive can be written
+        # before (and independently of) Neo4j
+        prop_ids = [str(uuid.uuid4()) for _ in all_props]
+        session_id = state.get('session_id') or "default"
+        tenant_id = state.get('tenant_id') or "default"
+        seqs = turn_seqs(state['timestamp'], len(all_props))
+
+        # 1. Messages (+ reasoning as special message)
+        messages = [
+            {"message_id": state['user_message_id'], "role": "user",
+             "content": state['user_message'], "timestamp": state['timestamp']},
+            {"message_id": state['assistant_message_id'], "role": "assistant",
+             "content": state['assistant_message'], "timestamp": state['timestamp']}
+        ]
         if state.get('assistant_reasoning'):
-            archive.store_message(
-                f"{state['assistant_message_id']}_reasoning",
-                "assistant_reasoning",
-                state['assistant_reasoning'],
-                state['timestamp']
-            )
+            messages.append({
+                "message_id": f"{state['assistant_message_id']}_reasoning",
+                "role": "assistant_reasoning",
+                "content": state['assistant_reasoning'],
+                "timestamp": state['timestamp']
+            })
 
-        # 2. Store semantic units in archive
-        archive.store_semantic_unit(
-            state['user_semantic_unit']['unit_id'],
-            state['user_message_id'],
-            state['user_semantic_unit']['content'],
-            state['user_semantic_unit']
-        )
+        # 2. Semantic units
+        semantic_units = [{
+            "unit_id": state['user_semantic_unit']['unit_id'],
+            "message_id": state['user_message_id'],
+            "content": state['user_semantic_unit']['content'],
+            "metadata": state['user_semantic_unit']
+        }]
 
         # V2: reasoning_semantic_unit, V1: assistant_semantic_unit
         asst_su = state.get('reasoning_semantic_unit') or state.get('assistant_semantic_unit', {})
         if asst_su:
-            archive.store_semantic_unit(
-                asst_su.get('unit_id', state['assistant_message_id']),
-                state['assistant_message_id'],
-                asst_su.get('content', ''),
-                asst_su
-            )
-
-        # 3. Store propositions in Neo4j + archive
-        all_props = state.get('all_propositions', [])
-        embeddings = state.get('proposition_embeddings', [])
-
-        for prop, embedding in zip(all_props, embeddings):
-            # Create in Neo4j
-            neo_prop = neo4j.create_proposition(
-                content=prop['content'],
-                embedding=embedding,
-                type=prop['type'],
-                certainty=prop['certainty'],
-                concepts=prop.get('concepts', []),
-                source_message_id=prop['message_id'],
-                source_semantic_unit_id=prop['semantic_unit_id'],
-                speaker=prop['speaker'],
-                timestamp=state['timestamp'],
-                block_metadata=prop.get('block_metadata', {})
-            )
+            semantic_units.append({
+                "unit_id": asst_su.get('unit_id', state['assistant_message_id']),
+                "message_id": state['assistant_message_id'],
+                "content": asst_su.get('content', ''),
+                "metadata": asst_su
+            })
 
-            prop_id = neo_prop['id']
-            stored_ids.append(prop_id)
+        # 3. Archive the whole turn in one transaction (single commit)
+        with archive.transaction():
+            archive.store_messages_many(messages)
+            archive.store_semantic_units_many(semantic_units)
+            archive.store_propositions_many([
+                {
+                    "proposition_id": prop_id,
+                    "semantic_unit_id": prop['semantic_unit_id'],
+                    "content": prop['content'],
+                    "metadata": {**prop, "session_id": session_id, "seq": seq, "tenant_id": tenant_id},
+                    # Persisted so the graph can be rebuilt without re-embedding
+                    "embedding": embedding,
+                    "embedding_model": EmbeddingConfig.MODEL
+                }
+                for prop_id, prop, embedding, seq in zip(prop_ids, all_props, embeddings, seqs)
+            ])
+
+            # Graph projection, committed atomically with the turn
+            if OutboxConfig.ENABLED and prop_ids:
+                archive.enqueue_outbox(
+                    [{"kind": "node", "payload": {"proposition_id": pid}} for pid in prop_ids]
+                    + [{"kind": "turn", "payload": {
+                        "session_id": session_id,
+                        "proposition_ids": prop_ids,
+                        "first_seq": seqs[0],
+                        "last_seq": seqs[-1]
+                    }}]
+                    + [{"kind": "link", "payload": {"proposition_id": pid}} for pid in prop_ids]
+                )
 
-            # Archive proposition
-            archive.store_proposition(
-                prop_id,
-                prop['semantic_unit_id'],
-                prop['content'],
-                prop
-            )
+        # 4. Create propositions in Neo4j (outbox mode: the projector does)
+        if OutboxConfig.ENABLED:
+            stored_ids.extend(prop_ids)
+            get_projector().notify()
+        else:
+            for prop_id, prop, embedding, seq in zip(prop_ids, all_props, embeddings, seqs):
+                neo4j.create_proposition(
+                    content=prop['content'],
+                    embedding=embedding,
+                    type=prop['type'],
+                    certainty=prop['certainty'],
+                    concepts=prop.get('concepts', []),
+                    source_message_id=prop['message_id'],
+                    source_semantic_unit_id=prop['semantic_unit_id'],
+                    speaker=prop['speaker'],
+                    timestamp=state['timestamp'],
+                    proposition_id=prop_id,
+                    block_metadata=prop.get('block_metadata', {}),
+                    session_id=session_id,
+                    seq=seq,
+                    tenant_id=tenant_id
+                )
+                stored_ids.append(prop_id)
+            Neo4jClient.invalidate_retrieval_cache()
+
+        # 5. Mirror embeddings locally (offline jobs read this, not Bolt)
+        # Best-effort: the mirror can always be rebuilt from the graph
+        if VectorStoreConfig.ENABLED and stored_ids:
+            try:
+                get_vector_store().append(stored_ids, embeddings)
+                if ANNIndexConfig.ENABLED:
+                    get_ann_index().sync()
+            except Exception as e:
+                print(f"⚠️  Local vector store/index update failed (rebuild with `python -m storage.vector_store rebuild`): {e}")
 
         return {
             "stored_proposition_ids": stored_ids,
@@ -171,19 +323,25 @@ def store_propositions(state: dict) -> Dict:
         }
 
     finally:
-        neo4j.close()
-        archive.close()
+        if neo4j is not None:
+            neo4j.close()
 
 
 def create_edges(state: dict) -> Dict:
     """Node 3: Create temporal (NEXT) and semantic (COHERENT) edges.
 
-    Input: stored_proposition_ids, proposition_embeddings
+    In outbox mode the edges were enqueued by store_propositions and are
+    created by the projector, so this is a no-op.
+
+    Input: stored_proposition_ids, proposition_embeddings, session_id, timestamp
     Output: edge_creation_time
     """
     import time
     start = time.time()
 
+    if OutboxConfig.ENABLED:
+        return {"edge_creation_time": time.time() - start}
+
     # Initialize Neo4j client
     neo4j = Neo4jClient(
         uri=Neo4jConfig.URI,
@@ -195,35 +353,34 @@ def create_edges(state: dict) -> Dict:
         stored_ids = state.get('stored_proposition_ids', [])
         embeddings = state.get('proposition_embeddings', [])
 
-        # 1. Create temporal edges (NEXT)
-        prev_prop_id = None
-        for prop_id in stored_ids:
-            if prev_prop_id:
-                neo4j.create_temporal_edge(prev_prop_id, prop_id)
-            prev_prop_id = prop_id
+        # 1. Create temporal edges (NEXT), chained onto the conversation's
+        # previous turn (same seqs as store_propositions)
+        if stored_ids:
+            seqs = turn_seqs(state['timestamp'], len(stored_ids))
+            neo4j.link_turn(state.get('session_id') or "default", stored_ids, seqs[0], seqs[-1])
 
         # 2. Create semantic edges (COHERENT)
         # Link each proposition to its top-K most similar neighbors
         for prop_id, embedding in zip(stored_ids, embeddings):
-            # Vector search for similar propositions
-            similar = neo4j.vector_search(
-                query_embedding=embedding,
+            # Vector search for similar propositions (local ANN or Neo4j)
+            similar = find_similar(
+                neo4j,
+                embedding,
                 k=Neo4jConfig.TOP_K_NEIGHBORS + 1,  # +1 because it includes self
                 min_similarity=Neo4jConfig.SIMILARITY_THRESHOLD
             )
 
-            # Create edges to top neighbors (excluding self)
-            for neighbor in similar:
-                if neighbor['id'] == prop_id:
-                    continue  # Skip self
-
-                # Create semantic edge with exact similarity weight
-                neo4j.create_semantic_edge(
-                    prop_id,
-                    neighbor['id'],
-                    weight=neighbor['similarity'],
-                    created_by="extraction"
-                )
+            # Link to top neighbors (excluding self); neighbors over the
+            # degree cap evict their weakest edge (incremental kNN)
+            neighbors = [n for n in similar if n['id'] != prop_id][:Neo4jConfig.TOP_K_NEIGHBORS]
+            neo4j.link_semantic_neighbors(
+                prop_id,
+                neighbors,
+                max_degree=Neo4jConfig.MAX_COHERENT_DEGREE,
+                created_by="extraction"
+            )
+
+        Neo4jClient.invalidate_retrieval_cache()
 
         return {
             "edge_creation_time": time.time() - start
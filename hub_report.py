@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+COHERENT hub report - worst hubs + traversal cost of the degree cap
+
+Usage:
+    python3 hub_report.py              # report only
+    python3 hub_report.py --refresh    # backfill coherent_degree / knn_radius / scaled_weight
+    python3 hub_report.py --prune      # enforce MAX_COHERENT_DEGREE on existing hubs
+"""
+
+import sys
+import os
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from storage import Neo4jClient
+from config import Neo4jConfig
+
+
+def main():
+    parser = argparse.ArgumentParser(description="COHERENT hub report")
+    parser.add_argument("--limit", type=int, default=20, help="Hubs to list")
+    parser.add_argument("--cap", type=int, default=Neo4jConfig.MAX_COHERENT_DEGREE)
+    parser.add_argument("--refresh", action="store_true", help="Recompute degree accounting first")
+    parser.add_argument("--prune", action="store_true", help="Evict edges above the cap")
+    args = parser.parse_args()
+
+    print("\n" + "="*80)
+    print("🕸️  COHERENT HUB REPORT")
+    print("="*80)
+
+    with Neo4jClient(Neo4jConfig.URI, Neo4jConfig.USER, Neo4jConfig.PASSWORD) as neo4j:
+        if args.refresh:
+            print("🔄 Refreshing degree accounting + local scaling...")
+            neo4j.refresh_coherent_stats(k=Neo4jConfig.TOP_K_NEIGHBORS)
+
+        report = neo4j.hub_report(max_degree=args.cap, limit=args.limit)
+
+        print(f"\n📊 {report['nodes']} propositions | max degree {report['max_degree_seen']} | "
+              f"{report['over_cap']} over cap ({args.cap})")
+
+        print(f"\n🔝 Worst hubs:")
+        for i, hub in enumerate(report['hubs'], 1):
+            radius = f"{hub['knn_radius']:.3f}" if hub['knn_radius'] is not None else "n/a"
+            print(f"   {i:>3}. degree={hub['degree']:<5} radius={radius:<6} {(hub['content'] or '')[:70]}")
+
+        print(f"\n💰 Traversal cost (edges visited from a random start node):")
+        print(f"   1-hop: {report['one_hop']['current']:.1f} → {report['one_hop']['capped']:.1f} (capped)")
+        print(f"   2-hop: {report['two_hop']['current']:.1f} → {report['two_hop']['capped']:.1f} (capped)")
+        print(f"   2-hop saved by cap: {report['two_hop_saved_pct']}%")
+
+        if args.prune:
+            print(f"\n✂️  Enforcing degree cap {args.cap}...")
+            evicted = neo4j.enforce_degree_cap(args.cap)
+            print(f"✅ Evicted {evicted} edges")
+
+    print("="*80 + "\n")
+
+
+if __name__ == "__main__":
+    main()
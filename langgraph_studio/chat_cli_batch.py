@@ -8,7 +8,10 @@ import os
 import sys
 import json
 import asyncio
+import time
 import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime
 from dotenv import load_dotenv
 from langchain_anthropic import ChatAnthropic
@@ -17,7 +20,7 @@ from langchain_anthropic import ChatAnthropic
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from graphs.extraction_graph import graph, invoke_clean
-from config import ChatConfig
+from config import ChatConfig, Neo4jConfig, RetrievalConfig
 
 # Load environment
 load_dotenv()
@@ -40,6 +43,17 @@ else:
 # Conversation history
 conversation_history = []
 message_counter = 0
+# One conversation per CLI run: its propositions share a NEXT chain.
+# Globally unique (sortable prefix + uuid4); message ids are scoped by it
+# so they never collide across restarts or users.
+session_id = f"{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex}"
+
+# Memory-augmented turns (toggle with /memory)
+memory_enabled = ChatConfig.MEMORY_ENABLED
+_memory_clients = None
+_memory_lock = threading.Lock()
+# Retrievals that blow the budget keep running here instead of blocking the turn
+_memory_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="memory")
 
 
 def print_separator():
@@ -110,6 +124,116 @@ def get_conversation_context():
     return "\n".join(context)
 
 
+def get_memory_clients():
+    """Long-lived embedder + Neo4j client (no connection setup inside the budget)."""
+    global _memory_clients
+    with _memory_lock:
+        if _memory_clients is None:
+            from storage import Neo4jClient, EmbeddingGenerator
+            Neo4jClient.retrieval_cache.maxsize = RetrievalConfig.CACHE_SIZE
+            Neo4jClient.retrieval_cache.ttl = RetrievalConfig.CACHE_TTL
+            _memory_clients = (
+                EmbeddingGenerator(),
+                Neo4jClient(
+                    uri=Neo4jConfig.URI,
+                    user=Neo4jConfig.USER,
+                    password=Neo4jConfig.PASSWORD
+                )
+            )
+    return _memory_clients
+
+
+def format_memory_section(results, summaries=None):
+    """Compact prompt section: theme summaries, then one line per proposition with its blocks."""
+    lines = ["Relevant memory from earlier conversations (may be incomplete):"]
+    for summary in summaries or []:
+        lines.append(f"- [theme, {summary['size']} memories] {summary['content']}")
+    for r in results:
+        line = f"- [{r.get('speaker') or '?'}, {r.get('type') or '?'}] {r['content']}"
+
+        blocks = r.get('block_metadata') or {}
+        tags = []
+        if blocks.get('decision_choice'):
+            tag = f"Decision: {blocks['decision_choice']}"
+            if blocks.get('decision_reason'):
+                tag += f" (WHY: {blocks['decision_reason']})"
+            tags.append(tag)
+        if blocks.get('resource_url'):
+            tags.append(f"Resource: {blocks['resource_url']}")
+        if blocks.get('doc_filename'):
+            tags.append(f"Document: {blocks['doc_filename']}")
+        if tags:
+            line += " | " + " | ".join(tags)
+
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def retrieve_memory(user_input, budget_ms=None):
+    """
+    Embed the input and retrieve relevant propositions within a time budget.
+
+    Returns:
+        (memory_section or None, stats dict: results, retrieval_ms,
+         tokens_added, timed_out, error)
+    """
+    budget_ms = budget_ms if budget_ms is not None else ChatConfig.MEMORY_BUDGET_MS
+    start = time.time()
+    deadline = start + budget_ms / 1000
+
+    def _retrieve():
+        embedder, neo4j = get_memory_clients()
+        embedding = embedder.generate(user_input)
+        remaining_ms = int((deadline - time.time()) * 1000)
+        if remaining_ms <= 0:
+            return None
+        if RetrievalConfig.TIERED:
+            tiered = neo4j.tiered_search(
+                embedding,
+                summaries=RetrievalConfig.SUMMARIES,
+                min_similarity=RetrievalConfig.MIN_SIMILARITY,
+                member_candidates=RetrievalConfig.MEMBER_CANDIDATES,
+                max_details=RetrievalConfig.MAX_DETAILS,
+                drill_margin=RetrievalConfig.DRILL_MARGIN
+            )
+            # No summaries built yet: fall through to plain retrieval
+            if tiered['summaries']:
+                return {"results": tiered['details'], "summaries": tiered['summaries'], "timed_out": False}
+        return neo4j.retrieve(
+            embedding,
+            seeds=RetrievalConfig.SEEDS,
+            max_hops=RetrievalConfig.MAX_HOPS,
+            fan_out=RetrievalConfig.FAN_OUT,
+            min_weight=RetrievalConfig.MIN_WEIGHT,
+            decay=RetrievalConfig.DECAY,
+            min_similarity=RetrievalConfig.MIN_SIMILARITY,
+            max_results=ChatConfig.MEMORY_MAX_RESULTS,
+            max_chars=ChatConfig.MEMORY_MAX_CHARS,
+            timeout_ms=remaining_ms
+        )
+
+    stats = {"results": 0, "retrieval_ms": 0.0, "tokens_added": 0, "timed_out": False, "error": None}
+    retrieval = None
+    try:
+        retrieval = _memory_executor.submit(_retrieve).result(timeout=budget_ms / 1000)
+    except FutureTimeoutError:
+        stats["timed_out"] = True
+    except Exception as e:
+        stats["error"] = str(e)
+
+    stats["retrieval_ms"] = round((time.time() - start) * 1000, 1)
+    if retrieval is None or retrieval['timed_out']:
+        stats["timed_out"] = stats["error"] is None
+        return None, stats
+    if not retrieval['results'] and not retrieval.get('summaries'):
+        return None, stats
+
+    section = format_memory_section(retrieval['results'], retrieval.get('summaries'))
+    stats["results"] = len(retrieval['results']) + len(retrieval.get('summaries') or [])
+    stats["tokens_added"] = len(section) // 4  # ~4 chars/token estimate
+    return section, stats
+
+
 def run_extraction_async(batch_input):
     """Run extraction in background thread."""
     def _run():
@@ -162,11 +286,28 @@ def chat_turn(user_input):
     """Process one turn of conversation with FIRE-AND-FORGET extraction."""
     global message_counter
 
+    # Optional memory: retrieved before the call, dropped if over budget
+    memory_section = None
+    if memory_enabled:
+        memory_section, memory_stats = retrieve_memory(user_input)
+        if memory_section:
+            print(f"\n🧠 Memory: {memory_stats['results']} propositions | "
+                  f"{memory_stats['retrieval_ms']:.1f} ms | ~{memory_stats['tokens_added']} tokens added")
+        elif memory_stats['timed_out']:
+            print(f"\n⏱️  Memory skipped: over {ChatConfig.MEMORY_BUDGET_MS} ms budget "
+                  f"({memory_stats['retrieval_ms']:.0f} ms)")
+        elif memory_stats['error']:
+            print(f"\n⚠️  Memory skipped: {memory_stats['error']}")
+        else:
+            print(f"\n🧠 Memory: nothing relevant ({memory_stats['retrieval_ms']:.0f} ms)")
+
     # Get chat response
     print("\n🤖 Assistant: ", end="", flush=True)
 
     # Build messages for chat
     messages = []
+    if memory_section:
+        messages.append({"role": "system", "content": memory_section})
     for msg in conversation_history:
         messages.append({"role": msg['role'], "content": msg['content']})
     messages.append({"role": "user", "content": user_input})
@@ -197,9 +338,9 @@ def chat_turn(user_input):
     conversation_history.append({"role": "assistant", "content": assistant_response})
 
     message_counter += 1
-    user_msg_id = f"msg_{message_counter:03d}"
+    user_msg_id = f"{session_id}_msg_{message_counter:03d}"
     message_counter += 1
-    assistant_msg_id = f"msg_{message_counter:03d}"
+    assistant_msg_id = f"{session_id}_msg_{message_counter:03d}"
 
     # Capture reasoning if available (for storage in graph)
     reasoning_content = None
@@ -213,6 +354,8 @@ def chat_turn(user_input):
         "assistant_reasoning": reasoning_content,  # NEW: reasoning capture
         "conversation_history": conversation_history[:-2],  # All messages BEFORE current pair
         "timestamp": timestamp,
+        "session_id": session_id,
+        "tenant_id": ChatConfig.TENANT_ID,
         "user_message_id": user_msg_id,
         "assistant_message_id": assistant_msg_id
     }
@@ -224,6 +367,8 @@ def chat_turn(user_input):
 
 def main():
     """Main CLI loop."""
+    global memory_enabled
+
     print_separator()
     print("🧠 ReSemantic CLI Chat (FIRE-AND-FORGET Mode)")
     print("Conversational AI with Background Semantic Extraction")
@@ -235,6 +380,9 @@ def main():
     print("  /clear - Clear conversation history")
     print("  /history - Show conversation history")
     print("  /graph - Show Neo4j graph statistics")
+    print(f"  /memory - Toggle memory-augmented answers (now: {'on' if memory_enabled else 'off'})")
+    print("  /cache - Show retrieval / embedding cache hit rates")
+    print("  /session - Show this conversation's graph statistics")
     print_separator()
 
     while True:
@@ -255,6 +403,28 @@ def main():
                 print("\n✅ Conversation history cleared!")
                 continue
 
+            if user_input.lower() == '/memory':
+                memory_enabled = not memory_enabled
+                print(f"\n🧠 Memory {'enabled' if memory_enabled else 'disabled'} "
+                      f"(budget {ChatConfig.MEMORY_BUDGET_MS} ms)")
+                continue
+
+            if user_input.lower() == '/cache':
+                from storage import Neo4jClient, EmbeddingGenerator
+                print("\n🗄️  Caches:")
+                print(f"   Retrieval: {Neo4jClient.get_retrieval_cache_stats()}")
+                print(f"   Query embeddings: {EmbeddingGenerator.query_cache.get_stats()}")
+                continue
+
+            if user_input.lower() == '/session':
+                print(f"\n🧵 Session {session_id} (tenant {ChatConfig.TENANT_ID}):")
+                stats = get_memory_clients()[1].get_session_stats(session_id)
+                if not stats:
+                    print("   No propositions stored yet")
+                for key, value in stats.items():
+                    print(f"   {key}: {value}")
+                continue
+
             if user_input.lower() == '/history':
                 print("\n📜 Conversation History:")
                 for i, msg in enumerate(conversation_history, 1):
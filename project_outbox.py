@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Apply pending archive outbox entries to Neo4j
+(archive-first writes, see OutboxConfig / storage/projector.py)
+
+Usage:
+    python3 project_outbox.py            # drain the outbox once, then exit
+    python3 project_outbox.py --follow   # keep projecting new turns (Ctrl-C to stop)
+    python3 project_outbox.py --stats    # show projection lag only
+    python3 project_outbox.py --dead     # list dead-lettered entries
+    python3 project_outbox.py --requeue-dead  # retry them (after fixing the cause)
+"""
+
+import sys
+import os
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from storage import Neo4jClient, SegmentedArchiveDB, OutboxProjector
+from config import Neo4jConfig, SQLiteConfig, OutboxConfig
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Project archive outbox entries into Neo4j")
+    parser.add_argument("--follow", action="store_true", help="Run as a worker until interrupted")
+    parser.add_argument("--stats", action="store_true", help="Only print outbox lag")
+    parser.add_argument("--dead", action="store_true", help="List dead-lettered entries")
+    parser.add_argument("--requeue-dead", action="store_true", help="Move dead-lettered entries back to the outbox")
+    parser.add_argument("--batch-size", type=int, default=OutboxConfig.BATCH_SIZE)
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("📤 OUTBOX → NEO4J PROJECTION")
+    print("="*60)
+
+    archive = SegmentedArchiveDB(SQLiteConfig.DATABASE_PATH, SQLiteConfig.SEGMENTS_DIR)
+
+    try:
+        stats = archive.get_outbox_stats()
+        print(f"📊 Pending: {stats['pending']} | lag: {stats['lag_seconds']}s | oldest: {stats['oldest_pending_at']} "
+              f"| dead-lettered: {stats['dead_letters']}")
+        if args.dead:
+            for entry in archive.fetch_dead_outbox():
+                print(f"   ☠️  #{entry['seq']} {entry['kind']} {entry['payload']} "
+                      f"({entry['attempts']} attempts): {entry['last_error']}")
+            return
+        if args.requeue_dead:
+            print(f"✅ Requeued {archive.requeue_dead_outbox()} entries")
+            return
+        if args.stats:
+            return
+
+        with Neo4jClient(Neo4jConfig.URI, Neo4jConfig.USER, Neo4jConfig.PASSWORD) as neo4j:
+            projector = OutboxProjector(
+                archive,
+                neo4j,
+                k=Neo4jConfig.TOP_K_NEIGHBORS,
+                min_similarity=Neo4jConfig.SIMILARITY_THRESHOLD,
+                max_degree=Neo4jConfig.MAX_COHERENT_DEGREE,
+                batch_size=args.batch_size,
+                poll_interval=OutboxConfig.POLL_INTERVAL,
+                max_backoff=OutboxConfig.MAX_BACKOFF,
+                max_attempts=OutboxConfig.MAX_ATTEMPTS
+            )
+
+            if not args.follow:
+                start = time.time()
+                projector.drain()
+                elapsed = time.time() - start
+                rate = projector.applied / elapsed if elapsed else 0
+                print(f"✅ Applied {projector.applied} entries in {elapsed:.1f}s ({rate:.0f}/s)")
+                return
+
+            projector.start()
+            print("🔁 Following the outbox (Ctrl-C to stop)...")
+            try:
+                while True:
+                    time.sleep(5)
+                    s = projector.get_stats()
+                    print(f"   pending {s['pending']} | lag {s['lag_seconds']}s | applied {s['applied']} | "
+                          f"last batch {s['last_batch_ms']}ms", end="\r", flush=True)
+            except KeyboardInterrupt:
+                print("\n⏹️  Stopping...")
+                projector.stop()
+    finally:
+        archive.close()
+
+
+if __name__ == "__main__":
+    main()
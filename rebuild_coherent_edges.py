@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Rebuild ALL COHERENT edges from the local vector store
+Exact symmetric top-K, blocked NumPy, batched writes, resumable
+
+Usage:
+    python3 rebuild_coherent_edges.py              # resume or start
+    python3 rebuild_coherent_edges.py --refresh    # re-mirror embeddings first
+    python3 rebuild_coherent_edges.py --k 15 --threshold 0.5
+"""
+
+import sys
+import os
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from storage import Neo4jClient, LocalVectorStore
+from storage.knn_graph import rebuild_coherent_edges
+from config import Neo4jConfig, VectorStoreConfig, EmbeddingConfig
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild COHERENT edges (exact kNN)")
+    parser.add_argument("--k", type=int, default=Neo4jConfig.TOP_K_NEIGHBORS)
+    parser.add_argument("--threshold", type=float, default=Neo4jConfig.SIMILARITY_THRESHOLD)
+    parser.add_argument("--block-rows", type=int, default=1024)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--refresh", action="store_true", help="Rebuild local vector store from Neo4j first")
+    parser.add_argument("--keep-existing", action="store_true", help="Don't delete existing COHERENT edges")
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("🔗 REBUILD COHERENT EDGES")
+    print("="*60)
+
+    store = LocalVectorStore(VectorStoreConfig.PATH, EmbeddingConfig.DIMENSIONS, VectorStoreConfig.BLOCK_ROWS)
+
+    with Neo4jClient(Neo4jConfig.URI, Neo4jConfig.USER, Neo4jConfig.PASSWORD) as neo4j:
+        if args.refresh or len(store) == 0:
+            print("🔄 Mirroring embeddings from Neo4j...")
+            print(f"   {store.rebuild_from_neo4j(neo4j)} embeddings")
+
+        print(f"📊 {len(store)} propositions | k={args.k} | threshold={args.threshold}")
+
+        stats = rebuild_coherent_edges(
+            neo4j,
+            store,
+            k=args.k,
+            min_similarity=args.threshold,
+            block_rows=args.block_rows,
+            write_batch_size=args.batch_size,
+            replace=not args.keep_existing
+        )
+
+        print("⚖️  Refreshing degrees + local scaling, enforcing degree cap...")
+        neo4j.refresh_coherent_stats(k=args.k)
+        evicted = neo4j.enforce_degree_cap(Neo4jConfig.MAX_COHERENT_DEGREE)
+        print(f"   Evicted {evicted} hub edges (cap={Neo4jConfig.MAX_COHERENT_DEGREE})")
+
+    print(f"✅ Done: {stats['edges_written']} edges over {stats['rows']} rows in {stats['seconds']}s")
+    if stats['deleted']:
+        print(f"   Deleted {stats['deleted']} old edges")
+    print("="*60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
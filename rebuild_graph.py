@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Rebuild the whole Neo4j graph from the SQLite archive
+Proposition nodes + NEXT (UNWIND batches), COHERENT (exact kNN), resumable
+
+No re-chatting, no re-embedding: embeddings come from propositions_archive.
+
+Usage:
+    python3 rebuild_graph.py                   # resume or start (wipes graph first)
+    python3 rebuild_graph.py --no-wipe         # MERGE over the existing graph
+    python3 rebuild_graph.py --batch-size 2000
+"""
+
+import sys
+import os
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from storage import Neo4jClient, SegmentedArchiveDB, LocalVectorStore
+from storage.graph_rebuild import rebuild_graph
+from config import Neo4jConfig, SQLiteConfig, VectorStoreConfig, EmbeddingConfig
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the Neo4j graph from the archive")
+    parser.add_argument("--k", type=int, default=Neo4jConfig.TOP_K_NEIGHBORS)
+    parser.add_argument("--threshold", type=float, default=Neo4jConfig.SIMILARITY_THRESHOLD)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--no-wipe", action="store_true", help="Don't delete existing Proposition nodes")
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("🏗️  REBUILD GRAPH FROM ARCHIVE")
+    print("="*60)
+
+    archive = SegmentedArchiveDB(SQLiteConfig.DATABASE_PATH, SQLiteConfig.SEGMENTS_DIR)
+    store = LocalVectorStore(VectorStoreConfig.PATH, EmbeddingConfig.DIMENSIONS, VectorStoreConfig.BLOCK_ROWS)
+
+    try:
+        print(f"📊 Archive: {archive.get_stats()}")
+
+        with Neo4jClient(Neo4jConfig.URI, Neo4jConfig.USER, Neo4jConfig.PASSWORD) as neo4j:
+            stats = rebuild_graph(
+                neo4j,
+                archive,
+                store,
+                k=args.k,
+                min_similarity=args.threshold,
+                max_degree=Neo4jConfig.MAX_COHERENT_DEGREE,
+                model=EmbeddingConfig.MODEL,
+                batch_size=args.batch_size,
+                wipe=not args.no_wipe
+            )
+    finally:
+        archive.close()
+
+    rate = stats['nodes'] / stats['seconds'] if stats['seconds'] else 0
+    print(f"✅ Done in {stats['seconds']}s ({rate:.0f} nodes/s overall)")
+    print(f"   {stats['nodes']} nodes | {stats['next_edges']} NEXT | "
+          f"{stats['coherent_edges']} COHERENT | {stats['evicted']} evicted by cap")
+    if stats['deleted']:
+        print(f"   Deleted {stats['deleted']} old nodes")
+    print("="*60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
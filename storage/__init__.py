@@ -3,6 +3,12 @@ Storage layer for Living Knowledge Ecosystem
 """
 from .neo4j_client import Neo4jClient
 from .archive_db import ArchiveDB
+from .archive_segments import SegmentedArchiveDB
 from .embeddings import EmbeddingGenerator, cosine_similarity
+from .vector_store import LocalVectorStore
+from .ann_index import IVFIndex
+from .projector import OutboxProjector
+from .ppr_graph import GraphSnapshot, ppr_retrieve
+from .summaries import ClusterSummaries
 
-__all__ = ['Neo4jClient', 'ArchiveDB', 'EmbeddingGenerator', 'cosine_similarity']
+__all__ = ['Neo4jClient', 'ArchiveDB', 'SegmentedArchiveDB', 'EmbeddingGenerator', 'cosine_similarity', 'LocalVectorStore', 'IVFIndex', 'OutboxProjector', 'GraphSnapshot', 'ppr_retrieve', 'ClusterSummaries']
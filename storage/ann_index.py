@@ -0,0 +1,453 @@
+"""
+Approximate Nearest-Neighbour Index for Living Knowledge Ecosystem
+
+Inverted-file (IVF) index over the LocalVectorStore, pure NumPy:
+- Spherical k-means partitions embeddings into `nlist` clusters
+- A query scores the centroids, then only the `nprobe` closest lists
+- New store rows are assigned to their nearest centroid on insert
+
+Persisted next to the store:
+- <path>.ivf.centroids.npy  float32 (nlist x dims)
+- <path>.ivf.assign         int32 cluster id per store row (append-only)
+- <path>.ivf.meta.json      rows assigned + id of the last one; a store
+                            rebuilt since (rows reordered) no longer matches
+                            and the index is discarded instead of pointing
+                            lists at the wrong rows
+
+Knobs: nprobe ↑ = recall ↑ / latency ↑. Use benchmark_recall() to pick.
+"""
+
+import os
+import json
+import time
+import threading
+from typing import List, Dict, Optional, Sequence
+
+import numpy as np
+
+from .vector_store import LocalVectorStore, _normalize, _top_k_indices
+
+
+class IVFIndex:
+    """IVF approximate kNN over a LocalVectorStore."""
+
+    def __init__(
+        self,
+        store: LocalVectorStore,
+        nlist: int = 0,
+        nprobe: int = 8,
+        min_train_rows: int = 4096
+    ):
+        """
+        Open the index for a store (loads persisted centroids if present).
+
+        Args:
+            store: Local vector store holding the embeddings
+            nlist: Number of clusters (0 = auto, ~4*sqrt(N))
+            nprobe: Default clusters scanned per query
+            min_train_rows: Below this, search() is exact (index not worth it)
+        """
+        self.store = store
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.min_train_rows = min_train_rows
+
+        self.centroids_path = f"{store.path}.ivf.centroids.npy"
+        self.assign_path = f"{store.path}.ivf.assign"
+        self.meta_path = f"{store.path}.ivf.meta.json"
+
+        self._lock = threading.Lock()
+        self.centroids: Optional[np.ndarray] = None
+        self._lists: List[np.ndarray] = []
+        self._tails: List[List[int]] = []
+        self._assigned = 0
+        self._last_id: Optional[str] = None
+        self._trainer: Optional[threading.Thread] = None
+
+        self.load()
+
+    # =========================================================================
+    # PERSISTENCE
+    # =========================================================================
+
+    def load(self):
+        """
+        Load centroids + assignments from disk.
+
+        Inverted lists are rebuilt with one stable argsort over the int32
+        assignment file, so startup cost is O(N log N) with no Python loop.
+        """
+        with self._lock:
+            if not os.path.exists(self.centroids_path):
+                self._reset()
+                return
+
+            meta = None
+            if os.path.exists(self.meta_path):
+                with open(self.meta_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+            assign = np.fromfile(self.assign_path, dtype=np.int32) if os.path.exists(self.assign_path) else np.empty(0, dtype=np.int32)
+
+            if meta is None or len(assign) < meta["assigned"] or self._is_stale(meta["assigned"], meta["last_id"]):
+                print("⚠️  IVF index does not match the vector store (rebuilt?) - discarded, retrain needed")
+                self._reset(remove_files=True)
+                return
+
+            # Labels appended after the last meta write (interrupted sync) are re-synced
+            if len(assign) > meta["assigned"]:
+                os.truncate(self.assign_path, meta["assigned"] * 4)
+                assign = assign[:meta["assigned"]]
+
+            self.centroids = np.load(self.centroids_path)
+            self._build_lists(assign)
+            self._last_id = meta["last_id"]
+
+    def _is_stale(self, assigned: int, last_id: Optional[str]) -> bool:
+        """True if the store no longer holds the rows the index was built on."""
+        ids = self.store.ids
+        return assigned > len(ids) or (assigned > 0 and ids[assigned - 1] != last_id)
+
+    def _reset(self, remove_files: bool = False):
+        """Forget the index (caller holds the lock); search() falls back to exact."""
+        self.centroids = None
+        self._lists, self._tails, self._assigned, self._last_id = [], [], 0, None
+        if remove_files:
+            for path in (self.centroids_path, self.assign_path, self.meta_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def _save_meta(self):
+        """Record what the assignment file covers (caller holds the lock)."""
+        tmp = f"{self.meta_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"assigned": self._assigned, "last_id": self._last_id}, f)
+        os.replace(tmp, self.meta_path)
+
+    def _build_lists(self, assign: np.ndarray):
+        """Group row indices by cluster id."""
+        nlist = len(self.centroids)
+        order = np.argsort(assign, kind="stable").astype(np.int64)
+        bounds = np.searchsorted(assign[order], np.arange(nlist + 1))
+
+        self._lists = [order[bounds[c]:bounds[c + 1]] for c in range(nlist)]
+        self._tails = [[] for _ in range(nlist)]
+        self._assigned = len(assign)
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    # =========================================================================
+    # TRAINING
+    # =========================================================================
+
+    def train(self, sample_size: int = 0, iterations: int = 10, seed: int = 0) -> int:
+        """
+        Train centroids with spherical k-means and (re)assign every row.
+
+        Args:
+            sample_size: Rows used for k-means (0 = 64 per cluster)
+            iterations: k-means iterations
+            seed: RNG seed (reproducible partitions)
+
+        Returns:
+            Number of clusters trained
+        """
+        matrix = self.store.matrix
+        n = len(matrix)
+        if n == 0:
+            return 0
+
+        nlist = self.nlist or max(1, int(4 * np.sqrt(n)))
+        nlist = min(nlist, n)
+        sample_size = min(n, sample_size or 64 * nlist)
+
+        rng = np.random.default_rng(seed)
+        sample_rows = np.sort(rng.choice(n, size=sample_size, replace=False))
+        sample = np.asarray(matrix[sample_rows])
+
+        centroids = _spherical_kmeans(sample, nlist, iterations, rng)
+
+        block = self.store.block_rows
+        assign = np.concatenate([
+            _nearest(np.asarray(matrix[start:start + block]), centroids)
+            for start in range(0, n, block)
+        ]).astype(np.int32)
+
+        with self._lock:
+            self.centroids = centroids
+            np.save(self.centroids_path, centroids)
+            assign.tofile(self.assign_path)
+            self._build_lists(assign)
+            self._last_id = self.store.ids[n - 1]
+            self._save_meta()
+
+        return nlist
+
+    def train_in_background(self) -> bool:
+        """
+        Start train() on a daemon thread (no-op if one is running).
+
+        search() stays exact until the thread finishes, so callers on the
+        request path never wait for k-means.
+
+        Returns:
+            True if a training thread was started
+        """
+        with self._lock:
+            if self._trainer is not None and self._trainer.is_alive():
+                return False
+
+            def run():
+                try:
+                    start = time.time()
+                    nlist = self.train()
+                    print(f"🧮 IVF index trained in background: {nlist} clusters in {time.time() - start:.1f}s")
+                except Exception as e:
+                    print(f"⚠️  Background IVF training failed (train with `python -m storage.ann_index train`): {e}")
+
+            self._trainer = threading.Thread(target=run, name="ivf-train", daemon=True)
+            self._trainer.start()
+            return True
+
+    @property
+    def is_training(self) -> bool:
+        return self._trainer is not None and self._trainer.is_alive()
+
+    def join_training(self, timeout: Optional[float] = None):
+        """Wait for a background training thread (if any)."""
+        trainer = self._trainer
+        if trainer is not None:
+            trainer.join(timeout)
+
+    def needs_retrain(self, growth_factor: float = 4.0) -> bool:
+        """True if the store grew enough that centroids are likely stale."""
+        if not self.is_trained:
+            return len(self.store) >= self.min_train_rows
+        trained_for = (len(self.centroids) / 4) ** 2
+        return len(self.store) > growth_factor * max(trained_for, self.min_train_rows)
+
+    # =========================================================================
+    # INCREMENTAL UPDATES
+    # =========================================================================
+
+    def sync(self) -> int:
+        """
+        Index store rows appended since the last sync.
+
+        The first time the store reaches `min_train_rows`, training is
+        started in the background (train_in_background) and search() stays
+        exact until it finishes; afterwards new rows are assigned to their
+        nearest existing centroid (cheap: nlist dot products per row).
+
+        Returns:
+            Number of rows newly indexed
+        """
+        self.store.refresh()
+        n = len(self.store)
+
+        with self._lock:
+            if self.is_trained and self._is_stale(self._assigned, self._last_id):
+                print("⚠️  Vector store was rebuilt - IVF index discarded, retrain needed")
+                self._reset(remove_files=True)
+
+        if not self.is_trained:
+            if n >= self.min_train_rows:
+                self.train_in_background()
+            return 0
+
+        with self._lock:
+            if n <= self._assigned:
+                return 0
+
+            new_rows = np.asarray(self.store.matrix[self._assigned:n])
+            labels = _nearest(new_rows, self.centroids).astype(np.int32)
+
+            with open(self.assign_path, "ab") as f:
+                f.write(labels.tobytes())
+
+            for offset, label in enumerate(labels):
+                self._tails[label].append(self._assigned + offset)
+
+            added = n - self._assigned
+            self._assigned = n
+            self._last_id = self.store.ids[n - 1]
+            self._save_meta()
+            return added
+
+    # =========================================================================
+    # SEARCH
+    # =========================================================================
+
+    def search(
+        self,
+        query_embedding: List[float],
+        k: int = 10,
+        min_similarity: float = 0.0,
+        nprobe: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Approximate cosine kNN.
+
+        Falls back to exact search while the index is untrained or the
+        store was rebuilt since it was trained (until the next sync).
+
+        Args:
+            query_embedding: Query vector
+            k: Number of results
+            min_similarity: Minimum cosine similarity threshold
+            nprobe: Clusters to scan (defaults to self.nprobe)
+
+        Returns:
+            List of {"id", "similarity"} sorted by similarity (desc),
+            same shape as Neo4jClient.vector_search
+        """
+        self.store.refresh()
+        if not self.is_trained or self._is_stale(self._assigned, self._last_id):
+            return self.store.knn(query_embedding, k=k, min_similarity=min_similarity)
+
+        query = _normalize(np.asarray(query_embedding, dtype=np.float32).reshape(1, -1))[0]
+        # Under the lock: a background train() swaps centroids and lists together
+        with self._lock:
+            centroids = self.centroids
+            if centroids is None:
+                return self.store.knn(query_embedding, k=k, min_similarity=min_similarity)
+            nprobe = min(nprobe or self.nprobe, len(centroids))
+            probes = _top_k_indices(centroids @ query, nprobe)
+            candidates = np.concatenate(
+                [self._lists[c] for c in probes] +
+                [np.asarray(self._tails[c], dtype=np.int64) for c in probes]
+            )
+        if len(candidates) == 0:
+            return []
+
+        candidates.sort()  # Sequential memmap access
+        scores = self.store.matrix[candidates] @ query
+        top = _top_k_indices(scores, k)
+        top = top[np.argsort(-scores[top])]
+
+        ids = self.store.ids
+        return [
+            {"id": ids[candidates[i]], "similarity": float(scores[i])}
+            for i in top
+            if scores[i] >= min_similarity
+        ]
+
+    # =========================================================================
+    # BENCHMARK
+    # =========================================================================
+
+    def benchmark_recall(
+        self,
+        num_queries: int = 100,
+        k: int = 10,
+        nprobe_values: Sequence[int] = (1, 2, 4, 8, 16, 32),
+        seed: int = 0
+    ) -> List[Dict]:
+        """
+        Measure recall@k and latency against exact search.
+
+        Queries are sampled from stored embeddings (realistic distribution).
+
+        Returns:
+            One row per nprobe: {"nprobe", "recall", "ann_us", "exact_us"}
+        """
+        n = len(self.store)
+        if n == 0:
+            return []
+
+        rng = np.random.default_rng(seed)
+        queries = np.asarray(self.store.matrix[rng.choice(n, size=min(num_queries, n), replace=False)])
+
+        exact = []
+        t0 = time.perf_counter()
+        for q in queries:
+            exact.append({r['id'] for r in self.store.knn(q, k=k, min_similarity=-1.0)})
+        exact_us = (time.perf_counter() - t0) / len(queries) * 1e6
+
+        report = []
+        for nprobe in nprobe_values:
+            hits = 0
+            t0 = time.perf_counter()
+            results = [self.search(q, k=k, min_similarity=-1.0, nprobe=nprobe) for q in queries]
+            ann_us = (time.perf_counter() - t0) / len(queries) * 1e6
+
+            for truth, result in zip(exact, results):
+                hits += len(truth & {r['id'] for r in result})
+
+            report.append({
+                "nprobe": nprobe,
+                "recall": hits / (len(queries) * k),
+                "ann_us": round(ann_us, 1),
+                "exact_us": round(exact_us, 1)
+            })
+        return report
+
+    def get_stats(self) -> Dict:
+        """Get index statistics."""
+        sizes = [len(l) + len(t) for l, t in zip(self._lists, self._tails)]
+        return {
+            "trained": self.is_trained,
+            "training": self.is_training,
+            "nlist": len(self.centroids) if self.is_trained else 0,
+            "nprobe": self.nprobe,
+            "indexed_rows": self._assigned,
+            "store_rows": len(self.store),
+            "max_list_size": max(sizes) if sizes else 0,
+            "needs_retrain": self.needs_retrain()
+        }
+
+
+# =============================================================================
+# Utility Functions
+# =============================================================================
+
+def _nearest(rows: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Nearest centroid (max cosine) for each row."""
+    return np.argmax(rows @ centroids.T, axis=1)
+
+
+def _spherical_kmeans(sample: np.ndarray, nlist: int, iterations: int, rng) -> np.ndarray:
+    """Unit-norm centroids of `sample` (rows unit-norm) after k-means iterations."""
+    centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+    for _ in range(iterations):
+        labels = _nearest(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        empty = np.bincount(labels, minlength=nlist) == 0
+        # Re-seed empty clusters from random sample points
+        sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()))]
+        centroids = _normalize(sums)
+    return centroids
+
+
+# =============================================================================
+# Example Usage
+# =============================================================================
+
+if __name__ == "__main__":
+    # Train / benchmark the local ANN index
+    import sys
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from config import ANNIndexConfig, VectorStoreConfig, EmbeddingConfig
+
+    store = LocalVectorStore(VectorStoreConfig.PATH, EmbeddingConfig.DIMENSIONS, VectorStoreConfig.BLOCK_ROWS)
+    index = IVFIndex(store, ANNIndexConfig.NLIST, ANNIndexConfig.NPROBE, ANNIndexConfig.MIN_TRAIN_ROWS)
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+
+    if command == "train":
+        print(f"🧮 Training IVF index over {len(store)} embeddings...")
+        start = time.time()
+        nlist = index.train()
+        print(f"✅ Trained {nlist} clusters in {time.time() - start:.1f}s")
+
+    elif command == "benchmark":
+        print("📏 Recall benchmark (ANN vs exact)...")
+        for row in index.benchmark_recall():
+            print(f"   nprobe={row['nprobe']:>3}  recall@10={row['recall']:.3f}  "
+                  f"ann={row['ann_us']:>9.1f}µs  exact={row['exact_us']:>9.1f}µs")
+
+    print(f"📊 IVF index: {index.get_stats()}")
@@ -10,36 +10,436 @@ Neo4j = Active graph (retrieval, sleep cycles)
 SQLite = Archival storage (raw data, Stage 1/2 outputs)
 """
 
+import os
+import stat
 import sqlite3
 import json
-from typing import Optional, Dict, List, Any
+import zlib
+import queue
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Optional, Dict, List, Any, Iterator, Callable
 from datetime import datetime
 from pathlib import Path
+from urllib.parse import quote
+
+import numpy as np
+
+from .cache import LRUCache
+from .compression import TextCodec
+
+try:
+    import zstandard
+except ImportError:  # Optional: falls back to zlib
+    zstandard = None
+
+
+# Content table → FTS5 index
+FTS_TABLES = {
+    "messages": "messages_fts",
+    "semantic_units": "semantic_units_fts",
+    "propositions_archive": "propositions_fts"
+}
+
+# Message → SemanticUnit → Proposition, flattened (one row per proposition).
+# Shared by the join path and the materialized `lineage` table.
+LINEAGE_COLUMNS = """
+    m.id AS message_id,
+    m.role AS message_role,
+    m.content AS message_content,
+    m.timestamp AS message_timestamp,
+    su.unit_id AS semantic_unit_id,
+    su.content AS semantic_unit_content,
+    su.type AS semantic_unit_type,
+    su.narrative_role AS semantic_unit_narrative_role,
+    pa.proposition_id AS proposition_id,
+    pa.content AS proposition_content,
+    pa.type AS proposition_type
+"""
+
+LINEAGE_JOIN = """
+    FROM propositions_archive pa
+    JOIN semantic_units su ON pa.semantic_unit_id = su.unit_id
+    JOIN messages m ON su.message_id = m.id
+"""
 
 
 class ArchiveDB:
-    """SQLite database for archival storage."""
+    """
+    SQLite database for archival storage.
+
+    Thread-safe connection strategy:
+    - ONE writer connection, owned by a dedicated thread and fed by a queue.
+      Everything waiting in the queue is group-committed (one COMMIT), each
+      unit isolated by a SAVEPOINT so a failing unit doesn't poison others.
+    - A bounded pool of read-only connections for lookups/lineage/stats.
+      WAL lets readers run concurrently with the writer.
+
+    Writes are synchronous for the caller (they return after COMMIT), so a
+    read issued afterwards from any thread sees them.
+    """
 
-    def __init__(self, db_path: str = "data/resemantic_archive.db"):
+    _shared: Dict[str, "ArchiveDB"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        db_path: str = "data/resemantic_archive.db",
+        read_pool_size: int = 4,
+        embedding_codec: str = "f32",
+        materialized_lineage: bool = False,
+        lineage_cache_size: int = 4096,
+        compression: str = "zstd",
+        compress_min_bytes: int = 256,
+        sealed: bool = False
+    ):
         """
         Initialize SQLite archive database.
 
         Args:
             db_path: Path to SQLite database file
+            read_pool_size: Maximum concurrent read-only connections
+            embedding_codec: How new embeddings are stored: "f32",
+                             "f32+zlib" or "f32+zstd" (see encode_embedding)
+            materialized_lineage: Maintain a denormalized `lineage` table
+                                  (trigger-updated) instead of joining on read
+            lineage_cache_size: LRU entries for lineage lookups (0 = off)
+            compression: Codec for large text/JSON columns: "zstd" (zlib
+                         if `zstandard` is missing), "zlib" or "none".
+                         Reads always decode any codec.
+            compress_min_bytes: Shorter values are stored as plain TEXT
+            sealed: Open a sealed (immutable) segment: no writer thread,
+                    no schema setup, writes raise
         """
         # Ensure data directory exists
         db_file = Path(db_path)
         db_file.parent.mkdir(parents=True, exist_ok=True)
 
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row  # Dict-like access
-        self.setup_schema()
+        self.sealed = sealed
+        self.embedding_codec = embedding_codec
+        self.materialized_lineage = materialized_lineage
+        self._lineage_cache = LRUCache(lineage_cache_size)
+        self._codec = TextCodec(compression, compress_min_bytes, dictionary_loader=self._load_dictionary)
+        self._local = threading.local()  # Per-thread transaction() buffers
+
+        # Read-only pool (connections created lazily up to read_pool_size)
+        self._read_pool: "queue.LifoQueue" = queue.LifoQueue()
+        self._read_pool_size = read_pool_size
+        self._readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        self._closed = False
+        self._writer_error: Optional[BaseException] = None
+        self._submit_lock = threading.Lock()  # Orders _submit against writer shutdown
+
+        if sealed:
+            self._writer = None
+            with self._reader() as conn:
+                self.materialized_lineage = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'lineage'"
+                ).fetchone() is not None
+        else:
+            # Writer thread
+            self._write_queue: "queue.Queue" = queue.Queue()
+            self._writer = threading.Thread(target=self._writer_loop, name="ArchiveDB-writer", daemon=True)
+            self._writer.start()
+            self.setup_schema()
+
+        self._load_active_dictionary()
+
+    @classmethod
+    def shared(cls, db_path: str = "data/resemantic_archive.db", **kwargs) -> "ArchiveDB":
+        """
+        Process-wide instance for a database file.
+
+        Concurrent extraction threads must share one ArchiveDB so that all
+        writes funnel through a single writer connection. Do not close it.
+        """
+        key = str(Path(db_path).resolve())
+        with cls._shared_lock:
+            archive = cls._shared.get(key)
+            if archive is None or archive._closed:
+                archive = cls(db_path, **kwargs)
+                cls._shared[key] = archive
+            return archive
+
+    # =========================================================================
+    # CONNECTIONS
+    # =========================================================================
+
+    def _connect(self, read_only: bool = False, path: Optional[str] = None) -> sqlite3.Connection:
+        """
+        Open a tuned connection.
+
+        WAL: readers never block the writer, commits append to the log
+        instead of rewriting pages. synchronous=NORMAL in WAL mode only
+        fsyncs at checkpoints (durable against app crashes, may lose the
+        last commits on power loss).
+
+        Args:
+            read_only: Read-only connection (pool)
+            path: Another database file (segment sealing), default db_path
+        """
+        path = path or self.db_path
+        if read_only:
+            # Sealed segments never change: immutable skips locking entirely
+            flags = "mode=ro&immutable=1" if self.sealed else "mode=ro"
+            uri = f"file:{quote(Path(path).resolve().as_posix())}?{flags}"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA query_only=ON")
+        else:
+            # Autocommit mode: the writer issues BEGIN/COMMIT explicitly
+            conn = sqlite3.connect(path, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA recursive_triggers=ON")  # REPLACE → delete triggers (FTS sync)
+
+        conn.row_factory = sqlite3.Row  # Dict-like access
+
+        # Compressed columns: FTS triggers/views index the decompressed text
+        conn.create_function("archive_decompress", 1, self._codec.unpack, deterministic=True)
+        conn.create_function("archive_raw_size", 1, TextCodec.raw_size, deterministic=True)
+        conn.execute("PRAGMA cache_size=-65536")  # 64 MB page cache
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    def _writer_loop(self):
+        """
+        Writer thread: drain the queue, group-commit, resolve futures.
+
+        A batch that fails as a whole (rolled back) only fails its own
+        futures. An error that escapes the rollback leaves the connection
+        unusable: every pending write is failed and the archive is marked
+        closed, so callers get an exception instead of waiting forever.
+        """
+        batch = []
+        try:
+            conn = self._connect()
+        except Exception as e:
+            self._fail_writer(e, batch)
+            return
+
+        try:
+            stop = False
+            while not stop:
+                item = self._write_queue.get()
+                if item is None:
+                    break
+
+                batch = [item]
+                while len(batch) < 256:
+                    try:
+                        item = self._write_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stop = True
+                        break
+                    batch.append(item)
+
+                try:
+                    self._apply_batch(conn, batch)
+                except Exception as e:
+                    self._fail_writer(e, batch)
+                    return
+        finally:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def _fail_writer(self, error: BaseException, batch: List):
+        """Writer is dead: fail the current batch and everything still queued."""
+        print(f"⚠️  ArchiveDB writer stopped ({self.db_path}): {error!r}")
+        with self._submit_lock:
+            self._writer_error = error
+            self._closed = True
+            pending = list(batch)
+            while True:
+                try:
+                    item = self._write_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    pending.append(item)
+
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(error)
+
+    @staticmethod
+    def _apply_batch(conn: sqlite3.Connection, batch: List):
+        """Apply queued write units in one transaction (one SAVEPOINT each)."""
+        outcomes = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for ops, future in batch:
+                conn.execute("SAVEPOINT unit")
+                try:
+                    for op in ops:
+                        op(conn)
+                    conn.execute("RELEASE unit")
+                    outcomes.append((future, None))
+                except Exception as e:
+                    conn.execute("ROLLBACK TO unit")
+                    conn.execute("RELEASE unit")
+                    outcomes.append((future, e))
+            conn.execute("COMMIT")
+        except Exception as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for future, error in outcomes:
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
+
+    def _submit(self, ops: List[Callable[[sqlite3.Connection], Any]]) -> Future:
+        """Queue a unit of write operations for the writer thread."""
+        if self.sealed:
+            raise RuntimeError(f"Archive segment is sealed (read-only): {self.db_path}")
+        with self._submit_lock:
+            if self._writer_error is not None:
+                raise RuntimeError(f"ArchiveDB writer failed: {self._writer_error!r}") from self._writer_error
+            if self._closed:
+                raise RuntimeError("ArchiveDB is closed")
+            future = Future()
+            self._write_queue.put((ops, future))
+        return future
+
+    def _write(
+        self,
+        op: Callable[[sqlite3.Connection], Any],
+        after_commit: Optional[Callable[[], None]] = None
+    ):
+        """
+        Run a write op: buffered inside transaction(), else committed now.
+
+        after_commit runs in the calling thread once the op is committed
+        (at the end of the outermost transaction() if one is open).
+        """
+        buffered = getattr(self._local, "ops", None)
+        if buffered is not None:
+            buffered.append(op)
+            if after_commit:
+                self._local.after_commit.append(after_commit)
+        else:
+            self._submit([op]).result()
+            if after_commit:
+                after_commit()
+
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a read-only connection from the pool."""
+        try:
+            conn = self._read_pool.get_nowait()
+        except queue.Empty:
+            conn = None
+            with self._readers_lock:
+                if len(self._readers) < self._read_pool_size:
+                    conn = self._connect(read_only=True)
+                    self._readers.append(conn)
+            if conn is None:
+                conn = self._read_pool.get()
+
+        try:
+            yield conn
+        finally:
+            self._read_pool.put(conn)
+
+    def _iter_keyset(
+        self,
+        table: str,
+        order_column: str,
+        id_column: str,
+        chunk_size: int,
+        after: Optional[tuple] = None,
+        columns: str = "*"
+    ) -> Iterator[sqlite3.Row]:
+        """
+        Keyset pagination over (order_column, id_column).
+
+        Each chunk is one range seek on the composite index, so the cost per
+        chunk stays flat (no OFFSET scan) and only one chunk is in memory.
+        The read connection goes back to the pool between chunks.
+        """
+        while True:
+            with self._reader() as conn:
+                if after is None:
+                    rows = conn.execute(f"""
+                        SELECT {columns} FROM {table}
+                        ORDER BY {order_column}, {id_column}
+                        LIMIT ?
+                    """, (chunk_size,)).fetchall()
+                else:
+                    rows = conn.execute(f"""
+                        SELECT {columns} FROM {table}
+                        WHERE ({order_column}, {id_column}) > (?, ?)
+                        ORDER BY {order_column}, {id_column}
+                        LIMIT ?
+                    """, (*after, chunk_size)).fetchall()
+
+            yield from rows
+            if len(rows) < chunk_size:
+                return
+            after = (rows[-1][order_column], rows[-1][id_column])
+
+    # =========================================================================
+    # TRANSACTIONS
+    # =========================================================================
+
+    @contextmanager
+    def transaction(self) -> Iterator["ArchiveDB"]:
+        """
+        Group writes into a single commit (one fsync per turn/backfill).
+
+        Writes issued by this thread inside the block are buffered and
+        handed to the writer as one atomic unit on exit; an exception
+        discards them all. Nestable: only the outermost block commits.
+        Reads inside the block do not see its buffered writes.
+
+        Usage:
+            with archive.transaction():
+                archive.store_messages_many(...)
+                archive.store_propositions_many(...)
+        """
+        depth = getattr(self._local, "depth", 0)
+        if depth == 0:
+            self._local.ops = []
+            self._local.after_commit = []
+        self._local.depth = depth + 1
+
+        try:
+            yield self
+        except BaseException:
+            self._local.depth -= 1
+            if self._local.depth == 0:
+                self._local.ops = None
+                self._local.after_commit = []
+            raise
+
+        self._local.depth -= 1
+        if self._local.depth == 0:
+            ops, self._local.ops = self._local.ops, None
+            callbacks, self._local.after_commit = self._local.after_commit, []
+            if ops:
+                self._submit(ops).result()
+            for callback in callbacks:
+                callback()
 
     def setup_schema(self):
         """Create tables if they don't exist."""
+        self._submit([lambda conn: self._create_schema(conn, self.materialized_lineage)]).result()
 
-        cursor = self.conn.cursor()
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection, materialized_lineage: bool = False):
+        cursor = conn.cursor()
 
         # Messages table (raw conversation)
         cursor.execute("""
@@ -84,15 +484,44 @@ class ArchiveDB:
                 concepts TEXT,
                 metadata TEXT,
                 created_at TEXT NOT NULL,
+                embedding BLOB,
+                embedding_codec TEXT,
+                embedding_model TEXT,
+                embedding_dim INTEGER,
                 FOREIGN KEY (semantic_unit_id) REFERENCES semantic_units(unit_id)
             )
         """)
 
+        # Migration: archives created before embeddings were persisted
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(propositions_archive)")}
+        for column, sql_type in (
+            ("embedding", "BLOB"),
+            ("embedding_codec", "TEXT"),
+            ("embedding_model", "TEXT"),
+            ("embedding_dim", "INTEGER")
+        ):
+            if column not in columns:
+                cursor.execute(f"ALTER TABLE propositions_archive ADD COLUMN {column} {sql_type}")
+
         # Indexes for common queries
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_messages_timestamp
             ON messages(timestamp)
         """)
+
+        # Keyset pagination (iter_* methods): (timestamp, id) range seeks
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_messages_timestamp_id
+            ON messages(timestamp, id)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_semantic_units_created_id
+            ON semantic_units(created_at, unit_id)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_propositions_created_id
+            ON propositions_archive(created_at, proposition_id)
+        """)
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_semantic_units_message
             ON semantic_units(message_id)
@@ -102,7 +531,168 @@ class ArchiveDB:
             ON propositions_archive(semantic_unit_id)
         """)
 
-        self.conn.commit()
+        # Full-text search (FTS5, external content = no duplicate text).
+        # Content comes through a view that decompresses, so compressed
+        # rows are indexed (and rebuilt) as plain text.
+        for table, fts in FTS_TABLES.items():
+            existing = cursor.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,)
+            ).fetchone()
+
+            # Migration: FTS tables created before compression read the raw columns
+            if existing and f"{fts}_source" not in existing[0]:
+                for suffix in ("ai", "ad", "au"):
+                    cursor.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+                cursor.execute(f"DROP TABLE {fts}")
+                existing = None
+
+            cursor.execute(f"""
+                CREATE VIEW IF NOT EXISTS {fts}_source AS
+                SELECT rowid AS src_rowid, archive_decompress(content) AS content FROM {table}
+            """)
+            cursor.execute(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                    content,
+                    content='{fts}_source',
+                    content_rowid='src_rowid',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+            """)
+
+            # Triggers keep the index in sync (INSERT OR REPLACE fires the
+            # delete trigger because the writer enables recursive_triggers).
+            # Recompressing a row (same text) doesn't touch the index.
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+                    INSERT INTO {fts}(rowid, content) VALUES (new.rowid, archive_decompress(new.content));
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+                    INSERT INTO {fts}({fts}, rowid, content) VALUES ('delete', old.rowid, archive_decompress(old.content));
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF content ON {table}
+                WHEN archive_decompress(old.content) IS NOT archive_decompress(new.content) BEGIN
+                    INSERT INTO {fts}({fts}, rowid, content) VALUES ('delete', old.rowid, archive_decompress(old.content));
+                    INSERT INTO {fts}(rowid, content) VALUES (new.rowid, archive_decompress(new.content));
+                END
+            """)
+
+            # Existing archive: index rows written before FTS existed
+            if not existing:
+                cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+        # Outbox: graph projections committed with the turn, applied to
+        # Neo4j asynchronously by storage.projector.OutboxProjector
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT
+            )
+        """)
+
+        # Entries the projector gave up on (see OutboxProjector max_attempts)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS outbox_dead (
+                seq INTEGER PRIMARY KEY,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                attempts INTEGER NOT NULL,
+                last_error TEXT,
+                dead_at TEXT NOT NULL
+            )
+        """)
+
+        # Sealed time segments (see seal_period)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS archive_segments (
+                period TEXT PRIMARY KEY,
+                path TEXT NOT NULL,
+                messages INTEGER,
+                semantic_units INTEGER,
+                propositions INTEGER,
+                stored_bytes INTEGER,
+                sealed_at TEXT NOT NULL
+            )
+        """)
+
+        # Trained zstd dictionaries for short JSON payloads
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS compression_dicts (
+                dict_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                algorithm TEXT NOT NULL,
+                data BLOB NOT NULL,
+                sample_count INTEGER,
+                created_at TEXT NOT NULL
+            )
+        """)
+
+        ArchiveDB._create_lineage_table(cursor, materialized_lineage)
+
+    @staticmethod
+    def _create_lineage_table(cursor: sqlite3.Cursor, enabled: bool):
+        """
+        Denormalized lineage (one row per proposition), kept current by
+        triggers on all three source tables; lookups skip the 3-way join.
+        Derived data: dropped when disabled, backfilled when (re)enabled.
+        """
+        triggers = ("lineage_pa_ai", "lineage_pa_ad", "lineage_su_ai",
+                    "lineage_su_ad", "lineage_m_ai", "lineage_m_ad")
+        if not enabled:
+            for trigger in triggers:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            cursor.execute("DROP TABLE IF EXISTS lineage")
+            return
+
+        exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'lineage'"
+        ).fetchone()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS lineage (
+                message_id TEXT,
+                message_role TEXT,
+                message_content TEXT,
+                message_timestamp TEXT,
+                semantic_unit_id TEXT,
+                semantic_unit_content TEXT,
+                semantic_unit_type TEXT,
+                semantic_unit_narrative_role TEXT,
+                proposition_id TEXT PRIMARY KEY,
+                proposition_content TEXT,
+                proposition_type TEXT
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_lineage_semantic_unit ON lineage(semantic_unit_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_lineage_message ON lineage(message_id)")
+
+        # Same column order as LINEAGE_COLUMNS
+
+        upsert = f"INSERT OR REPLACE INTO lineage SELECT {LINEAGE_COLUMNS} {LINEAGE_JOIN}"
+        # Any of the three rows may arrive last; whichever does fills the row
+        for trigger, event, table, body in (
+            ("lineage_pa_ai", "INSERT", "propositions_archive", f"{upsert} WHERE pa.proposition_id = new.proposition_id;"),
+            ("lineage_pa_ad", "DELETE", "propositions_archive", "DELETE FROM lineage WHERE proposition_id = old.proposition_id;"),
+            ("lineage_su_ai", "INSERT", "semantic_units", f"{upsert} WHERE pa.semantic_unit_id = new.unit_id;"),
+            ("lineage_su_ad", "DELETE", "semantic_units", "DELETE FROM lineage WHERE semantic_unit_id = old.unit_id;"),
+            ("lineage_m_ai", "INSERT", "messages", f"{upsert} WHERE su.message_id = new.id;"),
+            ("lineage_m_ad", "DELETE", "messages", "DELETE FROM lineage WHERE message_id = old.id;")
+        ):
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {trigger} AFTER {event} ON {table} BEGIN
+                    {body}
+                END
+            """)
+
+        if not exists:
+            cursor.execute(upsert)
 
     # =========================================================================
     # MESSAGES
@@ -124,29 +714,72 @@ class ArchiveDB:
             content: Raw message text
             timestamp: ISO timestamp
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
+        self.store_messages_many([{
+            "message_id": message_id,
+            "role": role,
+            "content": content,
+            "timestamp": timestamp
+        }])
+
+    def store_messages_many(self, messages: List[Dict[str, Any]]):
+        """
+        Store many raw messages with one executemany.
+
+        Args:
+            messages: List of {"message_id", "role", "content", "timestamp"}
+        """
+        now = datetime.now().isoformat()
+        rows = [
+            (m['message_id'], m['role'], self._codec.pack(m['content']), m['timestamp'], now)
+            for m in messages
+        ]
+        self._write(lambda conn: conn.executemany("""
             INSERT OR REPLACE INTO messages (id, role, content, timestamp, created_at)
             VALUES (?, ?, ?, ?, ?)
-        """, (message_id, role, content, timestamp, datetime.now().isoformat()))
-        self.conn.commit()
+        """, rows), after_commit=self._invalidate_lineage("message", [r[0] for r in rows]))
 
     def get_message(self, message_id: str) -> Optional[Dict]:
         """Get message by ID."""
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM messages WHERE id = ?", (message_id,))
-        row = cursor.fetchone()
-        return dict(row) if row else None
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM messages WHERE id = ?", (message_id,))
+            row = cursor.fetchone()
+            return self._message_from_row(row) if row else None
+
+    def _message_from_row(self, row: sqlite3.Row) -> Dict:
+        """Row -> dict with content decompressed."""
+        result = dict(row)
+        result['content'] = self._codec.unpack(result['content'])
+        return result
 
     def get_all_messages(self, limit: int = 100) -> List[Dict]:
-        """Get all messages ordered by timestamp."""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT * FROM messages
-            ORDER BY timestamp DESC
-            LIMIT ?
-        """, (limit,))
-        return [dict(row) for row in cursor.fetchall()]
+        """Get the latest messages (snapshot; use iter_messages() to stream all)."""
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT * FROM messages
+                ORDER BY timestamp DESC
+                LIMIT ?
+            """, (limit,))
+            return [self._message_from_row(row) for row in cursor.fetchall()]
+
+    def iter_messages(
+        self,
+        chunk_size: int = 1000,
+        after: Optional[tuple] = None
+    ) -> Iterator[Dict]:
+        """
+        Stream all messages ordered by (timestamp, id), in constant memory.
+
+        Args:
+            chunk_size: Rows fetched per query
+            after: Exclusive (timestamp, id) cursor to resume from
+
+        Yields:
+            Message dicts
+        """
+        for row in self._iter_keyset("messages", "timestamp", "id", chunk_size, after):
+            yield self._message_from_row(row)
 
     # =========================================================================
     # SEMANTIC UNITS
@@ -168,65 +801,103 @@ class ArchiveDB:
             content: Semantic unit content
             metadata: All Stage 1 metadata (type, concepts, etc.)
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
+        self.store_semantic_units_many([{
+            "unit_id": unit_id,
+            "message_id": message_id,
+            "content": content,
+            "metadata": metadata
+        }])
+
+    def store_semantic_units_many(self, units: List[Dict[str, Any]]):
+        """
+        Store many semantic units with one executemany.
+
+        Args:
+            units: List of {"unit_id", "message_id", "content", "metadata"}
+        """
+        now = datetime.now().isoformat()
+        rows = [
+            (
+                u['unit_id'],
+                u['message_id'],
+                u['content'],
+                u['metadata'].get('type'),
+                u['metadata'].get('narrative_role'),
+                json.dumps(u['metadata'].get('concepts', [])),
+                json.dumps(u['metadata'].get('entities', [])),
+                json.dumps(u['metadata'].get('decisions', [])),
+                u['metadata'].get('certainty'),
+                json.dumps(u['metadata'].get('context_dependencies', [])),
+                u['metadata'].get('impact'),
+                u['metadata'].get('relevance'),
+                self._codec.pack(json.dumps(u['metadata']), dictionary=True),
+                now
+            )
+            for u in units
+        ]
+        self._write(lambda conn: conn.executemany("""
             INSERT OR REPLACE INTO semantic_units (
                 unit_id, message_id, content, type, narrative_role,
                 concepts, entities, decisions, certainty, context_dependencies,
                 impact, relevance, metadata, created_at
             )
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            unit_id,
-            message_id,
-            content,
-            metadata.get('type'),
-            metadata.get('narrative_role'),
-            json.dumps(metadata.get('concepts', [])),
-            json.dumps(metadata.get('entities', [])),
-            json.dumps(metadata.get('decisions', [])),
-            metadata.get('certainty'),
-            json.dumps(metadata.get('context_dependencies', [])),
-            metadata.get('impact'),
-            metadata.get('relevance'),
-            json.dumps(metadata),
-            datetime.now().isoformat()
-        ))
-        self.conn.commit()
+        """, rows), after_commit=self._invalidate_lineage("semantic_unit", [r[0] for r in rows]))
 
     def get_semantic_unit(self, unit_id: str) -> Optional[Dict]:
         """Get semantic unit by ID."""
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM semantic_units WHERE unit_id = ?", (unit_id,))
-        row = cursor.fetchone()
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM semantic_units WHERE unit_id = ?", (unit_id,))
+            row = cursor.fetchone()
 
-        if row:
-            result = dict(row)
-            # Parse JSON fields
-            result['concepts'] = json.loads(result['concepts']) if result['concepts'] else []
-            result['entities'] = json.loads(result['entities']) if result['entities'] else []
-            result['decisions'] = json.loads(result['decisions']) if result['decisions'] else []
-            result['context_dependencies'] = json.loads(result['context_dependencies']) if result['context_dependencies'] else []
-            result['metadata'] = json.loads(result['metadata']) if result['metadata'] else {}
-            return result
-        return None
+            return self._semantic_unit_from_row(row) if row else None
+
+    def _semantic_unit_from_row(self, row: sqlite3.Row) -> Dict:
+        """Row -> dict with JSON fields parsed."""
+        result = dict(row)
+        result['concepts'] = json.loads(result['concepts']) if result['concepts'] else []
+        result['entities'] = json.loads(result['entities']) if result['entities'] else []
+        result['decisions'] = json.loads(result['decisions']) if result['decisions'] else []
+        result['context_dependencies'] = json.loads(result['context_dependencies']) if result['context_dependencies'] else []
+        result['metadata'] = json.loads(self._codec.unpack(result['metadata'])) if result['metadata'] else {}
+        return result
 
     def get_semantic_units_by_message(self, message_id: str) -> List[Dict]:
         """Get all semantic units for a message."""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT * FROM semantic_units
-            WHERE message_id = ?
-            ORDER BY created_at
-        """, (message_id,))
-
-        results = []
-        for row in cursor.fetchall():
-            result = dict(row)
-            result['concepts'] = json.loads(result['concepts']) if result['concepts'] else []
-            result['metadata'] = json.loads(result['metadata']) if result['metadata'] else {}
-            results.append(result)
-        return results
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT * FROM semantic_units
+                WHERE message_id = ?
+                ORDER BY created_at
+            """, (message_id,))
+
+            results = []
+            for row in cursor.fetchall():
+                result = dict(row)
+                result['concepts'] = json.loads(result['concepts']) if result['concepts'] else []
+                result['metadata'] = json.loads(self._codec.unpack(result['metadata'])) if result['metadata'] else {}
+                results.append(result)
+            return results
+
+    def iter_semantic_units(
+        self,
+        chunk_size: int = 1000,
+        after: Optional[tuple] = None
+    ) -> Iterator[Dict]:
+        """
+        Stream all semantic units ordered by (created_at, unit_id).
+
+        Args:
+            chunk_size: Rows fetched per query
+            after: Exclusive (created_at, unit_id) cursor to resume from
+
+        Yields:
+            Semantic unit dicts (JSON fields parsed)
+        """
+        for row in self._iter_keyset("semantic_units", "created_at", "unit_id", chunk_size, after):
+            yield self._semantic_unit_from_row(row)
 
     # =========================================================================
     # PROPOSITIONS ARCHIVE
@@ -248,40 +919,241 @@ class ArchiveDB:
             content: Proposition text
             metadata: All Stage 2 metadata (type, concepts, etc.)
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
+        self.store_propositions_many([{
+            "proposition_id": proposition_id,
+            "semantic_unit_id": semantic_unit_id,
+            "content": content,
+            "metadata": metadata
+        }])
+
+    def store_propositions_many(self, propositions: List[Dict[str, Any]]):
+        """
+        Store many propositions with one executemany.
+
+        Args:
+            propositions: List of {"proposition_id", "semantic_unit_id",
+                          "content", "metadata"} plus optional "embedding"
+                          (list/array of floats) and "embedding_model"
+        """
+        now = datetime.now().isoformat()
+        rows = []
+        for p in propositions:
+            embedding = p.get('embedding')
+            blob, dim = (None, None)
+            if embedding is not None:
+                blob = encode_embedding(embedding, self.embedding_codec)
+                dim = len(embedding)
+
+            rows.append((
+                p['proposition_id'],
+                p['semantic_unit_id'],
+                p['content'],
+                p['metadata'].get('type'),
+                p['metadata'].get('certainty'),
+                json.dumps(p['metadata'].get('concepts', [])),
+                self._codec.pack(json.dumps(p['metadata']), dictionary=True),
+                now,
+                blob,
+                self.embedding_codec if blob is not None else None,
+                p.get('embedding_model') if blob is not None else None,
+                dim
+            ))
+
+        self._write(lambda conn: conn.executemany("""
             INSERT OR REPLACE INTO propositions_archive (
                 proposition_id, semantic_unit_id, content,
-                type, certainty, concepts, metadata, created_at
+                type, certainty, concepts, metadata, created_at,
+                embedding, embedding_codec, embedding_model, embedding_dim
             )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            proposition_id,
-            semantic_unit_id,
-            content,
-            metadata.get('type'),
-            metadata.get('certainty'),
-            json.dumps(metadata.get('concepts', [])),
-            json.dumps(metadata),
-            datetime.now().isoformat()
-        ))
-        self.conn.commit()
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows), after_commit=self._invalidate_lineage("proposition", [r[0] for r in rows]))
 
     def get_proposition(self, proposition_id: str) -> Optional[Dict]:
         """Get proposition by ID."""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT * FROM propositions_archive
-            WHERE proposition_id = ?
-        """, (proposition_id,))
-        row = cursor.fetchone()
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT * FROM propositions_archive
+                WHERE proposition_id = ?
+            """, (proposition_id,))
+            row = cursor.fetchone()
+            return self._proposition_from_row(row) if row else None
 
-        if row:
-            result = dict(row)
-            result['concepts'] = json.loads(result['concepts']) if result['concepts'] else []
-            result['metadata'] = json.loads(result['metadata']) if result['metadata'] else {}
-            return result
-        return None
+    def _proposition_from_row(self, row: sqlite3.Row) -> Dict:
+        """Row -> dict with JSON fields parsed and the embedding decoded."""
+        result = dict(row)
+        result['concepts'] = json.loads(result['concepts']) if result['concepts'] else []
+        result['metadata'] = json.loads(self._codec.unpack(result['metadata'])) if result['metadata'] else {}
+        if result.get('embedding') is not None:
+            result['embedding'] = decode_embedding(
+                result['embedding'], result['embedding_codec'], result['embedding_dim']
+            )
+        return result
+
+    def iter_propositions(
+        self,
+        chunk_size: int = 1000,
+        after: Optional[tuple] = None,
+        include_embedding: bool = False
+    ) -> Iterator[Dict]:
+        """
+        Stream all archived propositions ordered by (created_at, proposition_id).
+
+        Args:
+            chunk_size: Rows fetched per query
+            after: Exclusive (created_at, proposition_id) cursor to resume from
+            include_embedding: Also read + decode the embedding blob
+                               (6 KB/row at 1536 dims - skip for exports)
+
+        Yields:
+            Proposition dicts (JSON fields parsed)
+        """
+        columns = "*" if include_embedding else (
+            "proposition_id, semantic_unit_id, content, type, certainty, concepts, "
+            "metadata, created_at, embedding_model, embedding_dim"
+        )
+        for row in self._iter_keyset("propositions_archive", "created_at", "proposition_id", chunk_size, after, columns):
+            yield self._proposition_from_row(row)
+
+    def iter_embedding_batches(
+        self,
+        batch_size: int = 10000,
+        model: Optional[str] = None
+    ) -> Iterator[tuple]:
+        """
+        Stream archived embeddings as NumPy batches (for rebuild jobs).
+
+        Keyset-paginated on rowid, so memory is bounded by batch_size no
+        matter how large the archive is. Uncompressed blobs are viewed
+        with np.frombuffer (no per-float Python conversion); a batch costs
+        a single memcpy into the output matrix. Every batch has a single
+        dimensionality; mixed archives (model=None) yield shorter batches
+        at the boundaries instead of dropping rows.
+
+        Args:
+            batch_size: Rows per batch
+            model: Only embeddings from this model (None = any)
+
+        Yields:
+            (proposition_ids, float32 matrix [len(ids) x dim])
+        """
+        after = 0
+        while True:
+            with self._reader() as conn:
+                rows = conn.execute("""
+                    SELECT rowid, proposition_id, embedding, embedding_codec, embedding_dim
+                    FROM propositions_archive
+                    WHERE rowid > ?
+                      AND embedding IS NOT NULL
+                      AND (? IS NULL OR embedding_model = ?)
+                    ORDER BY rowid
+                    LIMIT ?
+                """, (after, model, model, batch_size)).fetchall()
+
+            if not rows:
+                return
+
+            # A batch is one matrix: cut it at the first row of another
+            # dimensionality (model switch) - the next batch starts there
+            dim = rows[0]['embedding_dim']
+            same_dim = []
+            for r in rows:
+                if r['embedding_dim'] != dim:
+                    break
+                same_dim.append(r)
+            after = same_dim[-1]['rowid']
+
+            matrix = np.empty((len(same_dim), dim), dtype=np.float32)
+            for i, r in enumerate(same_dim):
+                matrix[i] = decode_embedding(r['embedding'], r['embedding_codec'], dim)
+
+            yield [r['proposition_id'] for r in same_dim], matrix
+
+    GRAPH_ROW_SQL = """
+        SELECT p.rowid, p.proposition_id, p.semantic_unit_id, p.content,
+               p.type, p.certainty, p.concepts, p.metadata, p.created_at,
+               p.embedding, p.embedding_codec, p.embedding_dim,
+               su.message_id, m.role, m.timestamp
+        FROM propositions_archive p
+        LEFT JOIN semantic_units su ON su.unit_id = p.semantic_unit_id
+        LEFT JOIN messages m ON m.id = su.message_id
+    """
+
+    def iter_graph_batches(
+        self,
+        batch_size: int = 1000,
+        after_rowid: int = 0,
+        model: Optional[str] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream propositions joined to their semantic unit and message, in
+        archive (insertion) order - everything needed to recreate a graph node.
+
+        Keyset-paginated on rowid; pass the last yielded "rowid" back as
+        after_rowid to resume. Rows without an embedding (or from another
+        model) are skipped: they cannot join the vector index.
+
+        Args:
+            batch_size: Rows per batch
+            after_rowid: Resume point (exclusive)
+            model: Only embeddings from this model (None = any)
+
+        Yields:
+            Lists of dicts: rowid, proposition_id, semantic_unit_id,
+            message_id, content, type, certainty, concepts, speaker,
+            timestamp, block_metadata, embedding (float32 array)
+        """
+        while True:
+            with self._reader() as conn:
+                rows = conn.execute(f"""
+                    {self.GRAPH_ROW_SQL}
+                    WHERE p.rowid > ?
+                      AND p.embedding IS NOT NULL
+                      AND (? IS NULL OR p.embedding_model = ?)
+                    ORDER BY p.rowid
+                    LIMIT ?
+                """, (after_rowid, model, model, batch_size)).fetchall()
+
+            if not rows:
+                return
+            after_rowid = rows[-1]['rowid']
+            yield [self._graph_row(r) for r in rows]
+
+    def get_graph_rows(self, proposition_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Graph-node rows (see iter_graph_batches) for specific propositions.
+
+        Returns:
+            {proposition_id: row}; ids without an embedding are absent
+        """
+        with self._reader() as conn:
+            rows = conn.execute(f"""
+                {self.GRAPH_ROW_SQL}
+                WHERE p.proposition_id IN (SELECT value FROM json_each(?))
+                  AND p.embedding IS NOT NULL
+            """, (json.dumps(list(proposition_ids)),)).fetchall()
+        return {r['proposition_id']: self._graph_row(r) for r in rows}
+
+    def _graph_row(self, r: sqlite3.Row) -> Dict[str, Any]:
+        metadata = json.loads(self._codec.unpack(r['metadata'])) if r['metadata'] else {}
+        return {
+            "rowid": r['rowid'],
+            "proposition_id": r['proposition_id'],
+            "semantic_unit_id": r['semantic_unit_id'],
+            "message_id": metadata.get('message_id') or r['message_id'],
+            "content": r['content'],
+            "type": r['type'],
+            "certainty": r['certainty'],
+            "concepts": json.loads(r['concepts']) if r['concepts'] else [],
+            "speaker": metadata.get('speaker') or r['role'],
+            "timestamp": r['timestamp'] or r['created_at'],
+            "block_metadata": metadata.get('block_metadata') or {},
+            # Conversation position (absent for turns archived before seqs)
+            "session_id": metadata.get('session_id'),
+            "seq": metadata.get('seq'),
+            "tenant_id": metadata.get('tenant_id'),
+            "embedding": decode_embedding(r['embedding'], r['embedding_codec'], r['embedding_dim'])
+        }
 
     # =========================================================================
     # TRACEABILITY QUERIES
@@ -301,48 +1173,615 @@ class ArchiveDB:
                 "proposition": {...}
             }
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT
-                m.id AS message_id,
-                m.role AS message_role,
-                m.content AS message_content,
-                m.timestamp AS message_timestamp,
-                su.unit_id AS semantic_unit_id,
-                su.content AS semantic_unit_content,
-                su.type AS semantic_unit_type,
-                su.narrative_role AS semantic_unit_narrative_role,
-                pa.proposition_id AS proposition_id,
-                pa.content AS proposition_content,
-                pa.type AS proposition_type
-            FROM propositions_archive pa
-            JOIN semantic_units su ON pa.semantic_unit_id = su.unit_id
-            JOIN messages m ON su.message_id = m.id
-            WHERE pa.proposition_id = ?
-        """, (proposition_id,))
-
-        row = cursor.fetchone()
+        return self.get_lineage_many([proposition_id]).get(proposition_id)
+
+    def get_lineage_many(self, proposition_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Lineage for many propositions in ONE query (e.g. a retrieved context).
+
+        Cached ids are served from the LRU; the rest are fetched with a
+        single IN (json_each(?)) lookup - one bound parameter regardless of
+        how many ids - against the materialized `lineage` table if enabled,
+        otherwise the 3-way join.
+
+        Args:
+            proposition_ids: Proposition IDs
+
+        Returns:
+            {proposition_id: lineage} (same shape as get_full_lineage;
+            unknown ids are absent). Treat the dicts as read-only: they
+            may be shared with the cache.
+        """
+        result = {}
+        missing = []
+        for pid in dict.fromkeys(proposition_ids):
+            cached = self._lineage_cache.get(pid)
+            if cached is None:
+                missing.append(pid)
+            else:
+                result[pid] = cached
+
+        if not missing:
+            return result
+
+        generation = self._lineage_cache.generation
+        if self.materialized_lineage:
+            sql = "SELECT * FROM lineage WHERE proposition_id IN (SELECT value FROM json_each(?))"
+        else:
+            sql = f"SELECT {LINEAGE_COLUMNS} {LINEAGE_JOIN} WHERE pa.proposition_id IN (SELECT value FROM json_each(?))"
+
+        with self._reader() as conn:
+            rows = conn.execute(sql, (json.dumps(missing),)).fetchall()
+
+        for row in rows:
+            lineage = self._lineage_from_row(row)
+            result[row['proposition_id']] = lineage
+            self._lineage_cache.put(row['proposition_id'], lineage, generation=generation)
+        return result
+
+    def _lineage_from_row(self, row: sqlite3.Row) -> Dict:
+        return {
+            "message": {
+                "id": row['message_id'],
+                "role": row['message_role'],
+                "content": self._codec.unpack(row['message_content']),
+                "timestamp": row['message_timestamp']
+            },
+            "semantic_unit": {
+                "unit_id": row['semantic_unit_id'],
+                "content": row['semantic_unit_content'],
+                "type": row['semantic_unit_type'],
+                "narrative_role": row['semantic_unit_narrative_role']
+            },
+            "proposition": {
+                "proposition_id": row['proposition_id'],
+                "content": row['proposition_content'],
+                "type": row['proposition_type']
+            }
+        }
+
+    def _invalidate_lineage(self, level: str, ids: List[str]) -> Callable[[], None]:
+        """
+        after_commit hook for writes that may change cached lineage.
+
+        Args:
+            level: "proposition", "semantic_unit" or "message"
+            ids: Ids of the rows written
+        """
+        id_field = {"proposition": "proposition_id", "semantic_unit": "unit_id", "message": "id"}[level]
+
+        def invalidate():
+            self._lineage_cache.bump()  # Drops puts from reads that raced this commit
+            if level == "proposition":
+                self._lineage_cache.invalidate(ids)
+            elif len(self._lineage_cache):
+                id_set = set(ids)
+                self._lineage_cache.invalidate_where(lambda _, lineage: lineage[level][id_field] in id_set)
+        return invalidate
+
+    # =========================================================================
+    # FULL-TEXT SEARCH
+    # =========================================================================
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        kinds: tuple = ("proposition", "semantic_unit", "message"),
+        raw: bool = False
+    ) -> List[Dict]:
+        """
+        Ranked keyword search over archived content (FTS5, BM25).
+
+        By default every whitespace-separated token is quoted, so URLs,
+        filenames and error codes match literally (implicit AND). Pass
+        raw=True to use FTS5 query syntax (OR, NEAR, prefix*).
+
+        Args:
+            query: Search text
+            limit: Maximum hits (across all kinds)
+            kinds: Any of "proposition", "semantic_unit", "message"
+            raw: Treat query as an FTS5 expression
+
+        Returns:
+            Hits sorted by relevance, each with lineage ids:
+            {"kind", "proposition_id", "semantic_unit_id", "message_id", "rank"}
+            (ids below the hit's level are None)
+        """
+        match = query if raw else " ".join(
+            '"' + token.replace('"', '""') + '"' for token in query.split()
+        )
+        if not match:
+            return []
+
+        sql = {
+            "proposition": """
+                SELECT 'proposition' AS kind,
+                       pa.proposition_id AS proposition_id,
+                       pa.semantic_unit_id AS semantic_unit_id,
+                       su.message_id AS message_id,
+                       bm25(propositions_fts) AS rank
+                FROM propositions_fts
+                JOIN propositions_archive pa ON pa.rowid = propositions_fts.rowid
+                LEFT JOIN semantic_units su ON su.unit_id = pa.semantic_unit_id
+                WHERE propositions_fts MATCH ?
+                ORDER BY rank
+                LIMIT ?
+            """,
+            "semantic_unit": """
+                SELECT 'semantic_unit' AS kind,
+                       NULL AS proposition_id,
+                       su.unit_id AS semantic_unit_id,
+                       su.message_id AS message_id,
+                       bm25(semantic_units_fts) AS rank
+                FROM semantic_units_fts
+                JOIN semantic_units su ON su.rowid = semantic_units_fts.rowid
+                WHERE semantic_units_fts MATCH ?
+                ORDER BY rank
+                LIMIT ?
+            """,
+            "message": """
+                SELECT 'message' AS kind,
+                       NULL AS proposition_id,
+                       NULL AS semantic_unit_id,
+                       m.id AS message_id,
+                       bm25(messages_fts) AS rank
+                FROM messages_fts
+                JOIN messages m ON m.rowid = messages_fts.rowid
+                WHERE messages_fts MATCH ?
+                ORDER BY rank
+                LIMIT ?
+            """
+        }
+
+        hits = []
+        with self._reader() as conn:
+            for kind in kinds:
+                hits.extend(dict(row) for row in conn.execute(sql[kind], (match, limit)).fetchall())
+
+        # bm25() is lower-is-better
+        hits.sort(key=lambda h: h['rank'])
+        return hits[:limit]
+
+    # =========================================================================
+    # COMPRESSION
+    # =========================================================================
+
+    # (table, column, use trained dictionary)
+    COMPRESSED_COLUMNS = (
+        ("messages", "content", False),
+        ("semantic_units", "metadata", True),
+        ("propositions_archive", "metadata", True)
+    )
+
+    def _load_dictionary(self, dict_id: int) -> Optional[bytes]:
+        """Fetch a dictionary trained by another instance/process."""
+        # Own short-lived connection: may run inside archive_decompress()
+        # while every pooled reader is busy
+        uri = f"file:{quote(Path(self.db_path).resolve().as_posix())}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True)
+        try:
+            row = conn.execute("SELECT data FROM compression_dicts WHERE dict_id = ?", (dict_id,)).fetchone()
+            return row[0] if row else None
+        finally:
+            conn.close()
+
+    def _load_active_dictionary(self):
+        """Use the most recently trained dictionary for new writes."""
+        with self._reader() as conn:
+            row = conn.execute("""
+                SELECT dict_id, data FROM compression_dicts
+                ORDER BY dict_id DESC LIMIT 1
+            """).fetchone()
         if row:
-            return {
-                "message": {
-                    "id": row['message_id'],
-                    "role": row['message_role'],
-                    "content": row['message_content'],
-                    "timestamp": row['message_timestamp']
-                },
-                "semantic_unit": {
-                    "unit_id": row['semantic_unit_id'],
-                    "content": row['semantic_unit_content'],
-                    "type": row['semantic_unit_type'],
-                    "narrative_role": row['semantic_unit_narrative_role']
-                },
-                "proposition": {
-                    "proposition_id": row['proposition_id'],
-                    "content": row['proposition_content'],
-                    "type": row['proposition_type']
+            self._codec.add_dictionary(row['dict_id'], row['data'], active=True)
+
+    def train_compression_dictionary(self, sample_size: int = 5000, dict_size: int = 32768) -> int:
+        """
+        Train a zstd dictionary on archived metadata JSON and activate it.
+
+        Metadata rows are a few hundred bytes with identical keys, so
+        per-row compression without a dictionary barely helps; with one
+        they typically shrink 3-5x. Existing rows keep their dictionary
+        (ids are stored per value); run compress_existing(recompress=True)
+        to re-encode them.
+
+        Args:
+            sample_size: Sample rows per table
+            dict_size: Dictionary size in bytes
+
+        Returns:
+            New dictionary id
+        """
+        samples = []
+        with self._reader() as conn:
+            for table, column, use_dict in self.COMPRESSED_COLUMNS:
+                if not use_dict:
+                    continue
+                rows = conn.execute(
+                    f"SELECT {column} FROM {table} WHERE {column} IS NOT NULL ORDER BY random() LIMIT ?",
+                    (sample_size,)
+                ).fetchall()
+                samples.extend(self._codec.unpack(row[0]).encode("utf-8") for row in rows)
+
+        if len(samples) < 100:
+            raise ValueError(f"Need at least 100 metadata rows to train a dictionary, have {len(samples)}")
+
+        data = TextCodec.train_dictionary(samples, dict_size)
+        created = []
+
+        def insert(conn):
+            cursor = conn.execute("""
+                INSERT INTO compression_dicts (algorithm, data, sample_count, created_at)
+                VALUES ('zstd', ?, ?, ?)
+            """, (data, len(samples), datetime.now().isoformat()))
+            created.append(cursor.lastrowid)
+
+        self._write(insert)
+        self._codec.add_dictionary(created[0], data, active=True)
+        return created[0]
+
+    def compress_existing(self, batch_size: int = 1000, recompress: bool = False) -> Dict[str, int]:
+        """
+        Migration: compress rows written as plain TEXT (or before compression).
+
+        Rows are rewritten in place (same rowid) in batched transactions;
+        the FTS update trigger skips them because the text is unchanged.
+
+        Args:
+            batch_size: Rows per transaction
+            recompress: Also re-encode already compressed values (e.g. with
+                        a newly trained dictionary)
+
+        Returns:
+            {"table.column": rows rewritten}
+        """
+        report = {}
+        for table, column, use_dict in self.COMPRESSED_COLUMNS:
+            condition = f"{column} IS NOT NULL" if recompress else f"typeof({column}) = 'text'"
+            after, rewritten = 0, 0
+            while True:
+                with self._reader() as conn:
+                    rows = conn.execute(f"""
+                        SELECT rowid, {column} FROM {table}
+                        WHERE rowid > ? AND {condition}
+                        ORDER BY rowid
+                        LIMIT ?
+                    """, (after, batch_size)).fetchall()
+                if not rows:
+                    break
+                after = rows[-1][0]
+
+                updates = []
+                for rowid, value in rows:
+                    packed = self._codec.pack(self._codec.unpack(value), dictionary=use_dict)
+                    if packed != value:
+                        updates.append((packed, rowid))
+
+                if updates:
+                    self._write(lambda conn, updates=updates: conn.executemany(
+                        f"UPDATE {table} SET {column} = ? WHERE rowid = ?", updates
+                    ))
+                rewritten += len(updates)
+
+            report[f"{table}.{column}"] = rewritten
+        return report
+
+    def get_compression_stats(self) -> Dict[str, Dict]:
+        """
+        Stored vs. uncompressed bytes per compressed column (+ "total").
+
+        Reads sizes from the value headers (no decompression), but still
+        scans the columns - fine for reports, not for hot paths.
+        """
+        stats = {}
+        with self._reader() as conn:
+            for table, column, _ in self.COMPRESSED_COLUMNS:
+                row = conn.execute(f"""
+                    SELECT COALESCE(SUM(length(CAST({column} AS BLOB))), 0) AS stored,
+                           COALESCE(SUM(archive_raw_size({column})), 0) AS raw,
+                           COALESCE(SUM(typeof({column}) = 'blob'), 0) AS compressed_rows
+                    FROM {table}
+                """).fetchone()
+                stats[f"{table}.{column}"] = {
+                    "stored_bytes": row['stored'],
+                    "raw_bytes": row['raw'],
+                    "compressed_rows": row['compressed_rows'],
+                    "ratio": round(row['raw'] / row['stored'], 2) if row['stored'] else 1.0
                 }
+
+        stored = sum(s['stored_bytes'] for s in stats.values())
+        raw = sum(s['raw_bytes'] for s in stats.values())
+        stats["total"] = {
+            "stored_bytes": stored,
+            "raw_bytes": raw,
+            "ratio": round(raw / stored, 2) if stored else 1.0
+        }
+        return stats
+
+    # =========================================================================
+    # OUTBOX
+    # =========================================================================
+
+    def enqueue_outbox(self, entries: List[Dict[str, Any]]):
+        """
+        Append graph projection entries.
+
+        Call inside the same transaction() as the rows they project, so the
+        turn and its pending graph writes commit (or fail) together.
+
+        Args:
+            entries: List of {"kind": "node" | "next" | "link", "payload": {...}}
+        """
+        now = datetime.now().isoformat()
+        rows = [(e['kind'], json.dumps(e['payload']), now) for e in entries]
+        self._write(lambda conn: conn.executemany(
+            "INSERT INTO outbox (kind, payload, created_at) VALUES (?, ?, ?)", rows
+        ))
+
+    def fetch_outbox(self, limit: int = 500) -> List[Dict[str, Any]]:
+        """Oldest pending entries, in commit order."""
+        with self._reader() as conn:
+            rows = conn.execute("""
+                SELECT seq, kind, payload, created_at, attempts FROM outbox
+                ORDER BY seq
+                LIMIT ?
+            """, (limit,)).fetchall()
+        return [{**dict(row), "payload": json.loads(row['payload'])} for row in rows]
+
+    def ack_outbox(self, seqs: List[int]):
+        """Remove applied entries."""
+        self._write(lambda conn: conn.execute(
+            "DELETE FROM outbox WHERE seq IN (SELECT value FROM json_each(?))", (json.dumps(seqs),)
+        ))
+
+    def fail_outbox(self, seqs: List[int], error: str, count_attempt: bool = True):
+        """
+        Record a failed attempt (entries stay queued).
+
+        Args:
+            seqs: Entries of the failed batch
+            error: Error message (truncated)
+            count_attempt: False for transient errors (Neo4j unreachable):
+                           only last_error is updated
+        """
+        self._write(lambda conn: conn.execute("""
+            UPDATE outbox SET attempts = attempts + ?, last_error = ?
+            WHERE seq IN (SELECT value FROM json_each(?))
+        """, (int(count_attempt), error[:1000], json.dumps(seqs))))
+
+    def dead_letter_outbox(self, seqs: List[int], error: str):
+        """Move entries out of the outbox into outbox_dead (kept for inspection / requeue)."""
+        now = datetime.now().isoformat()
+        params = (json.dumps(seqs),)
+
+        def move(conn):
+            conn.execute("""
+                INSERT OR REPLACE INTO outbox_dead (seq, kind, payload, created_at, attempts, last_error, dead_at)
+                SELECT seq, kind, payload, created_at, attempts + 1, ?, ?
+                FROM outbox WHERE seq IN (SELECT value FROM json_each(?))
+            """, (error[:1000], now, *params))
+            conn.execute("DELETE FROM outbox WHERE seq IN (SELECT value FROM json_each(?))", params)
+
+        self._submit([move]).result()
+
+    def fetch_dead_outbox(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Dead-lettered entries, oldest first."""
+        with self._reader() as conn:
+            rows = conn.execute("SELECT * FROM outbox_dead ORDER BY seq LIMIT ?", (limit,)).fetchall()
+        return [{**dict(row), "payload": json.loads(row['payload'])} for row in rows]
+
+    def requeue_dead_outbox(self) -> int:
+        """
+        Put every dead-lettered entry back into the outbox (attempts reset).
+
+        Entries keep their seq, so they are applied before newer ones.
+
+        Returns:
+            Number of entries requeued
+        """
+        requeued = []
+
+        def requeue(conn):
+            cursor = conn.execute("""
+                INSERT OR IGNORE INTO outbox (seq, kind, payload, created_at, attempts, last_error)
+                SELECT seq, kind, payload, created_at, 0, last_error FROM outbox_dead
+            """)
+            conn.execute("DELETE FROM outbox_dead")
+            requeued.append(cursor.rowcount)
+
+        self._submit([requeue]).result()
+        return requeued[0]
+
+    def get_outbox_stats(self) -> Dict[str, Any]:
+        """Pending entries and projection lag (age of the oldest pending entry)."""
+        with self._reader() as conn:
+            row = conn.execute("""
+                SELECT COUNT(*) AS pending,
+                       MIN(created_at) AS oldest,
+                       COALESCE(MAX(attempts), 0) AS max_attempts
+                FROM outbox
+            """).fetchone()
+            dead = conn.execute("SELECT COUNT(*) FROM outbox_dead").fetchone()[0]
+
+        lag = (datetime.now() - datetime.fromisoformat(row['oldest'])).total_seconds() if row['oldest'] else 0.0
+        return {
+            "pending": row['pending'],
+            "oldest_pending_at": row['oldest'],
+            "lag_seconds": round(lag, 3),
+            "max_attempts": row['max_attempts'],
+            "dead_letters": dead
+        }
+
+    # =========================================================================
+    # TIME SEGMENTS
+    # =========================================================================
+
+    def list_segments(self) -> List[Dict]:
+        """Sealed segments registered in this (hot) archive, oldest first."""
+        with self._reader() as conn:
+            return [dict(row) for row in conn.execute("SELECT * FROM archive_segments ORDER BY period")]
+
+    def get_periods(self) -> List[str]:
+        """Months ("YYYY-MM") that still have messages in this archive."""
+        with self._reader() as conn:
+            rows = conn.execute("""
+                SELECT substr(timestamp, 1, 7) AS period FROM messages
+                WHERE timestamp GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]*'
+                GROUP BY period
+                ORDER BY period
+            """).fetchall()
+        return [row['period'] for row in rows]
+
+    def seal_period(self, period: str, segments_dir: str) -> Dict:
+        """
+        Move one month of history into a sealed, compacted, read-only segment.
+
+        A whole lineage moves together (messages of the month, their
+        semantic units and propositions), so lineage never spans segments.
+
+        1. ATTACH this archive to a fresh segment file and copy the rows
+        2. Compress them, optimize FTS, VACUUM INTO the final file (chmod 444)
+        3. Delete them here and register the segment - one transaction, so
+           a crash before it leaves the hot archive untouched (the orphan
+           file is simply overwritten by the next attempt). The month's row
+           counts are re-checked first: rows written after the copy would
+           be deleted without being sealed, so the hand-over aborts with
+           RuntimeError instead and the period can be sealed again later
+
+        Args:
+            period: Month, "YYYY-MM" (must be complete - don't seal the current month)
+            segments_dir: Directory for segment files
+
+        Returns:
+            Registry row: {"period", "path", "messages", "semantic_units",
+            "propositions", "stored_bytes", "sealed_at"}
+        """
+        year, month = (int(part) for part in period.split("-"))
+        start = f"{year:04d}-{month:02d}"
+        end = f"{year + month // 12:04d}-{month % 12 + 1:02d}"
+
+        if any(segment['period'] == start for segment in self.list_segments()):
+            raise ValueError(f"Period {start} is already sealed")
+
+        Path(segments_dir).mkdir(parents=True, exist_ok=True)
+        final_path = str(Path(segments_dir) / f"{start}.db")
+        tmp_path = f"{final_path}.tmp"
+        for path in (final_path, tmp_path, f"{tmp_path}-wal", f"{tmp_path}-shm"):
+            if os.path.exists(path):
+                os.chmod(path, stat.S_IWUSR | stat.S_IRUSR)
+                os.remove(path)
+
+        # 1. Schema + copy (ATTACH is not allowed inside the writer's
+        #    transactions, so the copy runs on its own connection)
+        segment = ArchiveDB(
+            tmp_path,
+            read_pool_size=1,
+            lineage_cache_size=0,
+            materialized_lineage=self.materialized_lineage,
+            compression=self._codec.algorithm,
+            compress_min_bytes=self._codec.min_bytes
+        )
+        segment.close()
+
+        conn = self._connect(path=tmp_path)
+        try:
+            conn.execute("ATTACH DATABASE ? AS hot", (self.db_path,))
+            columns = {
+                table: ", ".join(row[1] for row in conn.execute(f"PRAGMA main.table_info({table})"))
+                for table in ("messages", "semantic_units", "propositions_archive", "compression_dicts")
             }
-        return None
+            conn.execute("BEGIN")
+            conn.execute(f"""
+                INSERT INTO main.compression_dicts ({columns['compression_dicts']})
+                SELECT {columns['compression_dicts']} FROM hot.compression_dicts
+            """)
+            conn.execute(f"""
+                INSERT INTO main.messages ({columns['messages']})
+                SELECT {columns['messages']} FROM hot.messages
+                WHERE timestamp >= ? AND timestamp < ?
+            """, (start, end))
+            conn.execute(f"""
+                INSERT INTO main.semantic_units ({columns['semantic_units']})
+                SELECT {', '.join('su.' + c for c in columns['semantic_units'].split(', '))}
+                FROM hot.semantic_units su
+                JOIN main.messages m ON m.id = su.message_id
+            """)
+            conn.execute(f"""
+                INSERT INTO main.propositions_archive ({columns['propositions_archive']})
+                SELECT {', '.join('pa.' + c for c in columns['propositions_archive'].split(', '))}
+                FROM hot.propositions_archive pa
+                JOIN main.semantic_units su ON su.unit_id = pa.semantic_unit_id
+            """)
+            conn.execute("COMMIT")
+            conn.execute("DETACH DATABASE hot")
+        finally:
+            conn.close()
+
+        # 2. Compress + compact
+        segment = ArchiveDB(
+            tmp_path,
+            read_pool_size=1,
+            lineage_cache_size=0,
+            materialized_lineage=self.materialized_lineage,
+            compression=self._codec.algorithm,
+            compress_min_bytes=self._codec.min_bytes
+        )
+        try:
+            segment.compress_existing()
+            counts = segment.get_stats()
+        finally:
+            segment.close()
+
+        conn = self._connect(path=tmp_path)
+        try:
+            for fts in FTS_TABLES.values():
+                conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('optimize')")
+            conn.execute("PRAGMA journal_mode=DELETE")
+            conn.execute("VACUUM INTO ?", (final_path,))
+        finally:
+            conn.close()
+        for path in (tmp_path, f"{tmp_path}-wal", f"{tmp_path}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+        os.chmod(final_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+
+        # 3. Hand over: delete from the hot archive + register, atomically
+        segment_info = {
+            "period": start,
+            "path": final_path,
+            "messages": counts['messages'],
+            "semantic_units": counts['semantic_units'],
+            "propositions": counts['propositions'],
+            "stored_bytes": os.path.getsize(final_path),
+            "sealed_at": datetime.now().isoformat()
+        }
+
+        def hand_over(conn):
+            moved_messages = "SELECT id FROM messages WHERE timestamp >= ? AND timestamp < ?"
+            moved_units = f"SELECT unit_id FROM semantic_units WHERE message_id IN ({moved_messages})"
+            present = conn.execute(f"""
+                SELECT (SELECT COUNT(*) FROM messages WHERE timestamp >= ? AND timestamp < ?),
+                       (SELECT COUNT(*) FROM semantic_units WHERE message_id IN ({moved_messages})),
+                       (SELECT COUNT(*) FROM propositions_archive WHERE semantic_unit_id IN ({moved_units}))
+            """, (start, end) * 3).fetchone()
+            copied = (counts['messages'], counts['semantic_units'], counts['propositions'])
+            if tuple(present) != copied:
+                raise RuntimeError(
+                    f"Period {start} changed while sealing (archive {tuple(present)} != "
+                    f"segment {copied} messages/units/propositions); retry"
+                )
+            conn.execute(f"DELETE FROM propositions_archive WHERE semantic_unit_id IN ({moved_units})", (start, end))
+            conn.execute(f"DELETE FROM semantic_units WHERE message_id IN ({moved_messages})", (start, end))
+            conn.execute("DELETE FROM messages WHERE timestamp >= ? AND timestamp < ?", (start, end))
+            conn.execute("""
+                INSERT OR REPLACE INTO archive_segments
+                (period, path, messages, semantic_units, propositions, stored_bytes, sealed_at)
+                VALUES (:period, :path, :messages, :semantic_units, :propositions, :stored_bytes, :sealed_at)
+            """, segment_info)
+
+        self._write(hand_over)
+        return segment_info
 
     # =========================================================================
     # STATS
@@ -350,30 +1789,84 @@ class ArchiveDB:
 
     def get_stats(self) -> Dict:
         """Get database statistics."""
-        cursor = self.conn.cursor()
+        with self._reader() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute("SELECT COUNT(*) FROM messages")
-        message_count = cursor.fetchone()[0]
+            cursor.execute("SELECT COUNT(*) FROM messages")
+            message_count = cursor.fetchone()[0]
 
-        cursor.execute("SELECT COUNT(*) FROM semantic_units")
-        semantic_unit_count = cursor.fetchone()[0]
+            cursor.execute("SELECT COUNT(*) FROM semantic_units")
+            semantic_unit_count = cursor.fetchone()[0]
 
-        cursor.execute("SELECT COUNT(*) FROM propositions_archive")
-        proposition_count = cursor.fetchone()[0]
+            cursor.execute("SELECT COUNT(*) FROM propositions_archive")
+            proposition_count = cursor.fetchone()[0]
 
         return {
             "messages": message_count,
             "semantic_units": semantic_unit_count,
-            "propositions": proposition_count
+            "propositions": proposition_count,
+            "lineage_cache": self._lineage_cache.get_stats(),
+            "compression": self.get_compression_stats()
         }
 
     def close(self):
-        """Close database connection."""
-        if self.conn:
-            self.conn.close()
+        """Stop the writer (after draining queued writes) and close readers."""
+        with self._submit_lock:
+            if self._closed and self._writer_error is None:
+                return
+            self._closed = True
+        if self._writer is not None:
+            self._write_queue.put(None)
+            self._writer.join()
+
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
+
+
+# =============================================================================
+# Embedding Codecs
+# =============================================================================
+
+def encode_embedding(embedding, codec: str = "f32") -> bytes:
+    """
+    Pack an embedding into a compact blob.
+
+    Codecs:
+        "f32"       raw little-endian float32 (4 bytes/dim, 6 KB at 1536 dims)
+        "f32+zlib"  zlib-compressed float32
+        "f32+zstd"  zstd-compressed float32 (needs `zstandard`)
+
+    Float32 mantissas are close to random, so compression typically saves
+    only ~5-10%; "f32" is the default.
+    """
+    raw = np.asarray(embedding, dtype="<f4").tobytes()
+    if codec == "f32":
+        return raw
+    if codec == "f32+zlib":
+        return zlib.compress(raw, 6)
+    if codec == "f32+zstd":
+        if zstandard is None:
+            raise ValueError("f32+zstd codec requires the zstandard package")
+        return zstandard.ZstdCompressor(level=3).compress(raw)
+    raise ValueError(f"Unknown embedding codec: {codec}")
+
+
+def decode_embedding(blob: bytes, codec: str, dim: int) -> np.ndarray:
+    """Unpack an embedding blob (read-only float32 view for "f32")."""
+    if codec == "f32+zlib":
+        blob = zlib.decompress(blob)
+    elif codec == "f32+zstd":
+        if zstandard is None:
+            raise ValueError("f32+zstd codec requires the zstandard package")
+        blob = zstandard.ZstdDecompressor().decompress(blob, max_output_size=dim * 4)
+    elif codec != "f32":
+        raise ValueError(f"Unknown embedding codec: {codec}")
+    return np.frombuffer(blob, dtype="<f4", count=dim)
@@ -0,0 +1,287 @@
+"""
+Time-Partitioned Archive for Living Knowledge Ecosystem
+
+The hot archive (data/resemantic_archive.db) keeps receiving writes; once a
+month is over, rollover() seals it into data/archive_segments/YYYY-MM.db -
+compressed, compacted, read-only (see ArchiveDB.seal_period).
+
+SegmentedArchiveDB is a drop-in ArchiveDB whose reads are routed across the
+hot archive and the sealed segments:
+- id lookups / lineage / graph rows: hot first, then segments newest → oldest
+- streams (iter_*): segments oldest → newest, then hot
+- search: per-segment BM25 hits merged by rank
+- stats: hot counts + segment registry
+
+Segments are opened on demand (immutable read-only connections) and the
+least recently used ones are closed beyond max_open_segments.
+"""
+
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from .archive_db import ArchiveDB
+
+
+class SegmentedArchiveDB(ArchiveDB):
+    """ArchiveDB with monthly sealed segments behind a read-routing layer."""
+
+    def __init__(
+        self,
+        db_path: str = "data/resemantic_archive.db",
+        segments_dir: str = "data/archive_segments",
+        max_open_segments: int = 16,
+        **kwargs
+    ):
+        """
+        Args:
+            db_path: Hot archive (all writes go here)
+            segments_dir: Directory for sealed segment files
+            max_open_segments: Segments kept open at once (LRU)
+            **kwargs: ArchiveDB options (compression, lineage, ...)
+        """
+        self.segments_dir = segments_dir
+        self.max_open_segments = max_open_segments
+        self._open_segments: "OrderedDict[str, ArchiveDB]" = OrderedDict()
+        self._segment_refs: Dict[str, int] = {}
+        self._segments_lock = threading.Lock()
+        super().__init__(db_path, **kwargs)
+
+    # =========================================================================
+    # SEGMENT ROUTING
+    # =========================================================================
+
+    @contextmanager
+    def _segment(self, info: Dict) -> Iterator[ArchiveDB]:
+        """Borrow an open sealed segment (opened on first use)."""
+        period = info['period']
+        with self._segments_lock:
+            segment = self._open_segments.get(period)
+            if segment is None:
+                segment = ArchiveDB(
+                    info['path'],
+                    sealed=True,
+                    read_pool_size=2,
+                    lineage_cache_size=0,
+                    compression=self._codec.algorithm
+                )
+                self._open_segments[period] = segment
+            self._open_segments.move_to_end(period)
+            self._segment_refs[period] = self._segment_refs.get(period, 0) + 1
+
+        try:
+            yield segment
+        finally:
+            with self._segments_lock:
+                self._segment_refs[period] -= 1
+                # Close idle segments beyond the limit (never one in use)
+                for old in list(self._open_segments):
+                    if len(self._open_segments) <= self.max_open_segments:
+                        break
+                    if self._segment_refs.get(old, 0) == 0:
+                        self._open_segments.pop(old).close()
+
+    def _segments_newest_first(self) -> List[Dict]:
+        return list(reversed(self.list_segments()))
+
+    def _first_found(self, method: str, *args):
+        """Hot archive first, then segments newest → oldest."""
+        result = getattr(super(), method)(*args)
+        if result:
+            return result
+        for info in self._segments_newest_first():
+            with self._segment(info) as segment:
+                result = getattr(segment, method)(*args)
+            if result:
+                return result
+        return result
+
+    def _chained(self, method: str, **kwargs) -> Iterator:
+        """Stream segments oldest → newest, then the hot archive."""
+        for info in self.list_segments():
+            with self._segment(info) as segment:
+                yield from getattr(segment, method)(**kwargs)
+        yield from getattr(super(), method)(**kwargs)
+
+    # =========================================================================
+    # ROLLOVER
+    # =========================================================================
+
+    def rollover(self, keep_periods: int = 1) -> List[Dict]:
+        """
+        Seal every month except the newest `keep_periods` (incl. the current one).
+
+        Args:
+            keep_periods: Months that stay in the hot archive
+
+        Returns:
+            Registry rows of the newly sealed segments
+        """
+        current = datetime.now().strftime("%Y-%m")
+        hot_periods = [p for p in self.get_periods() if p < current]
+        to_seal = hot_periods[:max(0, len(hot_periods) - (keep_periods - 1))]
+
+        sealed = []
+        for period in to_seal:
+            print(f"🧊 Sealing {period}...")
+            sealed.append(self.seal_period(period, self.segments_dir))
+        return sealed
+
+    # =========================================================================
+    # ROUTED READS
+    # =========================================================================
+
+    def get_message(self, message_id: str) -> Optional[Dict]:
+        return self._first_found("get_message", message_id)
+
+    def get_semantic_unit(self, unit_id: str) -> Optional[Dict]:
+        return self._first_found("get_semantic_unit", unit_id)
+
+    def get_semantic_units_by_message(self, message_id: str) -> List[Dict]:
+        return self._first_found("get_semantic_units_by_message", message_id)
+
+    def get_proposition(self, proposition_id: str) -> Optional[Dict]:
+        return self._first_found("get_proposition", proposition_id)
+
+    def get_all_messages(self, limit: int = 100) -> List[Dict]:
+        messages = super().get_all_messages(limit)
+        for info in self._segments_newest_first():
+            if len(messages) >= limit:
+                break
+            with self._segment(info) as segment:
+                messages.extend(segment.get_all_messages(limit - len(messages)))
+        return messages
+
+    def get_lineage_many(self, proposition_ids: List[str]) -> Dict[str, Dict]:
+        result = super().get_lineage_many(proposition_ids)
+        missing = [pid for pid in dict.fromkeys(proposition_ids) if pid not in result]
+
+        for info in self._segments_newest_first():
+            if not missing:
+                break
+            with self._segment(info) as segment:
+                found = segment.get_lineage_many(missing)
+            for pid, lineage in found.items():
+                self._lineage_cache.put(pid, lineage)  # Sealed = immutable
+                result[pid] = lineage
+            missing = [pid for pid in missing if pid not in found]
+        return result
+
+    def get_graph_rows(self, proposition_ids: List[str]) -> Dict[str, Dict]:
+        """Like ArchiveDB.get_graph_rows; rowids are [period, rowid] cursors."""
+        result = super().get_graph_rows(proposition_ids)
+        for row in result.values():
+            row['rowid'] = ["hot", row['rowid']]
+        missing = [pid for pid in dict.fromkeys(proposition_ids) if pid not in result]
+
+        for info in self._segments_newest_first():
+            if not missing:
+                break
+            with self._segment(info) as segment:
+                found = segment.get_graph_rows(missing)
+            for pid, row in found.items():
+                row['rowid'] = [info['period'], row['rowid']]
+                result[pid] = row
+            missing = [pid for pid in missing if pid not in found]
+        return result
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        kinds: tuple = ("proposition", "semantic_unit", "message"),
+        raw: bool = False
+    ) -> List[Dict]:
+        hits = super().search(query, limit=limit, kinds=kinds, raw=raw)
+        for info in self.list_segments():
+            with self._segment(info) as segment:
+                hits.extend(segment.search(query, limit=limit, kinds=kinds, raw=raw))
+
+        # Per-segment BM25 statistics differ slightly; close enough to merge
+        hits.sort(key=lambda h: h['rank'])
+        return hits[:limit]
+
+    def iter_messages(self, chunk_size: int = 1000, after: Optional[tuple] = None) -> Iterator[Dict]:
+        return self._chained("iter_messages", chunk_size=chunk_size, after=after)
+
+    def iter_semantic_units(self, chunk_size: int = 1000, after: Optional[tuple] = None) -> Iterator[Dict]:
+        return self._chained("iter_semantic_units", chunk_size=chunk_size, after=after)
+
+    def iter_propositions(
+        self,
+        chunk_size: int = 1000,
+        after: Optional[tuple] = None,
+        include_embedding: bool = False
+    ) -> Iterator[Dict]:
+        return self._chained("iter_propositions", chunk_size=chunk_size, after=after, include_embedding=include_embedding)
+
+    def iter_embedding_batches(self, batch_size: int = 10000, model: Optional[str] = None) -> Iterator[tuple]:
+        return self._chained("iter_embedding_batches", batch_size=batch_size, model=model)
+
+    def iter_graph_batches(self, batch_size: int = 1000, after_rowid=0, model: Optional[str] = None) -> Iterator[List[Dict]]:
+        """
+        Like ArchiveDB.iter_graph_batches, across segments.
+
+        Rowids are per file, so each row's "rowid" is a [period, rowid]
+        cursor ("hot" for the hot archive); pass it back as after_rowid.
+        """
+        after_period, after = after_rowid if isinstance(after_rowid, (list, tuple)) else ("", after_rowid)
+        sources = [(info['period'], info) for info in self.list_segments()] + [("hot", None)]
+
+        for period, info in sources:
+            if period < after_period:
+                continue
+            start = after if period == after_period else 0
+
+            if info is None:
+                batches = super().iter_graph_batches(batch_size=batch_size, after_rowid=start, model=model)
+                yield from self._tag_rowids(batches, period)
+            else:
+                with self._segment(info) as segment:
+                    batches = segment.iter_graph_batches(batch_size=batch_size, after_rowid=start, model=model)
+                    yield from self._tag_rowids(batches, period)
+
+    @staticmethod
+    def _tag_rowids(batches: Iterator[List[Dict]], period: str) -> Iterator[List[Dict]]:
+        for batch in batches:
+            for row in batch:
+                row['rowid'] = [period, row['rowid']]
+            yield batch
+
+    def get_compression_stats(self) -> Dict[str, Dict]:
+        stats = super().get_compression_stats()
+        for info in self.list_segments():
+            with self._segment(info) as segment:
+                segment_stats = segment.get_compression_stats()
+            for column, values in segment_stats.items():
+                for key in ("stored_bytes", "raw_bytes", "compressed_rows"):
+                    if key in values:
+                        stats[column][key] += values[key]
+
+        for values in stats.values():
+            values['ratio'] = round(values['raw_bytes'] / values['stored_bytes'], 2) if values['stored_bytes'] else 1.0
+        return stats
+
+    def get_stats(self) -> Dict:
+        """Hot + sealed totals (segment counts come from the registry)."""
+        stats = super().get_stats()
+        segments = self.list_segments()
+        for info in segments:
+            stats['messages'] += info['messages']
+            stats['semantic_units'] += info['semantic_units']
+            stats['propositions'] += info['propositions']
+        stats['segments'] = {
+            "sealed": len(segments),
+            "open": len(self._open_segments),
+            "stored_bytes": sum(info['stored_bytes'] for info in segments)
+        }
+        return stats
+
+    def close(self):
+        with self._segments_lock:
+            for segment in self._open_segments.values():
+                segment.close()
+            self._open_segments.clear()
+        super().close()
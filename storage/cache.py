@@ -0,0 +1,122 @@
+"""
+In-Process Caches for Living Knowledge Ecosystem
+
+LRUCache: thread-safe LRU map for hot lookups (lineage, retrieval results,
+query embeddings), with optional TTL expiry.
+
+Writers bump a generation counter after they commit; readers capture the
+generation before querying and pass it to put(). A value read before a
+concurrent commit is then dropped instead of cached, so the cache never
+resurrects stale rows.
+
+Caches whose entries are not invalidated key by key (retrieval results)
+put the generation into the key instead: a bump makes every older entry
+unreachable, and LRU/TTL evicts them.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+
+class LRUCache:
+    """Thread-safe LRU cache with hit/miss counters, a write generation and optional TTL."""
+
+    def __init__(self, maxsize: int = 4096, ttl: Optional[float] = None):
+        """
+        Args:
+            maxsize: Maximum entries (0 = disabled)
+            ttl: Seconds an entry stays valid (None = until evicted)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._expires: Dict[Hashable, float] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value (and mark it recently used)."""
+        with self._lock:
+            if key in self._data:
+                if self.ttl is not None and self._expires.get(key, 0.0) < time.monotonic():
+                    del self._data[key]
+                    self._expires.pop(key, None)
+                    self.expired += 1
+                    self.misses += 1
+                    return default
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any, generation: Optional[int] = None):
+        """
+        Cache a value.
+
+        Args:
+            key: Cache key
+            value: Value (treat as read-only once cached)
+            generation: Generation captured before the value was read;
+                        the put is ignored if a write committed since
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if self.ttl is not None:
+                self._expires[key] = time.monotonic() + self.ttl
+            while len(self._data) > self.maxsize:
+                old, _ = self._data.popitem(last=False)
+                self._expires.pop(old, None)
+
+    def invalidate(self, keys: Iterable[Hashable]):
+        """Drop specific keys."""
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+                self._expires.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Hashable, Any], bool]):
+        """Drop every entry for which predicate(key, value) is true."""
+        with self._lock:
+            for key in [k for k, v in self._data.items() if predicate(k, v)]:
+                del self._data[key]
+                self._expires.pop(key, None)
+
+    def bump(self) -> int:
+        """Advance the generation (call after a write commits)."""
+        with self._lock:
+            self.generation += 1
+            return self.generation
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._expires.clear()
+            self.generation += 1
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_stats(self) -> Dict:
+        """Get cache statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "expired": self.expired,
+            "ttl": self.ttl,
+            "generation": self.generation
+        }
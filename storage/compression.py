@@ -0,0 +1,173 @@
+"""
+Transparent Text Compression for the SQLite Archive
+
+Large TEXT values (raw messages, reasoning, metadata JSON) are stored as
+BLOBs in the same columns; short/incompressible values stay plain TEXT, so
+the column type alone says whether a value is compressed:
+
+    TEXT  → plain UTF-8
+    BLOB  → 1-byte codec + 4-byte raw length [+ 4-byte dictionary id] + payload
+
+Codecs: zlib, zstd, zstd with a trained dictionary. Dictionaries matter for
+the short, repetitive metadata JSON (same keys in every row) that
+plain zstd/zlib barely shrinks.
+"""
+
+import struct
+import zlib
+import threading
+from typing import Callable, Dict, List, Optional, Union
+
+try:
+    import zstandard
+except ImportError:  # Optional: falls back to zlib
+    zstandard = None
+
+
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+CODEC_ZSTD_DICT = 3
+
+_HEADER = struct.Struct("<BI")       # codec, raw length
+_DICT_HEADER = struct.Struct("<BII")  # codec, raw length, dictionary id
+
+
+class TextCodec:
+    """Compress/decompress archive text values (thread-safe)."""
+
+    def __init__(
+        self,
+        algorithm: str = "zstd",
+        min_bytes: int = 256,
+        dict_min_bytes: int = 64,
+        level: int = 3,
+        dictionary_loader: Optional[Callable[[int], Optional[bytes]]] = None
+    ):
+        """
+        Args:
+            algorithm: "zstd" (falls back to zlib if `zstandard` is missing),
+                       "zlib" or "none"
+            min_bytes: Values shorter than this stay plain (no dictionary)
+            dict_min_bytes: With an active dictionary, compress from here
+            level: Compression level
+            dictionary_loader: dict_id → bytes, for dictionaries trained
+                               after this codec was created
+        """
+        if algorithm == "zstd" and zstandard is None:
+            algorithm = "zlib"
+        if algorithm not in ("zstd", "zlib", "none"):
+            raise ValueError(f"Unknown compression algorithm: {algorithm}")
+
+        self.algorithm = algorithm
+        self.min_bytes = min_bytes
+        self.dict_min_bytes = dict_min_bytes
+        self.level = level
+        self.dictionary_loader = dictionary_loader
+
+        self.active_dict_id: Optional[int] = None
+        self._dictionaries: Dict[int, "zstandard.ZstdCompressionDict"] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()  # zstd (de)compressors are per-thread
+
+    # =========================================================================
+    # DICTIONARIES
+    # =========================================================================
+
+    def add_dictionary(self, dict_id: int, data: bytes, active: bool = False):
+        """Register a trained dictionary (optionally as the one used for writes)."""
+        if zstandard is None:
+            return
+        with self._lock:
+            self._dictionaries[dict_id] = zstandard.ZstdCompressionDict(data)
+            if active:
+                self.active_dict_id = dict_id
+
+    def _dictionary(self, dict_id: int) -> "zstandard.ZstdCompressionDict":
+        dictionary = self._dictionaries.get(dict_id)
+        if dictionary is None and self.dictionary_loader:
+            data = self.dictionary_loader(dict_id)
+            if data is not None:
+                self.add_dictionary(dict_id, data)
+                dictionary = self._dictionaries.get(dict_id)
+        if dictionary is None:
+            raise KeyError(f"Unknown compression dictionary: {dict_id}")
+        return dictionary
+
+    @staticmethod
+    def train_dictionary(samples: List[bytes], dict_size: int = 32768) -> bytes:
+        """Train a zstd dictionary from sample payloads."""
+        if zstandard is None:
+            raise RuntimeError("Dictionary training requires the zstandard package")
+        return zstandard.train_dictionary(dict_size, samples).as_bytes()
+
+    def _zstd(self, kind: str, dict_id: Optional[int]):
+        cache = self._local.__dict__.setdefault(kind, {})
+        codec = cache.get(dict_id)
+        if codec is None:
+            dictionary = self._dictionary(dict_id) if dict_id is not None else None
+            if kind == "c":
+                codec = zstandard.ZstdCompressor(level=self.level, dict_data=dictionary)
+            else:
+                codec = zstandard.ZstdDecompressor(dict_data=dictionary)
+            cache[dict_id] = codec
+        return codec
+
+    # =========================================================================
+    # PACK / UNPACK
+    # =========================================================================
+
+    def pack(self, text: Optional[str], dictionary: bool = False) -> Union[str, bytes, None]:
+        """
+        Compress a value if it is worth it.
+
+        Args:
+            text: Value to store
+            dictionary: Use the active trained dictionary (short JSON)
+
+        Returns:
+            Compressed BLOB, or the original text if it is short,
+            incompressible or compression is off
+        """
+        if text is None or self.algorithm == "none":
+            return text
+
+        raw = text.encode("utf-8")
+        dict_id = self.active_dict_id if dictionary and self.algorithm == "zstd" else None
+
+        if dict_id is not None and len(raw) >= self.dict_min_bytes:
+            blob = _DICT_HEADER.pack(CODEC_ZSTD_DICT, len(raw), dict_id) + self._zstd("c", dict_id).compress(raw)
+        elif len(raw) >= self.min_bytes:
+            if self.algorithm == "zstd":
+                blob = _HEADER.pack(CODEC_ZSTD, len(raw)) + self._zstd("c", None).compress(raw)
+            else:
+                blob = _HEADER.pack(CODEC_ZLIB, len(raw)) + zlib.compress(raw, 6)
+        else:
+            return text
+
+        return blob if len(blob) < len(raw) else text
+
+    def unpack(self, value: Union[str, bytes, None]) -> Optional[str]:
+        """Inverse of pack(); plain text passes through."""
+        if not isinstance(value, bytes):
+            return value
+
+        codec, raw_len = _HEADER.unpack_from(value)
+        if codec == CODEC_ZLIB:
+            raw = zlib.decompress(value[_HEADER.size:])
+        elif codec == CODEC_ZSTD:
+            raw = self._zstd("d", None).decompress(value[_HEADER.size:], max_output_size=raw_len)
+        elif codec == CODEC_ZSTD_DICT:
+            _, _, dict_id = _DICT_HEADER.unpack_from(value)
+            raw = self._zstd("d", dict_id).decompress(value[_DICT_HEADER.size:], max_output_size=raw_len)
+        else:
+            raise ValueError(f"Unknown compression codec: {codec}")
+        return raw.decode("utf-8")
+
+    @staticmethod
+    def raw_size(value: Union[str, bytes, None]) -> int:
+        """Uncompressed size in bytes (read from the header, no decompression)."""
+        if value is None:
+            return 0
+        if isinstance(value, bytes):
+            return _HEADER.unpack_from(value)[1]
+        return len(value.encode("utf-8"))
@@ -9,10 +9,16 @@ from openai import OpenAI
 from typing import List, Union
 import os
 
+from .cache import LRUCache
+
 
 class EmbeddingGenerator:
     """Generate embeddings using OpenAI."""
 
+    # Process-wide cache for generate(): repeated queries skip the API call
+    # (embeddings of a given text never change, so no invalidation)
+    query_cache = LRUCache(maxsize=2048)
+
     def __init__(self, api_key: str = None):
         """
         Initialize embedding generator.
@@ -36,14 +42,22 @@ class EmbeddingGenerator:
             text: Text to embed
 
         Returns:
-            List of 1536 floats
+            List of 1536 floats (cached per model + whitespace-normalized text;
+            treat as read-only)
         """
+        key = (self.model, " ".join(text.split()))
+        embedding = self.query_cache.get(key)
+        if embedding is not None:
+            return embedding
+
         response = self.client.embeddings.create(
             model=self.model,
             input=text
         )
 
-        return response.data[0].embedding
+        embedding = response.data[0].embedding
+        self.query_cache.put(key, embedding)
+        return embedding
 
     def generate_batch(self, texts: List[str]) -> List[List[float]]:
         """
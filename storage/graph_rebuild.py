@@ -0,0 +1,205 @@
+"""
+Graph Rebuild from the SQLite Archive for Living Knowledge Ecosystem
+
+Regenerates the Neo4j graph without re-chatting or re-embedding:
+1. nodes     - stream archived propositions (joined to semantic units and
+               messages) in insertion order, UNWIND-write Proposition nodes
+               and the NEXT chain of each conversation
+2. vectors   - mirror the archived embeddings into the LocalVectorStore
+3. coherent  - exact blocked kNN -> COHERENT edges (knn_graph), then
+               degree stats + hub cap
+
+Every phase is checkpointed, so an interrupted rebuild resumes where it
+stopped (node batches are MERGEs, replaying one is harmless).
+"""
+
+import os
+import json
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from .knn_graph import rebuild_coherent_edges, _load_checkpoint
+from .vector_store import LocalVectorStore
+
+
+def rebuild_graph(
+    neo4j,
+    archive,
+    store: LocalVectorStore,
+    k: int,
+    min_similarity: float,
+    max_degree: int,
+    model: Optional[str] = None,
+    checkpoint_path: str = "data/graph_rebuild.checkpoint.json",
+    batch_size: int = 1000,
+    wipe: bool = True
+) -> Dict:
+    """
+    Rebuild all Proposition nodes, NEXT and COHERENT edges from the archive.
+
+    NEXT edges follow each conversation's seq order across turns, exactly
+    as link_turn() does online; turns archived out of seq order are spliced
+    in with link_turn(). Propositions archived before seq numbers existed
+    keep the old rule: consecutive propositions of the same turn (same
+    message timestamp, archive order).
+
+    Args:
+        neo4j: Neo4jClient instance
+        archive: ArchiveDB instance (source of truth)
+        store: Local vector store (rebuilt from the archive)
+        k: Neighbours per proposition (Neo4jConfig.TOP_K_NEIGHBORS)
+        min_similarity: COHERENT threshold (Neo4jConfig.SIMILARITY_THRESHOLD)
+        max_degree: COHERENT degree cap (Neo4jConfig.MAX_COHERENT_DEGREE)
+        model: Only embeddings from this model (EmbeddingConfig.MODEL)
+        checkpoint_path: JSON progress file
+        batch_size: Nodes per Neo4j transaction
+        wipe: Delete existing Proposition nodes before a fresh run
+
+    Returns:
+        {"nodes", "next_edges", "coherent_edges", "evicted", "deleted",
+         "resumed_phase", "seconds"}
+    """
+    start = time.time()
+    params = {"k": k, "min_similarity": min_similarity, "max_degree": max_degree, "model": model}
+
+    state = _load_checkpoint(checkpoint_path)
+    if state is not None and state.get("params") == params:
+        print(f"↩️  Resuming graph rebuild at phase '{state['phase']}' (cursor {state['after_rowid']})")
+    else:
+        state = {
+            "params": params,
+            "phase": "nodes",
+            "after_rowid": 0,
+            "tail": None,
+            "tails": {},
+            "nodes": 0,
+            "next_edges": 0,
+            "coherent_edges": 0,
+            "evicted": 0,
+            "deleted": 0
+        }
+        if wipe:
+            print("🗑️  Deleting existing Proposition nodes...")
+            state["deleted"] = neo4j.delete_all_propositions()
+        neo4j.setup_schema()
+        _save_state(checkpoint_path, state)
+
+    resumed_phase = state["phase"]
+
+    # 1. Nodes + NEXT
+    if state["phase"] == "nodes":
+        phase_start = time.time()
+        phase_rows = 0
+        tail = state["tail"]  # Last legacy node of the previous batch: {"id", "timestamp"}
+        tails = state.get("tails") or {}  # Highest-seq node per session: {"id", "seq"}
+
+        for batch in archive.iter_graph_batches(batch_size=batch_size, after_rowid=state["after_rowid"], model=model):
+            state["nodes"] += neo4j.create_propositions_batch([
+                {
+                    "id": row['proposition_id'],
+                    "content": row['content'],
+                    "embedding": row['embedding'],
+                    "type": row['type'],
+                    "certainty": row['certainty'],
+                    "concepts": row['concepts'],
+                    "source_message_id": row['message_id'],
+                    "source_semantic_unit_id": row['semantic_unit_id'],
+                    "speaker": row['speaker'],
+                    "timestamp": row['timestamp'],
+                    "block_metadata": row['block_metadata'],
+                    "session_id": row['session_id'],
+                    "seq": row['seq'],
+                    "tenant_id": row['tenant_id']
+                }
+                for row in batch
+            ])
+
+            next_edges, late_turns = [], []
+            for row in batch:
+                pid, session_id, seq = row['proposition_id'], row['session_id'], row['seq']
+                if seq is None:
+                    if tail and tail["timestamp"] == row['timestamp']:
+                        next_edges.append({"from": tail["id"], "to": pid})
+                    tail = {"id": pid, "timestamp": row['timestamp']}
+                    continue
+
+                last = tails.get(session_id)
+                if last is None or last["seq"] < seq:
+                    if last is not None:
+                        next_edges.append({"from": last["id"], "to": pid})
+                    tails[session_id] = {"id": pid, "seq": seq}
+                elif (late_turns and late_turns[-1]["session_id"] == session_id
+                        and late_turns[-1]["timestamp"] == row['timestamp']):
+                    late_turns[-1]["proposition_ids"].append(pid)
+                    late_turns[-1]["last_seq"] = seq
+                else:
+                    late_turns.append({"session_id": session_id, "timestamp": row['timestamp'],
+                                       "proposition_ids": [pid], "first_seq": seq, "last_seq": seq})
+            if next_edges:
+                state["next_edges"] += neo4j.create_temporal_edges_batch(next_edges)
+            for turn in late_turns:
+                neo4j.link_turn(turn["session_id"], turn["proposition_ids"], turn["first_seq"], turn["last_seq"])
+                state["next_edges"] += len(turn["proposition_ids"])
+
+            # Opaque resume cursor: an int, or [period, rowid] for segmented archives
+            state["after_rowid"] = batch[-1]['rowid']
+            state["tail"] = tail
+            state["tails"] = tails
+            _save_state(checkpoint_path, state)
+
+            phase_rows += len(batch)
+            elapsed = time.time() - phase_start
+            rate = phase_rows / elapsed if elapsed else 0
+            print(f"   {state['nodes']} nodes | {state['next_edges']} NEXT | {rate:.0f} rows/s", end="\r", flush=True)
+
+        print()
+        state["phase"] = "vectors"
+        _save_state(checkpoint_path, state)
+
+    # 2. Local vector mirror
+    if state["phase"] == "vectors":
+        print("🔄 Mirroring archived embeddings into the local vector store...")
+        count = store.rebuild_from_archive(archive, model=model)
+        print(f"   {count} embeddings")
+        state["phase"] = "coherent"
+        _save_state(checkpoint_path, state)
+
+    # 3. COHERENT (own row-block checkpoint) + hub control
+    if state["phase"] == "coherent":
+        stats = rebuild_coherent_edges(
+            neo4j,
+            store,
+            k=k,
+            min_similarity=min_similarity,
+            checkpoint_path=f"{checkpoint_path}.coherent",
+            write_batch_size=batch_size * 10,
+            replace=not wipe
+        )
+        print("⚖️  Refreshing degrees + local scaling, enforcing degree cap...")
+        neo4j.refresh_coherent_stats(k=k)
+        state["coherent_edges"] = stats["edges_written"]
+        state["evicted"] = neo4j.enforce_degree_cap(max_degree)
+        state["phase"] = "done"
+        _save_state(checkpoint_path, state)
+
+    os.remove(checkpoint_path)
+
+    return {
+        "nodes": state["nodes"],
+        "next_edges": state["next_edges"],
+        "coherent_edges": state["coherent_edges"],
+        "evicted": state["evicted"],
+        "deleted": state["deleted"],
+        "resumed_phase": resumed_phase,
+        "seconds": round(time.time() - start, 1)
+    }
+
+
+def _save_state(path: str, state: Dict):
+    """Write checkpoint atomically (tmp + rename)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({**state, "updated_at": datetime.now().isoformat()}, f)
+    os.replace(tmp, path)
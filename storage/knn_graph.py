@@ -0,0 +1,203 @@
+"""
+Offline kNN Graph Construction for Living Knowledge Ecosystem
+
+Exact all-pairs top-K over the LocalVectorStore, computed in
+memory-bounded NumPy blocks:
+- Peak memory ≈ block_rows × block_cols × 4 bytes (scores) + the top-K buffers
+- Matrix pages are streamed from the memmap, never fully loaded
+
+Used by rebuild_coherent_edges() to recompute COHERENT edges for the whole
+graph (e.g. after changing SIMILARITY_THRESHOLD / TOP_K_NEIGHBORS).
+"""
+
+import os
+import json
+import time
+from datetime import datetime
+from typing import Iterator, Tuple, Dict, Optional
+
+import numpy as np
+
+from .vector_store import LocalVectorStore
+
+
+def blocked_topk(
+    matrix: np.ndarray,
+    k: int,
+    block_rows: int = 1024,
+    block_cols: int = 32768,
+    start_row: int = 0
+) -> Iterator[Tuple[int, np.ndarray, np.ndarray]]:
+    """
+    Exact top-K neighbours (by dot product) for every row, excluding self.
+
+    Rows of `matrix` must be L2-normalized (LocalVectorStore guarantees it),
+    so scores are cosine similarities.
+
+    Args:
+        matrix: N x dims float32 (memmap is fine)
+        k: Neighbours per row
+        block_rows: Query rows scored per block
+        block_cols: Candidate rows scored per block
+        start_row: First row to process (resume support)
+
+    Yields:
+        (row_start, indices[b, k'], scores[b, k']) per row block,
+        sorted by score (desc); k' = min(k, N - 1)
+    """
+    n = len(matrix)
+    k = min(k, n - 1)
+    if k <= 0:
+        return
+
+    for row_start in range(start_row, n, block_rows):
+        rows = np.asarray(matrix[row_start:row_start + block_rows])
+        b = len(rows)
+
+        best_idx = np.empty((b, 0), dtype=np.int64)
+        best_scores = np.empty((b, 0), dtype=np.float32)
+
+        for col_start in range(0, n, block_cols):
+            scores = rows @ np.asarray(matrix[col_start:col_start + block_cols]).T
+
+            # Exclude self-similarity where the row and column blocks overlap
+            overlap = np.arange(b) + row_start - col_start
+            mask = (overlap >= 0) & (overlap < scores.shape[1])
+            scores[np.nonzero(mask)[0], overlap[mask]] = -np.inf
+
+            kk = min(k, scores.shape[1])
+            part = np.argpartition(-scores, kk - 1, axis=1)[:, :kk]
+
+            best_idx = np.concatenate([best_idx, part + col_start], axis=1)
+            best_scores = np.concatenate([best_scores, np.take_along_axis(scores, part, axis=1)], axis=1)
+
+            if best_idx.shape[1] > k:
+                keep = np.argpartition(-best_scores, k - 1, axis=1)[:, :k]
+                best_idx = np.take_along_axis(best_idx, keep, axis=1)
+                best_scores = np.take_along_axis(best_scores, keep, axis=1)
+
+        order = np.argsort(-best_scores, axis=1)
+        yield (
+            row_start,
+            np.take_along_axis(best_idx, order, axis=1),
+            np.take_along_axis(best_scores, order, axis=1)
+        )
+
+
+def rebuild_coherent_edges(
+    neo4j,
+    store: LocalVectorStore,
+    k: int,
+    min_similarity: float,
+    checkpoint_path: str = "data/coherent_rebuild.checkpoint.json",
+    block_rows: int = 1024,
+    write_batch_size: int = 10000,
+    replace: bool = True
+) -> Dict:
+    """
+    Recompute all COHERENT edges as a symmetric exact kNN graph.
+
+    Edge (a, b) exists if b is in a's top-K or a is in b's top-K (and the
+    similarity clears the threshold). Mutual neighbours within a row block
+    are sent once; pairs spanning blocks collapse in the undirected MERGE
+    and are counted once (relationships actually created). Progress is
+    checkpointed after every row block, so an interrupted run resumes where
+    it stopped; a checkpoint made with different k / threshold / store size
+    is discarded.
+
+    Args:
+        neo4j: Neo4jClient instance
+        store: Local vector store (mirror of all embeddings)
+        k: Neighbours per proposition (Neo4jConfig.TOP_K_NEIGHBORS)
+        min_similarity: Edge threshold (Neo4jConfig.SIMILARITY_THRESHOLD)
+        checkpoint_path: JSON progress file
+        block_rows: Rows per kNN block (memory vs. speed)
+        write_batch_size: Edges per Neo4j transaction
+        replace: Delete existing COHERENT edges before a fresh run
+
+    Returns:
+        {"rows", "edges_written", "deleted", "resumed_from", "seconds"}
+        (edges_written = distinct COHERENT edges created)
+    """
+    start = time.time()
+    matrix = store.matrix
+    ids = store.ids
+    n = len(matrix)
+
+    params = {"k": k, "min_similarity": min_similarity, "rows": n}
+    checkpoint = _load_checkpoint(checkpoint_path)
+    resume = checkpoint is not None and checkpoint.get("params") == params
+
+    deleted = 0
+    if resume:
+        next_row = checkpoint["next_row"]
+        edges_written = checkpoint["edges_written"]
+        print(f"↩️  Resuming COHERENT rebuild at row {next_row}/{n}")
+    else:
+        next_row, edges_written = 0, 0
+        if replace:
+            print("🗑️  Deleting existing COHERENT edges...")
+            deleted = neo4j.delete_semantic_edges()
+        _save_checkpoint(checkpoint_path, params, 0, 0)
+
+    resumed_from = next_row
+
+    for row_start, idx, scores in blocked_topk(matrix, k, block_rows=block_rows, start_row=next_row):
+        pairs = {}  # Unordered pair -> edge: (a, b) and (b, a) written once
+        for r in range(len(idx)):
+            a = row_start + r
+            for j, score in zip(idx[r], scores[r]):
+                if score < min_similarity:
+                    break  # Sorted desc
+                key = (a, int(j)) if a < j else (int(j), a)
+                if key not in pairs:
+                    pairs[key] = {"a": ids[key[0]], "b": ids[key[1]], "weight": float(score)}
+        pending = list(pairs.values())
+
+        # Flush whole blocks only, so the checkpoint never skips edges
+        for i in range(0, len(pending), write_batch_size):
+            edges_written += neo4j.create_semantic_edges_batch(
+                pending[i:i + write_batch_size], created_by="rebuild"
+            )
+
+        next_row = row_start + len(idx)
+        _save_checkpoint(checkpoint_path, params, next_row, edges_written)
+
+        elapsed = time.time() - start
+        rate = (next_row - resumed_from) / elapsed if elapsed else 0
+        print(f"   {next_row}/{n} rows | {edges_written} edges | {rate:.0f} rows/s", end="\r", flush=True)
+
+    print()
+    os.remove(checkpoint_path)
+
+    return {
+        "rows": n,
+        "edges_written": edges_written,
+        "deleted": deleted,
+        "resumed_from": resumed_from,
+        "seconds": round(time.time() - start, 1)
+    }
+
+
+# =============================================================================
+# Checkpointing
+# =============================================================================
+
+def _load_checkpoint(path: str) -> Optional[Dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_checkpoint(path: str, params: Dict, next_row: int, edges_written: int):
+    """Write checkpoint atomically (tmp + rename)."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({
+            "params": params,
+            "next_row": next_row,
+            "edges_written": edges_written,
+            "updated_at": datetime.now().isoformat()
+        }, f)
+    os.replace(tmp, path)
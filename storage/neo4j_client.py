@@ -6,19 +6,157 @@ Handles all graph operations:
 - Schema setup
 - Proposition CRUD
 - Edge creation (NEXT, COHERENT)
-- Vector search
+- Vector search, full-text search, hybrid (RRF)
+- Retrieval (vector seeds + bounded COHERENT expansion)
+- Agenda (typed block lookup: decisions, resources, documents)
 - Queries
 """
 
-from neo4j import GraphDatabase
+from neo4j import GraphDatabase, Query
+from neo4j.exceptions import Neo4jError
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Iterator
+import functools
+import hashlib
+import inspect
+import re
+import threading
 import uuid
 
+import numpy as np
+
+from .cache import LRUCache
+
+
+# Lucene query syntax characters (escaped in user text for full-text search;
+# & and | one by one, so "&&" / "||" become "\&\&" / "\|\|", not "\&&")
+_LUCENE_SPECIAL = re.compile(r'([+\-!(){}\[\]^"~*?:\\/&|])')
+# Bare operator keywords (upper case only is syntax; lower case is a term)
+_LUCENE_KEYWORDS = re.compile(r'\b(AND|OR|NOT|TO)\b')
+
+
+def _escape_lucene(text: str) -> str:
+    """User text as a plain Lucene full-text query (no operators)."""
+    escaped = _LUCENE_SPECIAL.sub(r"\\\1", text)
+    return _LUCENE_KEYWORDS.sub(lambda m: m.group(1).lower(), escaped).strip()
+
+
+_MISS = object()
+
+# Block kind -> (node label, block_metadata fields promoted to node properties).
+# The first field marks the kind as present and is what `contains` matches.
+_BLOCK_KINDS = {
+    "decision": ("Decision", ("decision_choice", "decision_reason", "decision_alternatives", "decision_confidence")),
+    "resource": ("Resource", ("resource_url", "resource_type", "resource_title", "discussed_context")),
+    "document": ("Document", ("doc_filename", "doc_location", "doc_purpose", "doc_key_settings"))
+}
+
+# Applied per written row (p, row in scope): labels, typed fields, ABOUT -> Concept
+_BLOCK_SET = """
+        FOREACH (ignored IN CASE WHEN 'decision' IN row.block_kinds THEN [1] ELSE [] END | SET p:Decision)
+        FOREACH (ignored IN CASE WHEN 'resource' IN row.block_kinds THEN [1] ELSE [] END | SET p:Resource)
+        FOREACH (ignored IN CASE WHEN 'document' IN row.block_kinds THEN [1] ELSE [] END | SET p:Document)
+        SET p += row.block_fields,
+            p.block_kinds = row.block_kinds
+        FOREACH (name IN row.block_concepts |
+            MERGE (c:Concept {name: name})
+            MERGE (p)-[:ABOUT]->(c))
+"""
+
+
+def _block_row(block_metadata: Optional[Dict], concepts: Optional[List[str]]) -> Dict:
+    """
+    Typed projection of a proposition's blocks for the agenda indexes.
+
+    Only non-empty fields of present kinds are promoted (scalars and
+    string lists - Neo4j properties cannot be maps). Concepts are linked
+    (lower-cased) only for propositions that carry a block, which keeps
+    the Concept fan-in to agenda items.
+    """
+    kinds, fields = [], {}
+    for kind, (_, names) in _BLOCK_KINDS.items():
+        if not (block_metadata or {}).get(names[0]):
+            continue
+        kinds.append(kind)
+        for name in names:
+            value = block_metadata.get(name)
+            if isinstance(value, list):
+                value = [str(v) for v in value if v]
+            if value:
+                fields[name] = value
+    return {
+        "block_kinds": kinds,
+        "block_fields": fields,
+        "block_concepts": sorted({c.strip().lower() for c in concepts or [] if c and c.strip()}) if kinds else []
+    }
+
+
+def _embedding_key(embedding) -> bytes:
+    """
+    Hash of a query embedding (exact float32 bytes).
+
+    Repeated query texts hit because EmbeddingGenerator.generate() returns
+    the cached vector; rounding would not help, values near a rounding
+    boundary flip on any jitter.
+    """
+    return hashlib.blake2b(np.asarray(embedding, dtype=np.float32).tobytes(), digest_size=16).digest()
+
+
+def _retrieval_cached(method):
+    """
+    Serve a read-only retrieval method from Neo4jClient.retrieval_cache.
+
+    Key: server, method, write generation, query-embedding hash and every
+    other argument. Timed-out results are not cached. Cached values are
+    shared - treat them as read-only.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = Neo4jClient.retrieval_cache
+        if cache.maxsize <= 0:
+            return method(self, *args, **kwargs)
+
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        params = {name: value for name, value in bound.arguments.items() if name != "self"}
+        embedding = params.pop("query_embedding")
+
+        generation = cache.generation
+        key = (
+            self.uri,
+            method.__name__,
+            generation,
+            _embedding_key(embedding),
+            json.dumps(params, sort_keys=True, default=str)
+        )
+        result = cache.get(key, _MISS)
+        if result is _MISS:
+            result = method(self, *args, **kwargs)
+            if not (isinstance(result, dict) and result.get("timed_out")):
+                cache.put(key, result, generation)
+        return result
+
+    return wrapper
+
 
 class Neo4jClient:
     """Neo4j database client with graph operations."""
 
+    # Process-wide cache for retrieve / hybrid_search / filtered_vector_search,
+    # shared by all clients. Writers call invalidate_retrieval_cache(); the TTL
+    # bounds staleness from writes made by other processes.
+    retrieval_cache = LRUCache(maxsize=1024, ttl=300.0)
+
+    # Last linked proposition per conversation: (uri, session_id) -> (seq, id).
+    # Lets link_turn append in-order turns without looking up the tail.
+    _session_tails: Dict[tuple, tuple] = {}
+    _session_tails_lock = threading.Lock()
+    # (uri, session_id) -> Lock serializing link_turn splices of one conversation
+    _session_locks: Dict[tuple, threading.Lock] = {}
+
     def __init__(self, uri: str, user: str, password: str):
         """
         Initialize Neo4j client.
@@ -31,9 +169,12 @@ class Neo4jClient:
         self.driver = GraphDatabase.driver(uri, auth=(user, password))
         self.uri = uri
         self.user = user
+        self._executor = None  # Concurrent sub-queries (hybrid_search), created on demand
 
     def close(self):
         """Close database connection."""
+        if self._executor:
+            self._executor.shutdown(wait=False)
         if self.driver:
             self.driver.close()
 
@@ -68,6 +209,10 @@ class Neo4jClient:
                 CREATE INDEX proposition_timestamp IF NOT EXISTS
                 FOR (p:Proposition) ON (p.timestamp)
             """)
+            session.run("""
+                CREATE INDEX proposition_timestamp_id IF NOT EXISTS
+                FOR (p:Proposition) ON (p.timestamp, p.id)
+            """)
             session.run("""
                 CREATE INDEX proposition_speaker IF NOT EXISTS
                 FOR (p:Proposition) ON (p.speaker)
@@ -80,9 +225,77 @@ class Neo4jClient:
                 CREATE INDEX proposition_is_weak IF NOT EXISTS
                 FOR (p:Proposition) ON (p.is_weak)
             """)
+            session.run("""
+                CREATE INDEX proposition_type IF NOT EXISTS
+                FOR (p:Proposition) ON (p.type)
+            """)
+            session.run("""
+                CREATE INDEX proposition_speaker_timestamp IF NOT EXISTS
+                FOR (p:Proposition) ON (p.speaker, p.timestamp)
+            """)
+            # Conversation order: window seeks + turn splicing (link_turn)
+            session.run("""
+                CREATE INDEX proposition_session_seq IF NOT EXISTS
+                FOR (p:Proposition) ON (p.session_id, p.seq)
+            """)
+            # Partitioning: one tenant's conversations, one conversation's time range
+            session.run("""
+                CREATE INDEX proposition_tenant_session IF NOT EXISTS
+                FOR (p:Proposition) ON (p.tenant_id, p.session_id)
+            """)
+            session.run("""
+                CREATE INDEX proposition_session_timestamp IF NOT EXISTS
+                FOR (p:Proposition) ON (p.session_id, p.timestamp)
+            """)
+            # Edge creation time: incremental graph snapshots (iter_edges_since)
+            session.run("""
+                CREATE INDEX coherent_created_at IF NOT EXISTS
+                FOR ()-[r:COHERENT]-() ON (r.created_at)
+            """)
+            session.run("""
+                CREATE INDEX next_created_at IF NOT EXISTS
+                FOR ()-[r:NEXT]-() ON (r.created_at)
+            """)
+
+            # Full-text index (exact identifiers: URLs, filenames, error codes)
+            print("  ├─ Creating full-text index...")
+            session.run("""
+                CREATE FULLTEXT INDEX proposition_text IF NOT EXISTS
+                FOR (p:Proposition) ON EACH [p.content, p.block_metadata]
+            """)
+
+            # Agenda: block labels + typed fields (see agenda())
+            session.run("""
+                CREATE CONSTRAINT concept_name_unique IF NOT EXISTS
+                FOR (c:Concept) REQUIRE c.name IS UNIQUE
+            """)
+            for kind, (label, fields) in _BLOCK_KINDS.items():
+                session.run(f"""
+                    CREATE INDEX {kind}_timestamp IF NOT EXISTS
+                    FOR (p:{label}) ON (p.timestamp, p.id)
+                """)
+                session.run(f"""
+                    CREATE INDEX {kind}_session_timestamp IF NOT EXISTS
+                    FOR (p:{label}) ON (p.session_id, p.timestamp)
+                """)
+                # TEXT index: `contains` on the key field (URL fragments, file names)
+                session.run(f"""
+                    CREATE TEXT INDEX {kind}_key_text IF NOT EXISTS
+                    FOR (p:{label}) ON (p.{fields[0]})
+                """)
+
+            # Cluster summaries (tiered retrieval, see storage/summaries.py)
+            session.run("""
+                CREATE CONSTRAINT summary_id_unique IF NOT EXISTS
+                FOR (s:Summary) REQUIRE s.id IS UNIQUE
+            """)
+            session.run("""
+                CREATE INDEX summary_version IF NOT EXISTS
+                FOR (s:Summary) ON (s.version)
+            """)
 
             # Vector index
-            print("  └─ Creating vector index...")
+            print("  └─ Creating vector indexes...")
             session.run("""
                 CREATE VECTOR INDEX proposition_embedding IF NOT EXISTS
                 FOR (p:Proposition) ON (p.embedding)
@@ -93,6 +306,16 @@ class Neo4jClient:
                   }
                 }
             """)
+            session.run("""
+                CREATE VECTOR INDEX summary_embedding IF NOT EXISTS
+                FOR (s:Summary) ON (s.embedding)
+                OPTIONS {
+                  indexConfig: {
+                    `vector.dimensions`: 1536,
+                    `vector.similarity_function`: 'cosine'
+                  }
+                }
+            """)
 
         print("✅ Schema setup complete!\n")
 
@@ -113,6 +336,9 @@ class Neo4jClient:
         timestamp: str,
         proposition_id: Optional[str] = None,
         block_metadata: Dict = None,
+        session_id: Optional[str] = None,
+        seq: Optional[int] = None,
+        tenant_id: Optional[str] = None,
         **extra_metadata
     ) -> Dict[str, Any]:
         """
@@ -129,6 +355,9 @@ class Neo4jClient:
             speaker: "user" or "assistant"
             timestamp: ISO timestamp
             proposition_id: Optional UUID (generated if not provided)
+            session_id: Conversation the proposition belongs to
+            seq: Position in the conversation (see link_turn)
+            tenant_id: Owner of the conversation (multi-user deployments)
             **extra_metadata: Future metadata fields
 
         Returns:
@@ -158,8 +387,13 @@ class Neo4jClient:
             last_accessed: null,
             created_at: datetime($now),
             updated_at: datetime($now),
-            block_metadata: $block_metadata
+            block_metadata: $block_metadata,
+            session_id: $session_id,
+            seq: $seq,
+            tenant_id: $tenant_id
         })
+        WITH p, $blocks AS row
+        """ + _BLOCK_SET + """
         RETURN p
         """
 
@@ -192,7 +426,11 @@ class Neo4jClient:
             "speaker": speaker,
             "timestamp": timestamp,
             "now": now,
-            "block_metadata": json.dumps(block_metadata) if block_metadata else "{}"
+            "block_metadata": json.dumps(block_metadata) if block_metadata else "{}",
+            "session_id": session_id,
+            "seq": seq,
+            "tenant_id": tenant_id,
+            "blocks": _block_row(block_metadata, concepts)
         }
 
         # Add extra metadata
@@ -207,6 +445,104 @@ class Neo4jClient:
             else:
                 raise Exception("Failed to create proposition")
 
+    def create_propositions_batch(self, propositions: List[Dict]) -> int:
+        """
+        Create many Proposition nodes in one transaction (UNWIND).
+
+        MERGE on the unique id, so replaying a batch (resumed rebuild) is
+        idempotent. Properties match create_proposition().
+
+        Args:
+            propositions: Dicts with id, content, embedding, type, certainty,
+                          concepts, source_message_id, source_semantic_unit_id,
+                          speaker, timestamp, block_metadata (dict),
+                          optional session_id / seq / tenant_id
+
+        Returns:
+            Number of nodes written
+        """
+        query = """
+        UNWIND $props AS row
+        MERGE (p:Proposition {id: row.id})
+        ON CREATE SET
+            p.activation_count = 0,
+            p.coherence_score = 0.5,
+            p.is_weak = false,
+            p.weakness_reason = null,
+            p.last_accessed = null,
+            p.created_at = datetime($now)
+        SET p.content = row.content,
+            p.embedding = row.embedding,
+            p.type = row.type,
+            p.certainty = row.certainty,
+            p.concepts = row.concepts,
+            p.source_message_id = row.source_message_id,
+            p.source_semantic_unit_id = row.source_semantic_unit_id,
+            p.speaker = row.speaker,
+            p.timestamp = datetime(row.timestamp),
+            p.updated_at = datetime($now),
+            p.block_metadata = row.block_metadata,
+            p.session_id = row.session_id,
+            p.seq = row.seq,
+            p.tenant_id = row.tenant_id
+        WITH p, row
+        """ + _BLOCK_SET + """
+        RETURN count(p) AS count
+        """
+
+        rows = []
+        for prop in propositions:
+            block_metadata = prop.get('block_metadata')
+            if block_metadata and isinstance(block_metadata, str):
+                raise ValueError(f"block_metadata must be dict at storage layer, got string: {block_metadata[:100]}")
+            embedding = prop['embedding']
+            rows.append({
+                "session_id": None,
+                "seq": None,
+                "tenant_id": None,
+                **prop,
+                # NumPy rows (archive rebuild) -> plain floats for Bolt
+                "embedding": embedding.tolist() if hasattr(embedding, "tolist") else embedding,
+                "block_metadata": json.dumps(block_metadata) if block_metadata else "{}",
+                **_block_row(block_metadata, prop.get('concepts'))
+            })
+
+        with self.driver.session() as session:
+            result = session.run(query, {"props": rows, "now": datetime.now().isoformat()})
+            return result.single()['count']
+
+    def delete_all_propositions(self, batch_size: int = 10000) -> int:
+        """
+        Delete every Proposition node (and its edges) in batched transactions.
+
+        Args:
+            batch_size: Nodes deleted per transaction
+
+        Returns:
+            Number of nodes deleted
+        """
+        query = """
+        MATCH (p:Proposition)
+        WITH p LIMIT $limit
+        DETACH DELETE p
+        RETURN count(*) AS count
+        """
+
+        with self._session_tails_lock:
+            for key in [key for key in self._session_tails if key[0] == self.uri]:
+                del self._session_tails[key]
+
+        total = 0
+        with self.driver.session() as session:
+            while True:
+                deleted = session.run(query, {"limit": batch_size}).single()['count']
+                total += deleted
+                if deleted < batch_size:
+                    break
+            # Agenda concepts are only reachable through propositions
+            session.run("MATCH (c:Concept) WHERE NOT (c)<-[:ABOUT]-() DETACH DELETE c")
+        return total
+
     def get_proposition(self, proposition_id: str) -> Optional[Dict]:
         """Get proposition by ID."""
         query = """
@@ -219,6 +555,28 @@ class Neo4jClient:
             record = result.single()
             return dict(record['p']) if record else None
 
+    def get_propositions(self, proposition_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Get many propositions by ID in one round trip (embedding omitted).
+
+        Returns:
+            {id: proposition}; unknown ids are absent
+        """
+        query = """
+        UNWIND $ids AS id
+        MATCH (p:Proposition {id: id})
+        RETURN p {.*, embedding: null} AS p
+        """
+
+        with self.driver.session() as session:
+            result = session.run(query, {"ids": list(proposition_ids)})
+            props = {}
+            for record in result:
+                prop = dict(record['p'])
+                prop.pop('embedding', None)
+                props[prop['id']] = prop
+            return props
+
     def update_proposition(self, proposition_id: str, **updates):
         """
         Update proposition metadata.
@@ -271,6 +629,175 @@ class Neo4jClient:
                 "now": datetime.now().isoformat()
             })
 
+    def create_temporal_edges_batch(self, edges: List[Dict]) -> int:
+        """
+        Create many NEXT edges in one transaction (UNWIND).
+
+        Idempotent: an existing NEXT between the same pair is reused.
+
+        Args:
+            edges: List of {"from": id, "to": id}
+
+        Returns:
+            Number of edges written
+        """
+        query = """
+        UNWIND $edges AS e
+        MATCH (from:Proposition {id: e.from})
+        MATCH (to:Proposition {id: e.to})
+        MERGE (from)-[r:NEXT]->(to)
+        ON CREATE SET r.created_at = datetime($now)
+        RETURN count(r) AS count
+        """
+
+        with self.driver.session() as session:
+            result = session.run(query, {"edges": edges, "now": datetime.now().isoformat()})
+            return result.single()['count']
+
+    def link_turn(
+        self,
+        session_id: str,
+        proposition_ids: List[str],
+        first_seq: int,
+        last_seq: int
+    ) -> Dict[str, Optional[str]]:
+        """
+        Splice a turn's propositions into its conversation's NEXT chain.
+
+        The chain follows `seq`, not arrival order: background extractions
+        may finish out of order, so a turn is inserted between its
+        predecessor (max seq < first_seq) and successor (min seq >
+        last_seq), replacing the NEXT edge that joined them. For the common
+        in-order case the cached tail is tried as the predecessor before
+        seeking on the (session_id, seq) index. Replaying a turn is
+        idempotent.
+
+        Concurrency: splices of one conversation are serialized per process
+        by a (uri, session_id) lock, and across processes by a write lock on
+        the anchor node (predecessor, else successor) taken inside the
+        write transaction. The anchor's current NEXT edge is then re-matched
+        under that lock, so a chain extended by another process is never
+        forked; a stale predecessor triggers a fresh seek.
+
+        Args:
+            session_id: Conversation
+            proposition_ids: The turn's propositions, in order
+            first_seq: seq of the first proposition
+            last_seq: seq of the last proposition
+
+        Returns:
+            {"pred": id or None, "succ": id or None}
+        """
+        neighbors_query = """
+        CALL {
+            OPTIONAL MATCH (p:Proposition)
+            WHERE p.session_id = $session_id AND p.seq < $first_seq
+            RETURN p.id AS pred
+            ORDER BY p.seq DESC
+            LIMIT 1
+        }
+        CALL {
+            OPTIONAL MATCH (p:Proposition)
+            WHERE p.session_id = $session_id AND p.seq > $last_seq
+            RETURN p.id AS succ
+            ORDER BY p.seq ASC
+            LIMIT 1
+        }
+        RETURN pred, succ
+        """
+
+        # Write lock on the anchor until commit, then its current neighbour
+        lock_query = """
+        MATCH (a:Proposition {id: $id})
+        SET a._splice_lock = true
+        REMOVE a._splice_lock
+        WITH a
+        OPTIONAL MATCH (a)-[:NEXT]->(after:Proposition)
+        OPTIONAL MATCH (before:Proposition)-[:NEXT]->(a)
+        RETURN after.id AS after, after.seq AS after_seq,
+               before.id AS before, before.seq AS before_seq
+        """
+
+        splice_query = """
+        OPTIONAL MATCH (:Proposition {id: $pred})-[old:NEXT]->(:Proposition {id: $succ})
+        DELETE old
+        WITH count(*) AS deleted
+        UNWIND range(0, size($chain) - 2) AS i
+        MATCH (a:Proposition {id: $chain[i]})
+        MATCH (b:Proposition {id: $chain[i + 1]})
+        MERGE (a)-[r:NEXT]->(b)
+        ON CREATE SET r.created_at = datetime($now)
+        RETURN count(r) AS count
+        """
+
+        if not proposition_ids:
+            return {"pred": None, "succ": None}
+
+        key = (self.uri, session_id)
+        with self._session_tails_lock:
+            tail = self._session_tails.get(key)
+            turn_lock = self._session_locks.setdefault(key, threading.Lock())
+
+        def splice(tx):
+            hint = tail[1] if tail is not None and tail[0] < first_seq else None
+            for _ in range(3):
+                if hint is not None:
+                    pred, succ = hint, None
+                else:
+                    record = tx.run(neighbors_query, {
+                        "session_id": session_id,
+                        "first_seq": first_seq,
+                        "last_seq": last_seq
+                    }).single()
+                    pred, succ = record['pred'], record['succ']
+
+                anchor = pred or succ
+                if anchor is None:
+                    break
+                current = tx.run(lock_query, {"id": anchor}).single()
+                if current is None:
+                    break
+
+                if pred is not None:
+                    # pred -> after is the edge this turn replaces
+                    after_seq = current['after_seq']
+                    if after_seq is not None and after_seq < first_seq:
+                        hint = None  # Another turn landed after pred: seek again
+                        continue
+                    if after_seq is not None and after_seq <= last_seq:
+                        succ = None  # Replay: the turn is already linked
+                    else:
+                        succ = current['after']
+                else:
+                    before_seq = current['before_seq']
+                    if before_seq is not None and before_seq < first_seq:
+                        hint = None  # A predecessor appeared: seek again
+                        continue
+                    if before_seq is not None:
+                        succ = None  # Replay: the turn is already linked
+                break
+
+            chain = ([pred] if pred else []) + list(proposition_ids) + ([succ] if succ else [])
+            tx.run(splice_query, {
+                "pred": pred,
+                "succ": succ,
+                "chain": chain,
+                "now": datetime.now().isoformat()
+            }).consume()
+            return pred, succ
+
+        with turn_lock:
+            with self.driver.session() as session:
+                pred, succ = session.execute_write(splice)
+
+            if succ is None:
+                with self._session_tails_lock:
+                    current = self._session_tails.get(key)
+                    if current is None or current[0] < last_seq:
+                        self._session_tails[key] = (last_seq, proposition_ids[-1])
+
+        return {"pred": pred, "succ": succ}
+
     def create_semantic_edge(
         self,
         prop1_id: str,
@@ -308,6 +835,161 @@ class Neo4jClient:
                 "now": datetime.now().isoformat()
             })
 
+    def link_semantic_neighbors(
+        self,
+        proposition_id: str,
+        neighbors: List[Dict],
+        max_degree: int,
+        created_by: str = "extraction"
+    ) -> int:
+        """
+        Link a new proposition to its top-K and re-rank each neighbor's list.
+
+        Incremental kNN maintenance: after the new edges are merged, every
+        touched neighbor keeps only its strongest COHERENT edges (per-node
+        `max_degree` property, else the global cap), so when the new node
+        enters an older node's top list, that node's weakest edge is
+        evicted. Degrees stay bounded as the graph grows (one round trip
+        per new proposition).
+
+        Hub control: edges are ranked by a local-scaling (CSLS) score
+        2·sim − r_p − r_q where r is a node's mean similarity to its top-K
+        (`knn_radius`), computed from the radii at eviction time so edges
+        from every writer compare on one scale (a node without a radius
+        ranks all its edges by raw similarity; a neighbour without one
+        takes the node's). Generic propositions with a high radius lose
+        edges first. `scaled_weight` is stored for reporting and
+        `coherent_degree` is kept up to date on every touched node.
+
+        Args:
+            proposition_id: New proposition ID
+            neighbors: List of {"id": ..., "similarity": ...} (self excluded)
+            max_degree: Maximum COHERENT edges per proposition
+            created_by: "extraction" or "sleep_cycle"
+
+        Returns:
+            Number of edges evicted
+        """
+        query = """
+        MATCH (p:Proposition {id: $id})
+        SET p.knn_radius = $radius
+        WITH p
+        UNWIND $neighbors AS n
+        MATCH (q:Proposition {id: n.id})
+        MERGE (p)-[r:COHERENT]-(q)
+        SET r.weight = n.similarity,
+            r.scaled_weight = 2 * n.similarity - $radius - coalesce(q.knn_radius, $radius),
+            r.created_at = datetime($now),
+            r.created_by = $created_by,
+            r.coactivation_count = coalesce(r.coactivation_count, 0),
+            r.last_strengthened = null
+        WITH p, collect(DISTINCT q) AS qs
+        UNWIND qs AS q
+        CALL {
+            WITH q
+            MATCH (q)-[e:COHERENT]-(other)
+            WITH q, e, other
+            ORDER BY CASE
+                WHEN q.knn_radius IS NULL THEN e.weight
+                ELSE 2 * e.weight - q.knn_radius - coalesce(other.knn_radius, q.knn_radius)
+            END DESC
+            WITH q, collect(e) AS edges, collect(other) AS others
+            WITH edges[coalesce(q.max_degree, $max_degree)..] AS evict,
+                 others[coalesce(q.max_degree, $max_degree)..] AS orphans
+            FOREACH (e IN evict | DELETE e)
+            RETURN size(evict) AS evicted, orphans
+        }
+        WITH p, qs, sum(evicted) AS evicted, collect(orphans) AS orphan_lists
+        UNWIND [p] + qs + reduce(acc = [], l IN orphan_lists | acc + l) AS x
+        WITH DISTINCT x, evicted
+        SET x.coherent_degree = COUNT { (x)-[:COHERENT]-() }
+        RETURN evicted, count(x) AS touched
+        """
+
+        if not neighbors:
+            return 0
+
+        top = [n['similarity'] for n in neighbors]
+        radius = sum(top) / len(top)
+
+        with self.driver.session() as session:
+            result = session.run(query, {
+                "id": proposition_id,
+                "neighbors": [{"id": n['id'], "similarity": n['similarity']} for n in neighbors],
+                "radius": radius,
+                "max_degree": max_degree,
+                "created_by": created_by,
+                "now": datetime.now().isoformat()
+            })
+            record = result.single()
+            evicted = record['evicted'] if record else 0
+            if evicted:
+                self._record_eviction(session, evicted)
+            return evicted
+
+    def create_semantic_edges_batch(
+        self,
+        edges: List[Dict],
+        created_by: str = "rebuild"
+    ) -> int:
+        """
+        Create many COHERENT edges in one transaction (UNWIND).
+
+        MERGE is undirected, so (a, b) and (b, a) collapse into one edge and
+        re-running a batch is idempotent.
+
+        Args:
+            edges: List of {"a": id, "b": id, "weight": float}
+            created_by: "extraction", "sleep_cycle" or "rebuild"
+
+        Returns:
+            Number of edges created (existing edges only re-weighted, and
+            the second direction of a pair, are not counted)
+        """
+        query = """
+        UNWIND $edges AS e
+        MATCH (p1:Proposition {id: e.a})
+        MATCH (p2:Proposition {id: e.b})
+        MERGE (p1)-[r:COHERENT]-(p2)
+        SET r.weight = e.weight,
+            r.created_at = coalesce(r.created_at, datetime($now)),
+            r.created_by = $created_by,
+            r.coactivation_count = coalesce(r.coactivation_count, 0)
+        """
+
+        with self.driver.session() as session:
+            result = session.run(query, {
+                "edges": edges,
+                "created_by": created_by,
+                "now": datetime.now().isoformat()
+            })
+            return result.consume().counters.relationships_created
+
+    def delete_semantic_edges(self, batch_size: int = 10000) -> int:
+        """
+        Delete all COHERENT edges in batched transactions.
+
+        Args:
+            batch_size: Edges deleted per transaction
+
+        Returns:
+            Number of edges deleted
+        """
+        query = """
+        MATCH ()-[r:COHERENT]->()
+        WITH r LIMIT $limit
+        DELETE r
+        RETURN count(*) AS count
+        """
+
+        total = 0
+        with self.driver.session() as session:
+            while True:
+                deleted = session.run(query, {"limit": batch_size}).single()['count']
+                total += deleted
+                if deleted < batch_size:
+                    return total
+
     # =========================================================================
     # VECTOR SEARCH
     # =========================================================================
@@ -316,7 +998,9 @@ class Neo4jClient:
         self,
         query_embedding: List[float],
         k: int = 10,
-        min_similarity: float = 0.4
+        min_similarity: float = 0.4,
+        session_id: Optional[str] = None,
+        tenant_id: Optional[str] = None
     ) -> List[Dict]:
         """
         Semantic search using vector similarity.
@@ -325,10 +1009,23 @@ class Neo4jClient:
             query_embedding: Query vector (1536 dims)
             k: Number of results
             min_similarity: Minimum cosine similarity threshold
+            session_id: Only this conversation
+            tenant_id: Only this tenant's conversations
 
         Returns:
             List of propositions with similarity scores
         """
+        if session_id is not None or tenant_id is not None:
+            # Scoped: exact scan of the partition when it is small, else
+            # oversampled index query (see filtered_vector_search)
+            return self.filtered_vector_search(
+                query_embedding,
+                k=k,
+                min_similarity=min_similarity,
+                session_id=session_id,
+                tenant_id=tenant_id
+            )['results']
+
         query = """
         CALL db.index.vector.queryNodes(
             'proposition_embedding',
@@ -357,80 +1054,1393 @@ class Neo4jClient:
 
             return [dict(record) for record in result]
 
-    # =========================================================================
-    # QUERIES
-    # =========================================================================
-
-    def count_propositions(self) -> int:
-        """Count total propositions."""
-        with self.driver.session() as session:
-            result = session.run("MATCH (p:Proposition) RETURN count(p) AS count")
-            return result.single()['count']
+    @classmethod
+    def invalidate_retrieval_cache(cls) -> int:
+        """Make every cached retrieval stale (call after graph writes commit)."""
+        return cls.retrieval_cache.bump()
 
-    def count_edges(self) -> Dict[str, int]:
-        """Count edges by type."""
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH ()-[r]->()
-                RETURN type(r) AS edge_type, count(r) AS count
-            """)
-            return {record['edge_type']: record['count'] for record in result}
+    @classmethod
+    def get_retrieval_cache_stats(cls) -> Dict:
+        """Retrieval cache hit rate, size and generation."""
+        return cls.retrieval_cache.get_stats()
 
-    def get_all_propositions(self, limit: int = 100) -> List[Dict]:
-        """Get all propositions (for debugging)."""
-        query = """
-        MATCH (p:Proposition)
-        RETURN p
-        ORDER BY p.created_at DESC
-        LIMIT $limit
+    @staticmethod
+    def _filter_clause(
+        alias: str,
+        speaker: Optional[str] = None,
+        types: Optional[List[str]] = None,
+        is_weak: Optional[bool] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        session_id: Optional[str] = None,
+        tenant_id: Optional[str] = None
+    ) -> tuple:
         """
+        WHERE predicates for the given filters (None = not filtered).
 
-        with self.driver.session() as session:
-            result = session.run(query, {"limit": limit})
-            return [dict(record['p']) for record in result]
+        Only the filters in use are emitted, so the planner can seek the
+        speaker / type / is_weak / timestamp / session indexes.
 
-    def get_temporal_chain(self) -> Dict:
-        """Get the temporal chain info (start, end, length)."""
-        query = """
-        MATCH path = (start:Proposition)-[:NEXT*]->(end:Proposition)
-        WHERE NOT exists((start)<-[:NEXT]-())
-        RETURN length(path) AS chain_length,
-               start.content AS first_content,
-               end.content AS last_content,
-               start.timestamp AS first_time,
-               end.timestamp AS last_time
-        ORDER BY chain_length DESC
-        LIMIT 1
+        Returns:
+            (predicate list, params)
         """
+        predicates, params = [], {}
+        if speaker is not None:
+            predicates.append(f"{alias}.speaker = $f_speaker")
+            params["f_speaker"] = speaker
+        if types:
+            predicates.append(f"{alias}.type IN $f_types")
+            params["f_types"] = list(types)
+        if is_weak is not None:
+            predicates.append(f"{alias}.is_weak = $f_is_weak")
+            params["f_is_weak"] = is_weak
+        if since is not None:
+            predicates.append(f"{alias}.timestamp >= datetime($f_since)")
+            params["f_since"] = since
+        if until is not None:
+            predicates.append(f"{alias}.timestamp < datetime($f_until)")
+            params["f_until"] = until
+        if session_id is not None:
+            predicates.append(f"{alias}.session_id = $f_session_id")
+            params["f_session_id"] = session_id
+        if tenant_id is not None:
+            predicates.append(f"{alias}.tenant_id = $f_tenant_id")
+            params["f_tenant_id"] = tenant_id
+        return predicates, params
 
-        with self.driver.session() as session:
-            result = session.run(query)
-            record = result.single()
-            return dict(record) if record else {}
-
-    def get_semantic_neighbors(self, proposition_id: str, min_weight: float = 0.5) -> List[Dict]:
+    @_retrieval_cached
+    def filtered_vector_search(
+        self,
+        query_embedding: List[float],
+        k: int = 10,
+        min_similarity: float = 0.4,
+        speaker: Optional[str] = None,
+        types: Optional[List[str]] = None,
+        is_weak: Optional[bool] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        session_id: Optional[str] = None,
+        tenant_id: Optional[str] = None,
+        oversample: int = 4,
+        max_candidates: int = 10000,
+        filter_first_max: int = 2000
+    ) -> Dict[str, Any]:
         """
-        Get semantic neighbors of a proposition.
+        Vector search restricted by speaker / type / is_weak / time range /
+        conversation / tenant.
+
+        Two plans:
+        - filter-first: if at most `filter_first_max` propositions match
+          the filter (counted with an index seek, stopping at the limit),
+          score exactly those with vector.similarity.cosine - exact, and
+          cheap precisely when the filter is selective.
+        - oversampling: otherwise query the vector index for k·oversample
+          candidates and filter them; if fewer than k survive, re-query
+          with a candidate count grown from the observed pass rate, up
+          to `max_candidates`.
 
         Args:
-            proposition_id: Proposition ID
-            min_weight: Minimum edge weight
+            query_embedding: Query vector (1536 dims)
+            k: Number of results
+            min_similarity: Minimum cosine similarity
+            speaker: "user" / "assistant"
+            types: Proposition types to keep
+            is_weak: True/False to keep only (non-)weak propositions
+            since: ISO timestamp, inclusive
+            until: ISO timestamp, exclusive
+            session_id: Conversation
+            tenant_id: Tenant
+            oversample: Initial candidates per wanted result
+            max_candidates: Cap on vector-index candidates per query
+            filter_first_max: Filter-first below this many matches
 
         Returns:
-            List of neighbor propositions with weights
-        """
-        query = """
-        MATCH (p:Proposition {id: $id})-[r:COHERENT]-(neighbor:Proposition)
-        WHERE r.weight >= $min_weight
-        RETURN neighbor.id AS id,
-               neighbor.content AS content,
-               r.weight AS similarity
-        ORDER BY r.weight DESC
+            {"results": [...same fields as vector_search...],
+             "strategy": "filter_first" | "oversample" | "unfiltered",
+             "candidates_scanned", "rounds"}
+            candidates_scanned is None for "unfiltered": the plain index
+            query does not report how many candidates it visited
+        """
+        predicates, params = self._filter_clause(
+            "node", speaker, types, is_weak, since, until, session_id, tenant_id
+        )
+        if hasattr(query_embedding, "tolist"):
+            query_embedding = query_embedding.tolist()
+
+        if not predicates:
+            results = self.vector_search(query_embedding, k=k, min_similarity=min_similarity)
+            return {"results": results, "strategy": "unfiltered", "candidates_scanned": None, "rounds": 1}
+
+        where = " AND ".join(predicates)
+        returns = """
+               node.id AS id,
+               node.content AS content,
+               node.speaker AS speaker,
+               node.type AS type,
+               node.concepts AS concepts,
+               node.coherence_score AS coherence_score,
+               node.is_weak AS is_weak"""
+
+        with self.driver.session() as session:
+            # 1. Selectivity probe (stops counting at the threshold)
+            matches = session.run(f"""
+                MATCH (node:Proposition)
+                WHERE {where}
+                WITH node LIMIT $limit
+                RETURN count(node) AS count
+            """, {**params, "limit": filter_first_max + 1}).single()['count']
+
+            if matches <= filter_first_max:
+                result = session.run(f"""
+                    MATCH (node:Proposition)
+                    WHERE {where} AND node.embedding IS NOT NULL
+                    WITH node, vector.similarity.cosine(node.embedding, $query_embedding) AS score
+                    WHERE score >= $min_similarity
+                    RETURN {returns},
+                           score AS similarity
+                    ORDER BY score DESC
+                    LIMIT $k
+                """, {**params, "query_embedding": query_embedding, "min_similarity": min_similarity, "k": k})
+                return {
+                    "results": [dict(record) for record in result],
+                    "strategy": "filter_first",
+                    "candidates_scanned": matches,
+                    "rounds": 1
+                }
+
+            # 2. Oversampled vector index query, grown until k survive
+            query = f"""
+            CALL db.index.vector.queryNodes('proposition_embedding', $candidates, $query_embedding)
+            YIELD node, score
+            WITH node, score, score >= $min_similarity AND {where} AS keep
+            ORDER BY score DESC
+            WITH collect(CASE WHEN keep THEN {{node: node, score: score}} END)[..$k] AS kept,
+                 count(*) AS scanned,
+                 sum(CASE WHEN keep THEN 1 ELSE 0 END) AS passed,
+                 min(score) AS floor
+            UNWIND (CASE WHEN size(kept) = 0 THEN [null] ELSE kept END) AS hit
+            WITH hit, scanned, passed, floor, hit.node AS node
+            RETURN {returns},
+                   hit.score AS similarity,
+                   scanned, passed, floor
+            """
+
+            candidates = min(k * oversample, max_candidates)
+            scanned_total = 0
+            rounds = 0
+            while True:
+                rounds += 1
+                records = [dict(r) for r in session.run(query, {
+                    **params,
+                    "query_embedding": query_embedding,
+                    "min_similarity": min_similarity,
+                    "candidates": candidates,
+                    "k": k
+                })]
+                scanned, passed, floor = records[0]['scanned'], records[0]['passed'], records[0]['floor']
+                scanned_total += scanned
+
+                exhausted = (
+                    passed >= k
+                    or scanned < candidates          # Index has no more nodes
+                    or (floor is not None and floor < min_similarity)  # Rest is below threshold
+                    or candidates >= max_candidates
+                )
+                if exhausted:
+                    break
+
+                # Grow from the observed pass rate (+25% margin), at least 2x
+                rate = passed / scanned if scanned else 0.0
+                needed = int(k / rate * 1.25) if rate > 0 else candidates * oversample
+                candidates = min(max(needed, candidates * 2), max_candidates)
+
+        results = [
+            {key: value for key, value in r.items() if key not in ("scanned", "passed", "floor")}
+            for r in records if r['id'] is not None
+        ]
+        return {
+            "results": results,
+            "strategy": "oversample",
+            "candidates_scanned": scanned_total,
+            "rounds": rounds
+        }
+
+    def fulltext_search(self, query_text: str, k: int = 10) -> List[Dict]:
+        """
+        Lexical search over proposition content and block metadata.
+
+        The text is matched literally (Lucene operators are escaped), any
+        term may match; BM25 ranks the hits.
+
+        Args:
+            query_text: Free text, identifiers, URLs...
+            k: Number of results
+
+        Returns:
+            List of propositions with their full-text score
+        """
+        query = """
+        CALL db.index.fulltext.queryNodes('proposition_text', $query, {limit: $k})
+        YIELD node, score
+        RETURN node.id AS id,
+               node.content AS content,
+               node.speaker AS speaker,
+               node.type AS type,
+               node.concepts AS concepts,
+               node.coherence_score AS coherence_score,
+               node.is_weak AS is_weak,
+               score AS lexical_score
+        ORDER BY score DESC
+        """
+
+        escaped = _escape_lucene(query_text)
+        if not escaped:
+            return []
+
+        with self.driver.session() as session:
+            result = session.run(query, {"query": escaped, "k": k})
+            return [dict(record) for record in result]
+
+    @_retrieval_cached
+    def hybrid_search(
+        self,
+        query_text: str,
+        query_embedding: List[float],
+        k: int = 10,
+        candidates: int = 50,
+        lexical_weight: float = 1.0,
+        vector_weight: float = 1.0,
+        rrf_k: int = 60,
+        min_similarity: float = 0.0
+    ) -> List[Dict]:
+        """
+        Lexical + vector search fused with weighted reciprocal rank fusion.
+
+        Both queries run concurrently (two sessions); each contributes
+        weight / (rrf_k + rank) for every hit in its top `candidates`.
+        RRF only looks at ranks, so BM25 and cosine scores need no
+        normalisation.
+
+        Args:
+            query_text: Query text (for the full-text index)
+            query_embedding: Query vector (for the vector index)
+            k: Number of fused results
+            candidates: Hits taken from each side
+            lexical_weight: Weight of the full-text ranking
+            vector_weight: Weight of the vector ranking
+            rrf_k: RRF damping constant (higher = flatter)
+            min_similarity: Vector-side similarity floor
+
+        Returns:
+            List of propositions with rrf_score, lexical_rank,
+            vector_rank, lexical_score and similarity (None if that side
+            missed it)
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="neo4j-hybrid")
+
+        lexical_future = self._executor.submit(self.fulltext_search, query_text, candidates)
+        vector_hits = self.vector_search(query_embedding, k=candidates, min_similarity=min_similarity)
+        lexical_hits = lexical_future.result()
+
+        fused: Dict[str, Dict] = {}
+        for side, hits, weight in (("lexical", lexical_hits, lexical_weight), ("vector", vector_hits, vector_weight)):
+            for rank, hit in enumerate(hits, 1):
+                entry = fused.setdefault(hit['id'], {
+                    **hit,
+                    "rrf_score": 0.0,
+                    "lexical_rank": None,
+                    "vector_rank": None,
+                    "lexical_score": None,
+                    "similarity": None
+                })
+                entry[f"{side}_rank"] = rank
+                entry["lexical_score" if side == "lexical" else "similarity"] = hit.get(
+                    "lexical_score" if side == "lexical" else "similarity"
+                )
+                entry["rrf_score"] += weight / (rrf_k + rank)
+
+        return sorted(fused.values(), key=lambda e: e['rrf_score'], reverse=True)[:k]
+
+    # =========================================================================
+    # RETRIEVAL
+    # =========================================================================
+
+    @_retrieval_cached
+    def retrieve(
+        self,
+        query_embedding: List[float],
+        seeds: int = 5,
+        max_hops: int = 2,
+        fan_out: int = 5,
+        min_weight: float = 0.5,
+        decay: float = 0.7,
+        min_similarity: float = 0.4,
+        include_weak: bool = False,
+        max_results: int = 20,
+        max_chars: Optional[int] = None,
+        timeout_ms: Optional[int] = 200
+    ) -> Dict[str, Any]:
+        """
+        Memory retrieval: vector seeds + bounded COHERENT expansion, one round trip.
+
+        Seeds come from the vector index (score = cosine similarity). Each
+        hop expands every frontier node to its `fan_out` strongest COHERENT
+        neighbours above `min_weight` that were not reached before, scored
+        parent_score · decay · weight. Work is bounded by
+        seeds · fan_out^max_hops, whatever the graph density.
+
+        Args:
+            query_embedding: Query vector (1536 dims)
+            seeds: Vector-search seeds
+            max_hops: Expansion depth (0 = vector search only)
+            fan_out: Neighbours followed per node and hop
+            min_weight: Minimum COHERENT weight followed
+            decay: Score multiplier per hop
+            min_similarity: Minimum seed similarity
+            include_weak: Also return propositions marked is_weak
+            max_results: Result budget (best scores first)
+            max_chars: Content budget - stop adding results beyond it
+            timeout_ms: Server-side transaction timeout (None = no limit)
+
+        Returns:
+            {"results": [{"id", "content", "speaker", "type", "concepts",
+              "block_metadata", "timestamp", "score", "hop", "via"}],
+             "seeds", "expanded", "elapsed_ms", "timed_out", "truncated"}
+        """
+        hops = []
+        for hop in range(1, max_hops + 1):
+            hops.append(f"""
+        CALL {{
+            WITH found, frontier
+            UNWIND frontier AS f
+            CALL {{
+                WITH f, found
+                WITH f, found, f.node AS n
+                MATCH (n)-[r:COHERENT]-(m:Proposition)
+                WHERE r.weight >= $min_weight
+                  AND ($include_weak OR coalesce(m.is_weak, false) = false)
+                  AND NONE(x IN found WHERE x.node = m)
+                WITH m, f.score * $decay * r.weight AS score, n.id AS via
+                ORDER BY score DESC
+                LIMIT $fan_out
+                RETURN m, score, via
+            }}
+            WITH m, score, via
+            ORDER BY score DESC
+            WITH m, collect({{score: score, via: via}})[0] AS best
+            RETURN collect({{node: m, score: best.score, hop: {hop}, via: best.via}}) AS reached
+        }}
+        WITH found + reached AS found, reached AS frontier""")
+
+        query = f"""
+        CALL db.index.vector.queryNodes('proposition_embedding', $seeds, $query_embedding)
+        YIELD node, score
+        WHERE score >= $min_similarity
+          AND ($include_weak OR coalesce(node.is_weak, false) = false)
+        WITH collect({{node: node, score: score, hop: 0, via: null}}) AS found
+        WITH found, found AS frontier
+        {"".join(hops)}
+        WITH found, size([f IN found WHERE f.hop = 0]) AS seed_count
+        UNWIND found AS f
+        WITH f, seed_count, size(found) AS total
+        ORDER BY f.score DESC
+        LIMIT $max_results
+        RETURN f.node.id AS id,
+               f.node.content AS content,
+               f.node.speaker AS speaker,
+               f.node.type AS type,
+               f.node.concepts AS concepts,
+               f.node.block_metadata AS block_metadata,
+               f.node.timestamp AS timestamp,
+               f.score AS score,
+               f.hop AS hop,
+               f.via AS via,
+               seed_count,
+               total
+        """
+
+        if hasattr(query_embedding, "tolist"):
+            query_embedding = query_embedding.tolist()
+
+        params = {
+            "query_embedding": query_embedding,
+            "seeds": seeds,
+            "fan_out": fan_out,
+            "min_weight": min_weight,
+            "decay": decay,
+            "min_similarity": min_similarity,
+            "include_weak": include_weak,
+            "max_results": max_results
+        }
+
+        start = datetime.now()
+        timed_out = False
+        records = []
+        try:
+            with self.driver.session() as session:
+                timeout = timeout_ms / 1000 if timeout_ms is not None else None
+                records = [dict(record) for record in session.run(Query(query, timeout=timeout), params)]
+        except Neo4jError as e:
+            if "TransactionTimedOut" not in (e.code or ""):
+                raise
+            timed_out = True
+
+        results = []
+        chars = 0
+        truncated = False
+        for record in records:
+            content = record['content'] or ""
+            if max_chars is not None and results and chars + len(content) > max_chars:
+                truncated = True
+                break
+            chars += len(content)
+            results.append({
+                **{key: record[key] for key in ("id", "content", "speaker", "type", "concepts",
+                                                "timestamp", "score", "hop", "via")},
+                "block_metadata": json.loads(record['block_metadata'] or "{}")
+            })
+
+        return {
+            "results": results,
+            "seeds": records[0]['seed_count'] if records else 0,
+            "expanded": records[0]['total'] - records[0]['seed_count'] if records else 0,
+            "elapsed_ms": round((datetime.now() - start).total_seconds() * 1000, 1),
+            "timed_out": timed_out,
+            "truncated": truncated or (bool(records) and records[0]['total'] > len(records))
+        }
+
+    # =========================================================================
+    # AGENDA
+    # =========================================================================
+
+    def agenda(
+        self,
+        kind: str,
+        concept: Optional[str] = None,
+        session_id: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        contains: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[tuple] = None
+    ) -> Dict[str, Any]:
+        """
+        Typed block lookup: "all decisions about X with their WHY",
+        "every URL we discussed", "where is that config file".
+
+        Blocks are projected at write time into a label per kind
+        (:Decision / :Resource / :Document), typed properties and ABOUT
+        edges to :Concept nodes, so each filter is an index seek instead
+        of a CONTAINS scan over the block_metadata JSON:
+        - concept: unique Concept lookup, then its ABOUT fan-in
+        - session_id: (session_id, timestamp) index of the kind's label
+        - since / until / paging: (timestamp, id) index, newest first
+        - contains: TEXT index on the kind's key field (decision_choice,
+          resource_url, doc_filename)
+
+        Args:
+            kind: "decision", "resource" or "document"
+            concept: Concept the proposition is about (case-insensitive)
+            session_id: Only this conversation
+            since: ISO timestamp, inclusive
+            until: ISO timestamp, exclusive
+            contains: Substring of the key field
+            limit: Page size
+            cursor: next_cursor of the previous page
+
+        Returns:
+            {"items": [{"id", "content", "speaker", "type", "concepts",
+              "session_id", "timestamp", <kind fields>}],
+             "next_cursor": (timestamp, id) or None}
+
+        Raises:
+            ValueError: Unknown kind
+        """
+        if kind not in _BLOCK_KINDS:
+            raise ValueError(f"Unknown block kind '{kind}' (expected one of {sorted(_BLOCK_KINDS)})")
+        label, fields = _BLOCK_KINDS[kind]
+
+        if concept:
+            match = f"MATCH (:Concept {{name: $concept}})<-[:ABOUT]-(p:{label})"
+        else:
+            match = f"MATCH (p:{label})"
+
+        predicates, params = self._filter_clause("p", since=since, until=until, session_id=session_id)
+        params.update({"concept": concept.strip().lower() if concept else None, "limit": limit + 1})
+        if contains:
+            predicates.append(f"p.{fields[0]} CONTAINS $contains")
+            params["contains"] = contains
+        if cursor is not None:
+            predicates.append(
+                "p.timestamp <= datetime($after_ts)"
+                " AND (p.timestamp < datetime($after_ts) OR p.id < $after_id)"
+            )
+            params.update({"after_ts": cursor[0], "after_id": cursor[1]})
+
+        query = f"""
+        {match}
+        {"WHERE " + " AND ".join(predicates) if predicates else ""}
+        RETURN p {{
+            .id, .content, .speaker, .type, .concepts, .session_id, .timestamp,
+            {", ".join(f".{field}" for field in fields)}
+        }} AS item
+        ORDER BY p.timestamp DESC, p.id DESC
+        LIMIT $limit
+        """
+
+        with self.driver.session() as session:
+            items = [dict(record['item']) for record in session.run(query, params)]
+
+        for item in items:
+            if hasattr(item.get('timestamp'), "iso_format"):
+                item['timestamp'] = item['timestamp'].iso_format()
+
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = (items[-1]['timestamp'], items[-1]['id'])
+        return {"items": items, "next_cursor": next_cursor}
+
+    def agenda_counts(self) -> Dict[str, int]:
+        """Agenda items per block kind (label count store, O(1))."""
+        counts = {}
+        with self.driver.session() as session:
+            for kind, (label, _) in _BLOCK_KINDS.items():
+                counts[kind] = session.run(f"MATCH (p:{label}) RETURN count(p) AS count").single()['count']
+        return counts
+
+    def index_blocks(self, batch_size: int = 5000) -> int:
+        """
+        Backfill agenda labels / fields / ABOUT edges for propositions
+        written before the block projection existed (idempotent).
+
+        Returns:
+            Number of propositions carrying at least one block
+        """
+        query = """
+        UNWIND $rows AS row
+        MATCH (p:Proposition {id: row.id})
+        WITH p, row
+        """ + _BLOCK_SET + """
+        RETURN count(p) AS count
+        """
+
+        total, rows = 0, []
+        for prop in self.iter_propositions(chunk_size=batch_size):
+            blocks = json.loads(prop.get('block_metadata') or "{}")
+            row = _block_row(blocks, prop.get('concepts'))
+            if row['block_kinds']:
+                rows.append({"id": prop['id'], **row})
+            if len(rows) >= batch_size:
+                with self.driver.session() as session:
+                    total += session.run(query, {"rows": rows}).single()['count']
+                rows = []
+        if rows:
+            with self.driver.session() as session:
+                total += session.run(query, {"rows": rows}).single()['count']
+        return total
+
+    # =========================================================================
+    # CLUSTER SUMMARIES
+    # =========================================================================
+
+    def upsert_summaries(self, summaries: List[Dict]) -> int:
+        """
+        Write Summary nodes and replace their SUMMARIZES edges.
+
+        Args:
+            summaries: Dicts with id, cluster, version, content, embedding,
+                       size, member_ids
+
+        Returns:
+            Number of summaries written
+        """
+        node_query = """
+        UNWIND $rows AS row
+        MERGE (s:Summary {id: row.id})
+        SET s.cluster = row.cluster,
+            s.version = row.version,
+            s.content = row.content,
+            s.embedding = row.embedding,
+            s.size = row.size,
+            s.updated_at = datetime($now)
+        WITH s
+        OPTIONAL MATCH (s)-[old:SUMMARIZES]->()
+        DELETE old
+        RETURN count(DISTINCT s) AS count
+        """
+
+        edge_query = """
+        MATCH (s:Summary {id: $id})
+        UNWIND $member_ids AS member_id
+        MATCH (p:Proposition {id: member_id})
+        MERGE (s)-[:SUMMARIZES]->(p)
+        RETURN count(*) AS count
+        """
+
+        rows = [
+            {
+                **{key: value for key, value in summary.items() if key != "member_ids"},
+                "embedding": summary['embedding'].tolist() if hasattr(summary['embedding'], "tolist") else summary['embedding']
+            }
+            for summary in summaries
+        ]
+        with self.driver.session() as session:
+            count = session.run(node_query, {"rows": rows, "now": datetime.now().isoformat()}).single()['count']
+            for summary in summaries:
+                for start in range(0, len(summary['member_ids']), 10000):
+                    session.run(edge_query, {"id": summary['id'], "member_ids": summary['member_ids'][start:start + 10000]})
+        self.invalidate_retrieval_cache()
+        return count
+
+    def add_summary_members(self, summary_id: str, proposition_ids: List[str], size: int) -> int:
+        """
+        Link new members to an existing summary (no re-summarization).
+
+        Returns:
+            Number of members linked
+        """
+        query = """
+        MATCH (s:Summary {id: $id})
+        SET s.size = $size
+        WITH s
+        UNWIND $member_ids AS member_id
+        MATCH (p:Proposition {id: member_id})
+        MERGE (s)-[:SUMMARIZES]->(p)
+        RETURN count(*) AS count
+        """
+
+        if not proposition_ids:
+            return 0
+        with self.driver.session() as session:
+            record = session.run(query, {"id": summary_id, "member_ids": proposition_ids, "size": size}).single()
+            return record['count'] if record else 0
+
+    def delete_summaries(self, keep_version: Optional[str] = None) -> int:
+        """
+        Delete Summary nodes from other clustering versions (all if None).
+
+        Returns:
+            Number of summaries deleted
+        """
+        query = """
+        MATCH (s:Summary)
+        WHERE $version IS NULL OR s.version <> $version
+        WITH s LIMIT 1000
+        DETACH DELETE s
+        RETURN count(*) AS count
+        """
+
+        total = 0
+        with self.driver.session() as session:
+            while True:
+                deleted = session.run(query, {"version": keep_version}).single()['count']
+                total += deleted
+                if deleted < 1000:
+                    break
+        if total:
+            self.invalidate_retrieval_cache()
+        return total
+
+    @_retrieval_cached
+    def tiered_search(
+        self,
+        query_embedding: List[float],
+        summaries: int = 3,
+        min_similarity: float = 0.3,
+        member_candidates: int = 20,
+        max_details: int = 5,
+        drill_margin: float = 0.05,
+        include_weak: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Summaries first, member propositions only when the query is specific.
+
+        The summary vector index returns the closest cluster summaries;
+        within each, members are scored exactly (bounded by cluster
+        size). A member is returned as a detail only if it beats its
+        summary by `drill_margin` - the question targets a specific fact
+        the synopsis glosses over. Broad questions get summaries alone,
+        so results per query stay at summaries + max_details however
+        large memory grows.
+
+        Args:
+            query_embedding: Query vector (1536 dims)
+            summaries: Summaries returned
+            min_similarity: Minimum summary similarity
+            member_candidates: Best members scored per summary
+            max_details: Member propositions returned in total
+            drill_margin: Member similarity must exceed its summary's by this
+            include_weak: Also consider propositions marked is_weak
+
+        Returns:
+            {"summaries": [{"id", "content", "size", "similarity"}],
+             "details": [{"id", "content", "speaker", "type", "concepts",
+               "block_metadata", "timestamp", "similarity", "summary_id"}],
+             "drilled": bool}
+        """
+        query = """
+        CALL db.index.vector.queryNodes('summary_embedding', $summaries, $query_embedding)
+        YIELD node AS s, score
+        WHERE score >= $min_similarity
+        CALL {
+            WITH s
+            MATCH (s)-[:SUMMARIZES]->(p:Proposition)
+            WHERE p.embedding IS NOT NULL
+              AND ($include_weak OR coalesce(p.is_weak, false) = false)
+            WITH p, vector.similarity.cosine(p.embedding, $query_embedding) AS similarity
+            ORDER BY similarity DESC
+            LIMIT $member_candidates
+            RETURN collect(p {
+                .id, .content, .speaker, .type, .concepts, .block_metadata, .timestamp,
+                similarity: similarity
+            }) AS members
+        }
+        RETURN s.id AS id, s.content AS content, s.size AS size, score AS similarity, members
+        ORDER BY score DESC
+        """
+
+        if hasattr(query_embedding, "tolist"):
+            query_embedding = query_embedding.tolist()
+
+        with self.driver.session() as session:
+            records = [dict(record) for record in session.run(query, {
+                "query_embedding": query_embedding,
+                "summaries": summaries,
+                "min_similarity": min_similarity,
+                "member_candidates": member_candidates,
+                "include_weak": include_weak
+            })]
+
+        details = [
+            {**member, "block_metadata": json.loads(member['block_metadata'] or "{}"), "summary_id": record['id']}
+            for record in records
+            for member in record['members']
+            if member['similarity'] >= record['similarity'] + drill_margin
+        ]
+        details.sort(key=lambda d: d['similarity'], reverse=True)
+
+        return {
+            "summaries": [{key: record[key] for key in ("id", "content", "size", "similarity")} for record in records],
+            "details": details[:max_details],
+            "drilled": bool(details)
+        }
+
+    # =========================================================================
+    # QUERIES
+    # =========================================================================
+
+    def count_propositions(self) -> int:
+        """Count total propositions."""
+        with self.driver.session() as session:
+            result = session.run("MATCH (p:Proposition) RETURN count(p) AS count")
+            return result.single()['count']
+
+    def count_edges(self) -> Dict[str, int]:
+        """Count edges by type."""
+        with self.driver.session() as session:
+            result = session.run("""
+                MATCH ()-[r]->()
+                RETURN type(r) AS edge_type, count(r) AS count
+            """)
+            return {record['edge_type']: record['count'] for record in result}
+
+    def list_sessions(self, tenant_id: Optional[str] = None, limit: int = 50) -> List[Dict]:
+        """
+        Conversations, most recently active first.
+
+        Args:
+            tenant_id: Only this tenant's conversations (index seek)
+            limit: Maximum conversations
+
+        Returns:
+            List of {"session_id", "tenant_id", "propositions",
+            "first_time", "last_time"}
+        """
+        predicates, params = self._filter_clause("p", tenant_id=tenant_id)
+        where = " AND ".join(["p.session_id IS NOT NULL"] + predicates)
+        query = f"""
+        MATCH (p:Proposition)
+        WHERE {where}
+        RETURN p.session_id AS session_id,
+               p.tenant_id AS tenant_id,
+               count(*) AS propositions,
+               min(p.timestamp) AS first_time,
+               max(p.timestamp) AS last_time
+        ORDER BY last_time DESC
+        LIMIT $limit
+        """
+
+        with self.driver.session() as session:
+            result = session.run(query, {**params, "limit": limit})
+            return [dict(record) for record in result]
+
+    def get_session_stats(self, session_id: str) -> Dict:
+        """
+        Size and connectivity of one conversation.
+
+        Only that conversation's propositions are touched (session index
+        seek), however large the rest of the graph is.
+
+        Returns:
+            {"session_id", "tenant_id", "propositions", "by_speaker",
+             "weak", "first_time", "last_time", "next_edges",
+             "coherent_internal", "coherent_external"}
+            or {} if the session is unknown
+        """
+        query = """
+        MATCH (p:Proposition)
+        WHERE p.session_id = $session_id
+        CALL {
+            WITH p
+            OPTIONAL MATCH (p)-[:NEXT]->(n:Proposition)
+            RETURN count(n) AS next_out
+        }
+        CALL {
+            WITH p
+            OPTIONAL MATCH (p)-[:COHERENT]-(q:Proposition)
+            RETURN sum(CASE WHEN q.session_id = $session_id THEN 1 ELSE 0 END) AS internal,
+                   sum(CASE WHEN q IS NOT NULL AND coalesce(q.session_id, '') <> $session_id THEN 1 ELSE 0 END) AS external
+        }
+        WITH count(p) AS propositions,
+             collect(DISTINCT p.tenant_id) AS tenants,
+             sum(CASE WHEN p.speaker = 'user' THEN 1 ELSE 0 END) AS user_count,
+             sum(CASE WHEN p.speaker = 'assistant' THEN 1 ELSE 0 END) AS assistant_count,
+             sum(CASE WHEN coalesce(p.is_weak, false) THEN 1 ELSE 0 END) AS weak,
+             min(p.timestamp) AS first_time,
+             max(p.timestamp) AS last_time,
+             sum(next_out) AS next_edges,
+             sum(internal) / 2 AS coherent_internal,
+             sum(external) AS coherent_external
+        WHERE propositions > 0
+        RETURN tenants[0] AS tenant_id, propositions,
+               {user: user_count, assistant: assistant_count} AS by_speaker,
+               weak, first_time, last_time, next_edges,
+               coherent_internal, coherent_external
+        """
+
+        with self.driver.session() as session:
+            record = session.run(query, {"session_id": session_id}).single()
+            return {"session_id": session_id, **dict(record)} if record else {}
+
+    def get_all_propositions(self, limit: int = 100) -> List[Dict]:
+        """Get the latest propositions (debugging; use iter_propositions() to stream all)."""
+        query = """
+        MATCH (p:Proposition)
+        RETURN p
+        ORDER BY p.created_at DESC
+        LIMIT $limit
+        """
+
+        with self.driver.session() as session:
+            result = session.run(query, {"limit": limit})
+            return [dict(record['p']) for record in result]
+
+    def iter_propositions(
+        self,
+        chunk_size: int = 1000,
+        after: Optional[tuple] = None,
+        include_embedding: bool = False
+    ) -> Iterator[Dict]:
+        """
+        Stream all propositions ordered by (timestamp, id), in constant memory.
+
+        Keyset-paginated: each chunk is a range seek on the
+        (timestamp, id) index instead of a SKIP over everything before it.
+
+        Args:
+            chunk_size: Propositions per round trip
+            after: Exclusive (timestamp, id) cursor to resume from
+            include_embedding: Also return the 1536-float embedding
+
+        Yields:
+            Proposition dicts
+        """
+        projection = "p {.*}" if include_embedding else "p {.*, embedding: null}"
+        first_query = f"""
+        MATCH (p:Proposition)
+        WHERE p.timestamp IS NOT NULL
+        RETURN {projection} AS p
+        ORDER BY p.timestamp, p.id
+        LIMIT $limit
+        """
+        next_query = f"""
+        MATCH (p:Proposition)
+        WHERE p.timestamp >= $after_ts
+          AND (p.timestamp > $after_ts OR p.id > $after_id)
+        RETURN {projection} AS p
+        ORDER BY p.timestamp, p.id
+        LIMIT $limit
+        """
+
+        while True:
+            with self.driver.session() as session:
+                if after is None:
+                    result = session.run(first_query, {"limit": chunk_size})
+                else:
+                    result = session.run(next_query, {"after_ts": after[0], "after_id": after[1], "limit": chunk_size})
+                chunk = [dict(record['p']) for record in result]
+
+            for prop in chunk:
+                if not include_embedding:
+                    prop.pop('embedding', None)
+                yield prop
+
+            if len(chunk) < chunk_size:
+                return
+            after = (chunk[-1]['timestamp'], chunk[-1]['id'])
+
+    def iter_embeddings(self, batch_size: int = 1000) -> Iterator[List[Dict]]:
+        """
+        Stream (id, embedding) pairs for all propositions.
+
+        Keyset-paginated on the unique id index, so each page is an index
+        seek instead of an ever-growing SKIP.
+
+        Args:
+            batch_size: Propositions per round trip
+
+        Yields:
+            Lists of {"id": ..., "embedding": [...]} dicts
+        """
+        query = """
+        MATCH (p:Proposition)
+        WHERE p.id > $after AND p.embedding IS NOT NULL
+        RETURN p.id AS id, p.embedding AS embedding
+        ORDER BY p.id
+        LIMIT $limit
+        """
+
+        after = ""
+        while True:
+            with self.driver.session() as session:
+                result = session.run(query, {"after": after, "limit": batch_size})
+                batch = [dict(record) for record in result]
+
+            if not batch:
+                return
+            yield batch
+            after = batch[-1]['id']
+
+    def iter_adjacency(self, batch_size: int = 5000) -> Iterator[tuple]:
+        """
+        Stream the COHERENT / NEXT adjacency, keyset-paginated on node id.
+
+        Every edge is reported once, from its start node (COHERENT is
+        undirected in meaning, stored with an arbitrary direction).
+
+        Args:
+            batch_size: Nodes per round trip
+
+        Yields:
+            (node_ids, edges) per page; edges are
+            (from_id, to_id, type, weight) tuples (NEXT weight is None)
+        """
+        query = """
+        MATCH (p:Proposition)
+        WHERE p.id > $after
+        WITH p ORDER BY p.id LIMIT $limit
+        OPTIONAL MATCH (p)-[r:COHERENT|NEXT]->(q:Proposition)
+        RETURN p.id AS id,
+               collect([q.id, type(r), r.weight]) AS edges
+        ORDER BY id
+        """
+
+        after = ""
+        while True:
+            with self.driver.session() as session:
+                rows = session.run(query, {"after": after, "limit": batch_size}).data()
+
+            if not rows:
+                return
+            node_ids = [row['id'] for row in rows]
+            edges = [
+                (row['id'], to_id, rel_type, weight)
+                for row in rows
+                for to_id, rel_type, weight in row['edges']
+                if to_id is not None
+            ]
+            yield node_ids, edges
+            after = node_ids[-1]
+
+    def iter_edges_since(self, since: str, batch_size: int = 10000) -> Iterator[List[tuple]]:
+        """
+        Stream COHERENT / NEXT edges created (or re-weighted) after `since`.
+
+        Keyset-paginated on (created_at, elementId(r)): each page is a range
+        seek on the relationship created_at index that resumes after the
+        last edge seen, so edges sharing a created_at (one batch MERGE) are
+        neither skipped nor repeated, and no OFFSET scan grows per page.
+        Evicted / deleted edges are not reported - full exports catch those
+        (see get_edges_evicted_at).
+
+        Args:
+            since: ISO timestamp, exclusive
+            batch_size: Edges per round trip
+
+        Yields:
+            Lists of (from_id, to_id, type, weight, created_at) tuples
+        """
+        queries = {
+            rel_type: f"""
+            MATCH (p:Proposition)-[r:{rel_type}]->(q:Proposition)
+            WHERE r.created_at >= coalesce($after_at, datetime($since))
+              AND (r.created_at > coalesce($after_at, datetime($since))
+                   OR ($after_id IS NOT NULL AND elementId(r) > $after_id))
+            RETURN p.id AS from_id, q.id AS to_id, r.weight AS weight,
+                   toString(r.created_at) AS created_at,
+                   r.created_at AS cursor_at, elementId(r) AS cursor_id
+            ORDER BY r.created_at, elementId(r)
+            LIMIT $limit
+            """
+            for rel_type in ("COHERENT", "NEXT")
+        }
+
+        for rel_type, query in queries.items():
+            after_at, after_id = None, None
+            while True:
+                with self.driver.session() as session:
+                    rows = session.run(query, {
+                        "since": since,
+                        "after_at": after_at,
+                        "after_id": after_id,
+                        "limit": batch_size
+                    }).data()
+                if not rows:
+                    break
+                yield [(r['from_id'], r['to_id'], rel_type, r['weight'], r['created_at']) for r in rows]
+                if len(rows) < batch_size:
+                    break
+                after_at, after_id = rows[-1]['cursor_at'], rows[-1]['cursor_id']
+
+    def get_temporal_chain(self, session_id: Optional[str] = None) -> Dict:
+        """
+        First/last proposition and length of a conversation's chain.
+
+        Reads the ends off the (session_id, seq) index instead of
+        enumerating [:NEXT*] paths. Without session_id, the conversation
+        with the most propositions is reported (one linear count).
+        """
+        query = """
+        CALL {
+            MATCH (p:Proposition)
+            WHERE p.session_id IS NOT NULL AND ($session_id IS NULL OR p.session_id = $session_id)
+            RETURN p.session_id AS session_id, count(*) AS size
+            ORDER BY size DESC
+            LIMIT 1
+        }
+        CALL {
+            WITH session_id
+            MATCH (p:Proposition)
+            WHERE p.session_id = session_id AND p.seq IS NOT NULL
+            RETURN p AS first
+            ORDER BY p.seq ASC
+            LIMIT 1
+        }
+        CALL {
+            WITH session_id
+            MATCH (p:Proposition)
+            WHERE p.session_id = session_id AND p.seq IS NOT NULL
+            RETURN p AS last
+            ORDER BY p.seq DESC
+            LIMIT 1
+        }
+        RETURN session_id,
+               size - 1 AS chain_length,
+               first.content AS first_content,
+               last.content AS last_content,
+               first.timestamp AS first_time,
+               last.timestamp AS last_time
+        """
+
+        with self.driver.session() as session:
+            result = session.run(query, {"session_id": session_id})
+            record = result.single()
+            return dict(record) if record else {}
+
+    def get_window(self, around_id: str, before: int = 5, after: int = 5) -> List[Dict]:
+        """
+        What was said around a proposition: its conversation neighbours.
+
+        Two bounded seeks on the (session_id, seq) index - O(window),
+        however long the conversation. Propositions stored before seq
+        numbers existed fall back to a bounded NEXT walk.
+
+        Args:
+            around_id: Center proposition ID
+            before: Propositions before it
+            after: Propositions after it
+
+        Returns:
+            Propositions in conversation order, each with "offset"
+            (negative = earlier, 0 = around_id); [] if unknown
+        """
+        query = """
+        MATCH (c:Proposition {id: $id})
+        WHERE c.seq IS NOT NULL
+        CALL {
+            WITH c
+            MATCH (p:Proposition)
+            WHERE p.session_id = c.session_id AND p.seq < c.seq
+            WITH p ORDER BY p.seq DESC LIMIT $before
+            RETURN collect(p) AS earlier
+        }
+        CALL {
+            WITH c
+            MATCH (p:Proposition)
+            WHERE p.session_id = c.session_id AND p.seq > c.seq
+            WITH p ORDER BY p.seq ASC LIMIT $after
+            RETURN collect(p) AS later
+        }
+        WITH reverse(earlier) + [c] + later AS window, size(earlier) AS center
+        UNWIND range(0, size(window) - 1) AS i
+        WITH window[i] AS p, i - center AS offset
+        RETURN p {.*, embedding: null, offset: offset} AS p
+        ORDER BY offset
+        """
+
+        # Legacy nodes (no seq): walk NEXT, bounded by the window
+        legacy_query = f"""
+        MATCH (c:Proposition {{id: $id}})
+        OPTIONAL MATCH path_before = (p:Proposition)-[:NEXT*1..{max(int(before), 1)}]->(c)
+        WITH c, collect(DISTINCT [p, -length(path_before)]) AS earlier
+        OPTIONAL MATCH path_after = (c)-[:NEXT*1..{max(int(after), 1)}]->(q:Proposition)
+        WITH c, earlier, collect(DISTINCT [q, length(path_after)]) AS later
+        UNWIND earlier + [[c, 0]] + later AS entry
+        WITH entry WHERE entry[0] IS NOT NULL
+          AND entry[1] >= -$before AND entry[1] <= $after
+        WITH DISTINCT entry[0] AS p, entry[1] AS offset
+        RETURN p {{.*, embedding: null, offset: offset}} AS p
+        ORDER BY offset
+        """
+
+        params = {"id": around_id, "before": before, "after": after}
+        with self.driver.session() as session:
+            records = list(session.run(query, params))
+            if not records:
+                records = list(session.run(legacy_query, params))
+
+        window = []
+        for record in records:
+            prop = dict(record['p'])
+            prop.pop('embedding', None)
+            window.append(prop)
+        return window
+
+    def get_semantic_neighbors(
+        self,
+        proposition_id: str,
+        min_weight: float = 0.5,
+        limit: Optional[int] = None,
+        session_id: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Get semantic neighbors of a proposition.
+
+        Args:
+            proposition_id: Proposition ID
+            min_weight: Minimum edge weight
+            limit: Maximum neighbors (fan-out bound for traversal; None = all)
+            session_id: Only neighbors from this conversation
+
+        Returns:
+            List of neighbor propositions with weights, hub-penalized
+            (CSLS from knn_radius) order first
+        """
+        query = """
+        MATCH (p:Proposition {id: $id})-[r:COHERENT]-(neighbor:Proposition)
+        WHERE r.weight >= $min_weight
+          AND ($session_id IS NULL OR neighbor.session_id = $session_id)
+        RETURN neighbor.id AS id,
+               neighbor.content AS content,
+               neighbor.session_id AS session_id,
+               r.weight AS similarity,
+               r.scaled_weight AS scaled_weight
+        ORDER BY CASE
+            WHEN p.knn_radius IS NULL THEN r.weight
+            ELSE 2 * r.weight - p.knn_radius - coalesce(neighbor.knn_radius, p.knn_radius)
+        END DESC
+        LIMIT $limit
         """
 
         with self.driver.session() as session:
             result = session.run(query, {
                 "id": proposition_id,
-                "min_weight": min_weight
+                "min_weight": min_weight,
+                "limit": limit if limit is not None else 2**31 - 1,
+                "session_id": session_id
             })
             return [dict(record) for record in result]
+
+    # =========================================================================
+    # HUB CONTROL
+    # =========================================================================
+
+    def refresh_coherent_stats(self, k: int, batch_size: int = 10000):
+        """
+        Recompute degree accounting and local-scaling weights for all nodes.
+
+        Backfill for graphs built before hub control, and the last step of
+        a bulk rebuild: sets `coherent_degree` and `knn_radius` (mean weight
+        of the top-k edges) on every proposition, then `scaled_weight` on
+        every COHERENT edge.
+
+        Args:
+            k: Neighbours used for knn_radius (Neo4jConfig.TOP_K_NEIGHBORS)
+            batch_size: Rows per transaction
+        """
+        with self.driver.session() as session:
+            session.run("""
+                MATCH (p:Proposition)
+                CALL {
+                    WITH p
+                    OPTIONAL MATCH (p)-[r:COHERENT]-()
+                    WITH p, r
+                    ORDER BY r.weight DESC
+                    WITH p, collect(r.weight) AS weights
+                    SET p.coherent_degree = size(weights),
+                        p.knn_radius = CASE
+                            WHEN size(weights) = 0 THEN null
+                            ELSE reduce(s = 0.0, w IN weights[..$k] | s + w) / size(weights[..$k])
+                        END
+                } IN TRANSACTIONS OF $batch_size ROWS
+            """, {"k": k, "batch_size": batch_size}).consume()
+
+            session.run("""
+                MATCH (a:Proposition)-[r:COHERENT]->(b:Proposition)
+                CALL {
+                    WITH a, r, b
+                    SET r.scaled_weight = 2 * r.weight
+                        - coalesce(a.knn_radius, r.weight)
+                        - coalesce(b.knn_radius, r.weight)
+                } IN TRANSACTIONS OF $batch_size ROWS
+            """, {"batch_size": batch_size}).consume()
+
+    def enforce_degree_cap(self, max_degree: int, batch_size: int = 1000) -> int:
+        """
+        Prune every node above its degree cap down to its strongest edges.
+
+        Edges are ranked by the same inline CSLS score as
+        link_semantic_neighbors (hub-penalized), so links into generic hubs
+        go first. Requires coherent_degree and knn_radius to be populated
+        (see refresh_coherent_stats).
+
+        Args:
+            max_degree: Global cap (per-node `max_degree` property wins)
+            batch_size: Nodes per transaction
+
+        Returns:
+            Number of edges evicted
+        """
+        query = """
+        MATCH (q:Proposition)
+        WHERE q.coherent_degree > coalesce(q.max_degree, $max_degree)
+        CALL {
+            WITH q
+            MATCH (q)-[e:COHERENT]-(other)
+            WITH q, e, other
+            ORDER BY CASE
+                WHEN q.knn_radius IS NULL THEN e.weight
+                ELSE 2 * e.weight - q.knn_radius - coalesce(other.knn_radius, q.knn_radius)
+            END DESC
+            WITH q, collect(e) AS edges, collect(other) AS others
+            WITH q, edges[coalesce(q.max_degree, $max_degree)..] AS evict,
+                 others[coalesce(q.max_degree, $max_degree)..] AS orphans
+            FOREACH (e IN evict | DELETE e)
+            SET q.coherent_degree = q.coherent_degree - size(evict)
+            FOREACH (o IN orphans | SET o.coherent_degree = coalesce(o.coherent_degree, 1) - 1)
+            RETURN size(evict) AS evicted
+        } IN TRANSACTIONS OF $batch_size ROWS
+        RETURN sum(evicted) AS evicted
+        """
+
+        with self.driver.session() as session:
+            result = session.run(query, {"max_degree": max_degree, "batch_size": batch_size})
+            evicted = result.single()['evicted'] or 0
+            if evicted:
+                self._record_eviction(session, evicted)
+            return evicted
+
+    @staticmethod
+    def _record_eviction(session, evicted: int):
+        """Stamp the edge_eviction marker after COHERENT edges were deleted.
+
+        Deletions are invisible to iter_edges_since: snapshots compare this
+        timestamp to their export time and re-export when it is newer.
+        """
+        session.run("""
+            MERGE (m:GraphMaintenance {name: 'edge_eviction'})
+            SET m.ran_at = $now, m.evicted = $evicted
+        """, {"now": datetime.now().isoformat(), "evicted": evicted})
+
+    def get_edges_evicted_at(self) -> Optional[str]:
+        """ISO timestamp of the last eviction that deleted edges (None = never)."""
+        with self.driver.session() as session:
+            record = session.run("""
+                MATCH (m:GraphMaintenance {name: 'edge_eviction'})
+                RETURN m.ran_at AS ran_at
+            """).single()
+        return record['ran_at'] if record else None
+
+    def hub_report(self, max_degree: int, limit: int = 20) -> Dict:
+        """
+        Report the worst COHERENT hubs and the traversal cost of the cap.
+
+        Degrees are counted live (not read from coherent_degree) so the
+        report is correct even before a backfill.
+
+        Traversal cost model (random start node):
+        - 1-hop expansion visits avg(degree) edges
+        - 2-hop expansion visits avg(degree²) edges (hubs dominate)
+        "capped" is the same with every degree clamped to max_degree.
+
+        Args:
+            max_degree: Degree cap to evaluate
+            limit: Number of hubs to list
+
+        Returns:
+            {"hubs": [...], "nodes", "max_degree_seen", "over_cap",
+             "one_hop": {"current", "capped"}, "two_hop": {"current", "capped"},
+             "two_hop_saved_pct"}
+        """
+        with self.driver.session() as session:
+            result = session.run("""
+                MATCH (p:Proposition)
+                WITH p, COUNT { (p)-[:COHERENT]-() } AS degree
+                ORDER BY degree DESC
+                LIMIT $limit
+                RETURN p.id AS id,
+                       p.content AS content,
+                       degree,
+                       p.knn_radius AS knn_radius,
+                       p.max_degree AS max_degree
+            """, {"limit": limit})
+            hubs = [dict(record) for record in result]
+
+            result = session.run("""
+                MATCH (p:Proposition)
+                WITH COUNT { (p)-[:COHERENT]-() } AS d
+                WITH d, CASE WHEN d > $cap THEN $cap ELSE d END AS c
+                RETURN count(*) AS nodes,
+                       max(d) AS max_degree_seen,
+                       sum(CASE WHEN d > $cap THEN 1 ELSE 0 END) AS over_cap,
+                       avg(d) AS one_hop,
+                       avg(c) AS one_hop_capped,
+                       avg(d * d) AS two_hop,
+                       avg(c * c) AS two_hop_capped
+            """, {"cap": max_degree})
+            totals = dict(result.single())
+
+        two_hop = totals['two_hop'] or 0
+        two_hop_capped = totals['two_hop_capped'] or 0
+
+        return {
+            "hubs": hubs,
+            "nodes": totals['nodes'],
+            "max_degree_seen": totals['max_degree_seen'] or 0,
+            "over_cap": totals['over_cap'],
+            "one_hop": {"current": totals['one_hop'] or 0, "capped": totals['one_hop_capped'] or 0},
+            "two_hop": {"current": two_hop, "capped": two_hop_capped},
+            "two_hop_saved_pct": round(100 * (1 - two_hop_capped / two_hop), 1) if two_hop else 0.0
+        }
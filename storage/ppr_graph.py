@@ -0,0 +1,381 @@
+"""
+Personalized PageRank over an In-Memory Graph Snapshot
+
+Multi-hop Cypher expansion gets expensive as COHERENT density grows. This
+module keeps a SciPy CSR copy of the COHERENT + NEXT adjacency in process
+and ranks propositions by personalized PageRank from vector-search seeds:
+no database traversal at query time, one sparse mat-vec per iteration.
+
+Snapshot maintenance:
+- full export: stream the whole adjacency (Neo4jClient.iter_adjacency)
+- delta: merge edges created since the last refresh
+  (Neo4jClient.iter_edges_since); evicted edges linger until the next
+  full export, which refresh() forces once edges were evicted since the
+  last one (link_semantic_neighbors or enforce_degree_cap)
+- save()/load(): .npz on disk, so a restart only needs a delta
+
+Edge weights: COHERENT = similarity, NEXT = `next_weight`; both directions.
+"""
+
+import os
+import time
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from scipy import sparse
+
+
+class GraphSnapshot:
+    """Weighted COHERENT/NEXT adjacency as CSR + personalized PageRank."""
+
+    def __init__(self, next_weight: float = 0.3):
+        """
+        Args:
+            next_weight: Weight of a NEXT edge relative to COHERENT similarity
+        """
+        self.next_weight = next_weight
+
+        self.ids: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.adjacency = sparse.csr_matrix((0, 0), dtype=np.float32)
+        self._transition_t: Optional[sparse.csr_matrix] = None  # Pᵀ, column-stochastic
+        self._dangling = np.zeros(0, dtype=bool)
+
+        self.exported_at: Optional[str] = None  # Last full export
+        self.refreshed_at: Optional[str] = None  # Last full export or delta
+        self.full_exports = 0
+        self.deltas = 0
+
+        self._lock = threading.Lock()
+
+    # =========================================================================
+    # BUILD
+    # =========================================================================
+
+    def _node(self, proposition_id: str, ids: List[str], index: Dict[str, int]) -> int:
+        row = index.get(proposition_id)
+        if row is None:
+            row = len(ids)
+            index[proposition_id] = row
+            ids.append(proposition_id)
+        return row
+
+    def _edge_arrays(self, edges: Iterable[tuple], ids: List[str], index: Dict[str, int]):
+        """Symmetric COO arrays for (from, to, type, weight, ...) tuples."""
+        rows, cols, weights = [], [], []
+        for edge in edges:
+            from_id, to_id, rel_type, weight = edge[:4]
+            i = self._node(from_id, ids, index)
+            j = self._node(to_id, ids, index)
+            w = float(weight) if rel_type == "COHERENT" and weight is not None else self.next_weight
+            rows += (i, j)
+            cols += (j, i)
+            weights += (w, w)
+        return (
+            np.asarray(rows, dtype=np.int64),
+            np.asarray(cols, dtype=np.int64),
+            np.asarray(weights, dtype=np.float32)
+        )
+
+    def full_export(self, neo4j, batch_size: int = 5000) -> Dict:
+        """
+        Rebuild the snapshot from the whole graph.
+
+        Returns:
+            {"nodes", "edges", "seconds"}
+        """
+        start = time.time()
+        started_at = datetime.now().isoformat()
+        ids: List[str] = []
+        index: Dict[str, int] = {}
+        parts = []
+
+        for node_ids, edges in neo4j.iter_adjacency(batch_size=batch_size):
+            for proposition_id in node_ids:
+                self._node(proposition_id, ids, index)
+            parts.append(self._edge_arrays(edges, ids, index))
+
+        n = len(ids)
+        if parts:
+            rows, cols, weights = (np.concatenate(a) for a in zip(*parts))
+        else:
+            rows = cols = np.zeros(0, dtype=np.int64)
+            weights = np.zeros(0, dtype=np.float32)
+
+        # Duplicates (a NEXT and a COHERENT between the same pair) are summed
+        adjacency = sparse.csr_matrix((weights, (rows, cols)), shape=(n, n), dtype=np.float32)
+        adjacency.sum_duplicates()
+
+        self._swap(ids, index, adjacency)
+        with self._lock:
+            self.exported_at = self.refreshed_at = started_at
+            self.full_exports += 1
+
+        return {"nodes": n, "edges": adjacency.nnz // 2, "seconds": round(time.time() - start, 2)}
+
+    def apply_delta(self, neo4j, since: Optional[str] = None) -> Dict:
+        """
+        Merge edges created after `since` (default: last refresh).
+
+        New edges are added, re-weighted edges overwrite their old weight,
+        new nodes extend the matrix.
+
+        Returns:
+            {"edges", "new_nodes", "seconds"}
+        """
+        start = time.time()
+        since = since or self.refreshed_at
+        if since is None:
+            raise ValueError("No snapshot to update - run full_export() first")
+        started_at = datetime.now().isoformat()
+
+        with self._lock:
+            ids, index = list(self.ids), dict(self.index)
+            adjacency = self.adjacency
+
+        edges = [edge for batch in neo4j.iter_edges_since(since) for edge in batch]
+        before = len(ids)
+        rows, cols, weights = self._edge_arrays(edges, ids, index)
+
+        n = len(ids)
+        adjacency = adjacency.copy()
+        adjacency.resize((n, n))
+        if len(rows):
+            delta = sparse.csr_matrix((weights, (rows, cols)), shape=(n, n), dtype=np.float32)
+            delta.sum_duplicates()
+            pattern = delta.copy()
+            pattern.data[:] = 1.0
+            # Overwrite: drop the old weight where the delta has an edge
+            adjacency = (adjacency - adjacency.multiply(pattern) + delta).tocsr()
+            adjacency.eliminate_zeros()
+
+        self._swap(ids, index, adjacency)
+        with self._lock:
+            self.refreshed_at = started_at
+            self.deltas += 1
+
+        return {"edges": len(edges), "new_nodes": n - before, "seconds": round(time.time() - start, 3)}
+
+    def _swap(self, ids: List[str], index: Dict[str, int], adjacency: sparse.csr_matrix):
+        """Precompute Pᵀ and publish the new snapshot atomically."""
+        out_weight = np.asarray(adjacency.sum(axis=1)).ravel()
+        dangling = out_weight == 0
+        inv = np.divide(1.0, out_weight, out=np.zeros_like(out_weight), where=~dangling)
+        transition_t = (sparse.diags(inv.astype(np.float32)) @ adjacency).T.tocsr()
+
+        with self._lock:
+            self.ids, self.index, self.adjacency = ids, index, adjacency
+            self._transition_t, self._dangling = transition_t, dangling
+
+    def refresh(self, neo4j, full_interval: float = 3600.0) -> Dict:
+        """
+        Full export if never done, older than full_interval seconds, or
+        edges were evicted since (Neo4jClient.get_edges_evicted_at);
+        else a delta.
+        """
+        if self.exported_at is None or (
+            datetime.now() - datetime.fromisoformat(self.exported_at)
+        ).total_seconds() > full_interval:
+            return {"kind": "full", **self.full_export(neo4j)}
+
+        evicted_at = neo4j.get_edges_evicted_at()
+        if evicted_at and datetime.fromisoformat(evicted_at) >= datetime.fromisoformat(self.exported_at):
+            return {"kind": "full", **self.full_export(neo4j)}
+        return {"kind": "delta", **self.apply_delta(neo4j)}
+
+    # =========================================================================
+    # PERSISTENCE
+    # =========================================================================
+
+    def save(self, path: str):
+        """Write the snapshot to `path` (.npz, atomic)."""
+        with self._lock:
+            adjacency, ids = self.adjacency, self.ids
+            exported_at, refreshed_at = self.exported_at, self.refreshed_at
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.tmp.npz"
+        np.savez(
+            tmp,
+            ids=np.asarray(ids, dtype=object),
+            indptr=adjacency.indptr,
+            indices=adjacency.indices,
+            data=adjacency.data,
+            meta=np.asarray([exported_at or "", refreshed_at or "", str(self.next_weight)], dtype=object)
+        )
+        os.replace(tmp, path)
+
+    def load(self, path: str) -> bool:
+        """Load a saved snapshot (False if missing or built with another next_weight)."""
+        if not os.path.exists(path):
+            return False
+        with np.load(path, allow_pickle=True) as f:
+            exported_at, refreshed_at, next_weight = f['meta'].tolist()
+            if float(next_weight) != self.next_weight:
+                return False
+            ids = f['ids'].tolist()
+            n = len(ids)
+            adjacency = sparse.csr_matrix((f['data'], f['indices'], f['indptr']), shape=(n, n))
+
+        self._swap(ids, {pid: i for i, pid in enumerate(ids)}, adjacency)
+        with self._lock:
+            self.exported_at = exported_at or None
+            self.refreshed_at = refreshed_at or None
+        return True
+
+    # =========================================================================
+    # PERSONALIZED PAGERANK
+    # =========================================================================
+
+    def personalized_pagerank(
+        self,
+        seeds: Dict[str, float],
+        k: int = 20,
+        alpha: float = 0.15,
+        max_iter: int = 30,
+        tol: float = 1e-6,
+        include_seeds: bool = True
+    ) -> List[Dict]:
+        """
+        Rank propositions by personalized PageRank from weighted seeds.
+
+        Power iteration r ← (1-α)·Pᵀr + α·s; mass on dangling nodes flows
+        back to the seeds. Stops when the L1 change drops below `tol`.
+
+        Args:
+            seeds: {proposition_id: weight} (e.g. vector similarities);
+                   ids missing from the snapshot are ignored
+            k: Results
+            alpha: Restart probability (higher = stay closer to the seeds)
+            max_iter: Iteration cap
+            tol: L1 convergence threshold
+            include_seeds: Keep the seeds themselves in the ranking
+
+        Returns:
+            [{"id", "score", "seed"}] by score (desc)
+        """
+        with self._lock:
+            ids, index = self.ids, self.index
+            transition_t, dangling = self._transition_t, self._dangling
+
+        n = len(ids)
+        seed_rows = {index[pid]: w for pid, w in seeds.items() if pid in index and w > 0}
+        if not n or not seed_rows:
+            return []
+
+        restart = np.zeros(n, dtype=np.float32)
+        restart[list(seed_rows)] = list(seed_rows.values())
+        restart /= restart.sum()
+
+        rank = restart.copy()
+        for _ in range(max_iter):
+            leaked = rank[dangling].sum()
+            updated = (1 - alpha) * (transition_t @ rank) + ((1 - alpha) * leaked + alpha) * restart
+            delta = np.abs(updated - rank).sum()
+            rank = updated
+            if delta < tol:
+                break
+
+        if not include_seeds:
+            rank[list(seed_rows)] = 0.0
+
+        k = min(k, int(np.count_nonzero(rank)))
+        if k <= 0:
+            return []
+        top = np.argpartition(-rank, k - 1)[:k]
+        top = top[np.argsort(-rank[top])]
+        return [{"id": ids[i], "score": float(rank[i]), "seed": int(i) in seed_rows} for i in top]
+
+    def get_stats(self) -> Dict:
+        """Get snapshot statistics."""
+        with self._lock:
+            return {
+                "nodes": len(self.ids),
+                "edges": self.adjacency.nnz // 2,
+                "exported_at": self.exported_at,
+                "refreshed_at": self.refreshed_at,
+                "full_exports": self.full_exports,
+                "deltas": self.deltas,
+                "memory_mb": round(
+                    (self.adjacency.data.nbytes + self.adjacency.indices.nbytes + self.adjacency.indptr.nbytes) * 2 / 1e6, 1
+                )
+            }
+
+
+def ppr_retrieve(
+    neo4j,
+    snapshot: GraphSnapshot,
+    query_embedding: List[float],
+    k: int = 10,
+    seeds: int = 10,
+    min_similarity: float = 0.3,
+    alpha: float = 0.15,
+    hydrate: bool = True
+) -> Dict:
+    """
+    Graph-aware retrieval: vector-search seeds, PPR over the snapshot.
+
+    Args:
+        neo4j: Neo4jClient (seed search + optional content lookup)
+        snapshot: Loaded GraphSnapshot
+        query_embedding: Query vector
+        k: Results
+        seeds: Vector-search seeds (weighted by similarity)
+        min_similarity: Minimum seed similarity
+        alpha: PPR restart probability
+        hydrate: Fetch content/speaker/type for the results (one round trip)
+
+    Returns:
+        {"results": [{"id", "score", "seed", ...}], "seed_ms", "ppr_ms", "hydrate_ms"}
+    """
+    start = time.perf_counter()
+    hits = neo4j.vector_search(query_embedding, k=seeds, min_similarity=min_similarity)
+    seed_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    ranked = snapshot.personalized_pagerank({h['id']: h['similarity'] for h in hits}, k=k, alpha=alpha)
+    ppr_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    if hydrate and ranked:
+        props = neo4j.get_propositions([r['id'] for r in ranked])
+        ranked = [
+            {**r, **{key: props[r['id']].get(key) for key in ("content", "speaker", "type", "concepts", "block_metadata")}}
+            for r in ranked if r['id'] in props
+        ]
+    hydrate_ms = (time.perf_counter() - start) * 1000
+
+    return {
+        "results": ranked,
+        "seed_ms": round(seed_ms, 1),
+        "ppr_ms": round(ppr_ms, 2),
+        "hydrate_ms": round(hydrate_ms, 1)
+    }
+
+
+if __name__ == "__main__":
+    # Export / refresh the on-disk snapshot
+    import sys
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from storage.neo4j_client import Neo4jClient
+    from config import Neo4jConfig, PPRConfig
+
+    snapshot = GraphSnapshot(next_weight=PPRConfig.NEXT_WEIGHT)
+    loaded = snapshot.load(PPRConfig.SNAPSHOT_PATH)
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+
+    if command in ("export", "refresh"):
+        with Neo4jClient(Neo4jConfig.URI, Neo4jConfig.USER, Neo4jConfig.PASSWORD) as neo4j:
+            if command == "export" or not loaded:
+                print("📦 Exporting COHERENT/NEXT adjacency...")
+                print(f"✅ {snapshot.full_export(neo4j)}")
+            else:
+                print(f"🔄 Applying edges created since {snapshot.refreshed_at}...")
+                print(f"✅ {snapshot.refresh(neo4j, full_interval=PPRConfig.FULL_EXPORT_INTERVAL)}")
+        snapshot.save(PPRConfig.SNAPSHOT_PATH)
+
+    print(f"📊 Graph snapshot: {snapshot.get_stats()}")
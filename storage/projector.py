@@ -0,0 +1,283 @@
+"""
+Outbox Projector for Living Knowledge Ecosystem
+
+Archive-first dual write: a turn commits to SQLite together with its graph
+projection entries (outbox table), and this worker applies them to Neo4j in
+the background. Turn latency is bounded by SQLite; Neo4j may lag behind but
+never diverges - entries are applied in commit order and only removed once
+Neo4j accepted them.
+
+Entry kinds:
+- node: {"proposition_id"}       → Proposition node (row read from the archive)
+- turn: {"session_id", "proposition_ids", "first_seq", "last_seq"}
+                                 → NEXT chain spliced into the conversation
+- next: {"from", "to"}           → NEXT edge (entries queued before "turn")
+- link: {"proposition_id"}       → COHERENT edges to the top-k neighbours
+
+Every write is a MERGE (or re-linking the same neighbours), so replaying a
+batch after a crash between the Neo4j commit and the ack is harmless.
+
+Poison entries: after a failed batch the retries shrink (halved per
+attempt) until the failing entry is retried alone; once it has failed
+`max_attempts` times it is moved to the archive's dead-letter table
+(outbox_dead) so the entries behind it keep flowing. Neo4j being
+unreachable is not counted as an attempt.
+"""
+
+import time
+import threading
+from typing import Callable, Dict, List, Optional
+
+from neo4j.exceptions import ServiceUnavailable, SessionExpired, TransientError
+
+from .neo4j_client import Neo4jClient
+
+# Errors that say nothing about the entries themselves (retried forever)
+_TRANSIENT_ERRORS = (ServiceUnavailable, SessionExpired, TransientError, ConnectionError)
+
+
+class OutboxProjector:
+    """Background worker applying archive outbox entries to Neo4j."""
+
+    def __init__(
+        self,
+        archive,
+        neo4j,
+        k: int,
+        min_similarity: float,
+        max_degree: int,
+        neighbor_search: Optional[Callable] = None,
+        batch_size: int = 500,
+        poll_interval: float = 0.5,
+        max_backoff: float = 30.0,
+        max_attempts: int = 5
+    ):
+        """
+        Args:
+            archive: ArchiveDB holding the outbox
+            neo4j: Neo4jClient (driver is thread-safe, kept open)
+            k: COHERENT neighbours per proposition
+            min_similarity: COHERENT threshold
+            max_degree: COHERENT degree cap
+            neighbor_search: (neo4j, embedding, k, min_similarity) → [{"id", "similarity"}]
+                             (default: Neo4j vector index)
+            batch_size: Entries per round
+            poll_interval: Idle wait between polls (seconds)
+            max_backoff: Upper bound of the retry delay after failures
+            max_attempts: Failures after which an entry is dead-lettered
+        """
+        self.archive = archive
+        self.neo4j = neo4j
+        self.k = k
+        self.min_similarity = min_similarity
+        self.max_degree = max_degree
+        self.neighbor_search = neighbor_search or (
+            lambda client, embedding, k, min_similarity: client.vector_search(
+                query_embedding=embedding, k=k, min_similarity=min_similarity
+            )
+        )
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_backoff = max_backoff
+        self.max_attempts = max_attempts
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._failures = 0
+
+        self.applied = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.dead_lettered = 0
+        self.last_applied_seq: Optional[int] = None
+        self.last_batch_ms = 0.0
+        self.last_error: Optional[str] = None
+
+    # =========================================================================
+    # APPLY
+    # =========================================================================
+
+    def run_once(self) -> int:
+        """
+        Apply the oldest pending batch.
+
+        Returns:
+            Number of entries applied or dead-lettered (0 = outbox empty)
+
+        Raises:
+            Exception: Neo4j errors (entries stay queued, attempts recorded)
+        """
+        entries = self.archive.fetch_outbox(self.batch_size)
+        if not entries:
+            return 0
+
+        # Retrying after failures: shrink the batch to isolate the culprit
+        attempts = entries[0]['attempts']
+        if attempts:
+            limit = 1 if attempts >= self.max_attempts - 1 else max(1, self.batch_size >> attempts)
+            entries = entries[:limit]
+
+        start = time.time()
+        seqs = [e['seq'] for e in entries]
+        try:
+            self._apply(entries)
+        except Exception as e:
+            transient = isinstance(e, _TRANSIENT_ERRORS)
+            if not transient and len(entries) == 1 and attempts + 1 >= self.max_attempts:
+                self.archive.dead_letter_outbox(seqs, str(e))
+                self.dead_lettered += 1
+                self.last_error = str(e)
+                print(f"☠️  Outbox entry {seqs[0]} ({entries[0]['kind']}) dead-lettered "
+                      f"after {attempts + 1} attempts: {e}")
+                return 1
+            self.archive.fail_outbox(seqs, str(e), count_attempt=not transient)
+            raise
+
+        self.archive.ack_outbox(seqs)
+        Neo4jClient.invalidate_retrieval_cache()
+        self.applied += len(entries)
+        self.batches += 1
+        self.last_applied_seq = seqs[-1]
+        self.last_batch_ms = round((time.time() - start) * 1000, 1)
+        return len(entries)
+
+    def _apply(self, entries: List[Dict]):
+        """Nodes first, then NEXT, then COHERENT (neighbours must exist)."""
+        node_ids = [e['payload']['proposition_id'] for e in entries if e['kind'] == "node"]
+        link_ids = [e['payload']['proposition_id'] for e in entries if e['kind'] == "link"]
+        next_edges = [e['payload'] for e in entries if e['kind'] == "next"]
+        turns = [e['payload'] for e in entries if e['kind'] == "turn"]
+
+        rows = self.archive.get_graph_rows(list(dict.fromkeys(node_ids + link_ids)))
+
+        nodes = [rows[pid] for pid in node_ids if pid in rows]
+        if nodes:
+            self.neo4j.create_propositions_batch([
+                {
+                    "id": row['proposition_id'],
+                    "content": row['content'],
+                    "embedding": row['embedding'],
+                    "type": row['type'],
+                    "certainty": row['certainty'],
+                    "concepts": row['concepts'],
+                    "source_message_id": row['message_id'],
+                    "source_semantic_unit_id": row['semantic_unit_id'],
+                    "speaker": row['speaker'],
+                    "timestamp": row['timestamp'],
+                    "block_metadata": row['block_metadata'],
+                    "session_id": row['session_id'],
+                    "seq": row['seq'],
+                    "tenant_id": row['tenant_id']
+                }
+                for row in nodes
+            ])
+
+        if next_edges:
+            self.neo4j.create_temporal_edges_batch(next_edges)
+
+        for turn in turns:
+            self.neo4j.link_turn(
+                turn['session_id'],
+                turn['proposition_ids'],
+                turn['first_seq'],
+                turn['last_seq']
+            )
+
+        for pid in link_ids:
+            if pid not in rows:
+                continue
+            similar = self.neighbor_search(self.neo4j, rows[pid]['embedding'], self.k + 1, self.min_similarity)
+            neighbors = [n for n in similar if n['id'] != pid][:self.k]
+            self.neo4j.link_semantic_neighbors(
+                pid,
+                neighbors,
+                max_degree=self.max_degree,
+                created_by="extraction"
+            )
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Apply entries in the calling thread until the outbox is empty.
+
+        Returns:
+            True if drained, False on timeout
+        """
+        deadline = time.time() + timeout if timeout is not None else None
+        while self.run_once():
+            if deadline is not None and time.time() > deadline:
+                return False
+        return True
+
+    # =========================================================================
+    # BACKGROUND WORKER
+    # =========================================================================
+
+    def start(self):
+        """Start the daemon worker thread (idempotent)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="outbox-projector", daemon=True)
+        self._thread.start()
+
+    def notify(self):
+        """Wake the worker (call after committing new entries)."""
+        self._wake.set()
+
+    def stop(self, drain: bool = False, timeout: float = 10.0):
+        """
+        Stop the worker.
+
+        Args:
+            drain: Apply what is pending first (bounded by timeout)
+            timeout: Seconds to wait
+        """
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+        if drain:
+            try:
+                self.drain(timeout)
+            except Exception as e:
+                print(f"⚠️  Outbox drain failed ({self.archive.get_outbox_stats()['pending']} entries pending): {e}")
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                applied = self.run_once()
+                self._failures = 0
+            except Exception as e:
+                self._failures += 1
+                self.failed_batches += 1
+                self.last_error = str(e)
+                delay = min(self.poll_interval * 2 ** self._failures, self.max_backoff)
+                print(f"⚠️  Graph projection failed (retry in {delay:.1f}s): {e}")
+                self._stop.wait(delay)
+                continue
+
+            if not applied:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+    # =========================================================================
+    # METRICS
+    # =========================================================================
+
+    def get_stats(self) -> Dict:
+        """Projection lag (pending entries, oldest pending age) and throughput."""
+        return {
+            **self.archive.get_outbox_stats(),
+            "running": self._thread is not None and self._thread.is_alive(),
+            "applied": self.applied,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "dead_lettered": self.dead_lettered,
+            "last_applied_seq": self.last_applied_seq,
+            "last_batch_ms": self.last_batch_ms,
+            "last_error": self.last_error
+        }
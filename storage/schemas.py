@@ -36,6 +36,31 @@ CREATE INDEX proposition_is_weak IF NOT EXISTS
 FOR (p:Proposition) ON (p.is_weak);
 """
 
+CREATE_FULLTEXT_INDEX = """
+-- Full-text (BM25) index for exact identifiers that embed poorly:
+-- URLs, filenames, error codes, config keys (content + block JSON)
+CREATE FULLTEXT INDEX proposition_text IF NOT EXISTS
+FOR (p:Proposition) ON EACH [p.content, p.block_metadata];
+"""
+
+CREATE_AGENDA_INDEXES = """
+-- Agenda (typed block lookup): propositions carrying a block also get a
+-- :Decision / :Resource / :Document label, the block fields as properties
+-- and ABOUT edges to :Concept nodes. Same three indexes per label:
+CREATE CONSTRAINT concept_name_unique IF NOT EXISTS
+FOR (c:Concept) REQUIRE c.name IS UNIQUE;
+
+CREATE INDEX decision_timestamp IF NOT EXISTS
+FOR (p:Decision) ON (p.timestamp, p.id);
+
+CREATE INDEX decision_session_timestamp IF NOT EXISTS
+FOR (p:Decision) ON (p.session_id, p.timestamp);
+
+-- CONTAINS on the key field (decision_choice / resource_url / doc_filename)
+CREATE TEXT INDEX decision_key_text IF NOT EXISTS
+FOR (p:Decision) ON (p.decision_choice);
+"""
+
 CREATE_VECTOR_INDEX = """
 -- Vector index for embedding similarity search
 -- Using cosine similarity for semantic matching
@@ -143,6 +168,23 @@ PROPOSITION_SCHEMA = {
             "description": "Last retrieval timestamp"
         },
 
+        # Hub control (maintained by create_edges / refresh_coherent_stats)
+        "coherent_degree": {
+            "type": "INTEGER",
+            "default": 0,
+            "description": "Number of COHERENT edges (bounded by max_degree)"
+        },
+        "knn_radius": {
+            "type": "FLOAT",
+            "default": None,
+            "description": "Mean similarity to top-K neighbors (local scaling; high = generic hub)"
+        },
+        "max_degree": {
+            "type": "INTEGER",
+            "default": None,
+            "description": "Per-node degree cap (overrides Neo4jConfig.MAX_COHERENT_DEGREE)"
+        },
+
         # Lifecycle
         "created_at": {
             "type": "DATETIME",
@@ -191,6 +233,11 @@ COHERENT_EDGE_SCHEMA = {
             "required": True,
             "description": "Exact cosine similarity (0-1), used for traversal filtering"
         },
+        "scaled_weight": {
+            "type": "FLOAT",
+            "default": None,
+            "description": "Hub-penalized weight 2·sim − r_a − r_b (CSLS), used for ranking/eviction"
+        },
         "created_at": {
             "type": "DATETIME",
             "required": True,
@@ -198,7 +245,7 @@ COHERENT_EDGE_SCHEMA = {
         },
         "created_by": {
             "type": "STRING",
-            "values": ["extraction", "sleep_cycle"],
+            "values": ["extraction", "sleep_cycle", "rebuild"],
             "default": "extraction",
             "description": "Who created the edge"
         },
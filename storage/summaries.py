@@ -0,0 +1,254 @@
+"""
+Cluster Summaries for Living Knowledge Ecosystem
+
+Offline tier above the propositions: embeddings in the LocalVectorStore are
+partitioned into thematic clusters (spherical k-means), and each cluster
+gets a Summary node in Neo4j - an LLM-written synopsis of its most central
+members, with its own embedding and SUMMARIZES edges to every member.
+Broad questions are answered from a handful of summaries instead of dozens
+of near-duplicate propositions (Neo4jClient.tiered_search).
+
+Persisted next to the store:
+- <path>.summary.centroids.npy  float32 (clusters x dims)
+- <path>.summary.assign         int32 cluster id per store row (append-only)
+- <path>.summary.state.json     version + per-cluster summarized size
+
+Incremental refresh:
+- new store rows are assigned to their nearest centroid and linked to the
+  existing summary (no LLM call)
+- a cluster is re-summarized only when it grew by `stale_fraction` since
+  its summary was written
+- centroids are retrained (new version, every summary rewritten) when the
+  store grew `growth_factor`x since training or was rebuilt
+"""
+
+import os
+import json
+import time
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from .ann_index import _nearest, _spherical_kmeans
+from .vector_store import LocalVectorStore
+
+
+class ClusterSummaries:
+    """Thematic clusters over the local vector store and their Summary nodes."""
+
+    def __init__(
+        self,
+        store: LocalVectorStore,
+        clusters: int = 0,
+        min_cluster_size: int = 5,
+        max_members: int = 30,
+        stale_fraction: float = 0.25,
+        growth_factor: float = 4.0
+    ):
+        """
+        Args:
+            store: Local vector store holding the embeddings
+            clusters: Number of clusters (0 = auto, ~sqrt(N)/2)
+            min_cluster_size: Smaller clusters get no summary
+            max_members: Central members shown to the summarizer
+            stale_fraction: Re-summarize after this relative growth
+            growth_factor: Retrain after the store grew this much
+        """
+        self.store = store
+        self.clusters = clusters
+        self.min_cluster_size = min_cluster_size
+        self.max_members = max_members
+        self.stale_fraction = stale_fraction
+        self.growth_factor = growth_factor
+
+        self.centroids_path = f"{store.path}.summary.centroids.npy"
+        self.assign_path = f"{store.path}.summary.assign"
+        self.state_path = f"{store.path}.summary.state.json"
+
+    # =========================================================================
+    # CLUSTERING
+    # =========================================================================
+
+    def _load(self):
+        """(centroids, assignment, state) or (None, None, None) if untrained/stale."""
+        if not (os.path.exists(self.centroids_path) and os.path.exists(self.state_path)):
+            return None, None, None
+
+        with open(self.state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        assign = np.fromfile(self.assign_path, dtype=np.int32) if os.path.exists(self.assign_path) else np.empty(0, dtype=np.int32)
+
+        # Store rebuilt (rows reordered or dropped): assignments are meaningless
+        ids = self.store.ids
+        assigned = state.get("assigned", 0)
+        if len(assign) != assigned or assigned > len(ids) or (assigned and ids[assigned - 1] != state.get("last_id")):
+            return None, None, None
+
+        return np.load(self.centroids_path), assign, state
+
+    def _train(self, iterations: int = 10, seed: int = 0):
+        """Spherical k-means over a sample, then assign every row."""
+        matrix = self.store.matrix
+        n = len(matrix)
+        clusters = min(self.clusters or max(1, int(np.sqrt(n) / 2)), n)
+        sample_size = min(n, 64 * clusters)
+
+        rng = np.random.default_rng(seed)
+        sample = np.asarray(matrix[np.sort(rng.choice(n, size=sample_size, replace=False))])
+        centroids = _spherical_kmeans(sample, clusters, iterations, rng)
+
+        block = self.store.block_rows
+        assign = np.concatenate([
+            _nearest(np.asarray(matrix[start:start + block]), centroids)
+            for start in range(0, n, block)
+        ]).astype(np.int32)
+
+        np.save(self.centroids_path, centroids)
+        assign.tofile(self.assign_path)
+        state = {"version": uuid.uuid4().hex[:8], "trained_rows": n, "clusters": {}}
+        return centroids, assign, state
+
+    def _save_state(self, state: Dict, assigned: int):
+        state["assigned"] = assigned
+        state["last_id"] = self.store.ids[assigned - 1] if assigned else None
+        state["updated_at"] = datetime.now().isoformat()
+        tmp = f"{self.state_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.state_path)
+
+    # =========================================================================
+    # REFRESH
+    # =========================================================================
+
+    def refresh(
+        self,
+        neo4j,
+        summarize: Callable[[List[str]], str],
+        embed: Callable[[List[str]], List[List[float]]],
+        retrain: bool = False
+    ) -> Dict:
+        """
+        Bring Summary nodes up to date with the store.
+
+        Args:
+            neo4j: Neo4jClient (member contents, Summary writes)
+            summarize: Member contents (most central first) -> summary text
+            embed: Texts -> embeddings (e.g. EmbeddingGenerator.generate_batch)
+            retrain: Force new centroids (rewrites every summary)
+
+        Returns:
+            {"version", "clusters", "summarized", "linked", "deleted",
+             "retrained", "seconds"}
+        """
+        start = time.time()
+        self.store.refresh()
+        n = len(self.store)
+        if n == 0:
+            return {"version": None, "clusters": 0, "summarized": 0, "linked": 0,
+                    "deleted": 0, "retrained": False, "seconds": 0.0}
+
+        centroids, assign, state = (None, None, None) if retrain else self._load()
+        retrained = centroids is None or n > self.growth_factor * state["trained_rows"]
+        if retrained:
+            print(f"🧭 Clustering {n} embeddings...")
+            centroids, assign, state = self._train()
+            new_from = 0
+        else:
+            # Assign rows appended since the last refresh to their nearest centroid
+            new_from = len(assign)
+            if new_from < n:
+                labels = _nearest(np.asarray(self.store.matrix[new_from:n]), centroids).astype(np.int32)
+                with open(self.assign_path, "ab") as f:
+                    f.write(labels.tobytes())
+                assign = np.concatenate([assign, labels])
+
+        version = state["version"]
+        sizes = np.bincount(assign, minlength=len(centroids))
+        ids = self.store.ids
+
+        # Stale = new, or grown past stale_fraction since its summary
+        stale, grown = [], []
+        for c in range(len(centroids)):
+            if sizes[c] < self.min_cluster_size:
+                continue
+            summarized = state["clusters"].get(str(c), 0)
+            if not summarized or sizes[c] - summarized >= self.stale_fraction * summarized:
+                stale.append(c)
+            elif new_from < n and np.any(assign[new_from:] == c):
+                grown.append(c)
+
+        if stale:
+            print(f"📝 Summarizing {len(stale)} clusters...")
+        summarized_count = 0
+        for batch_start in range(0, len(stale), 32):
+            batch = stale[batch_start:batch_start + 32]
+            rows = []
+            for c in batch:
+                members = np.flatnonzero(assign == c)
+                # Most central members first: what the summary should cover
+                scores = np.asarray(self.store.matrix[members]) @ centroids[c]
+                central = members[np.argsort(-scores)[:self.max_members]]
+                contents = neo4j.get_propositions([ids[i] for i in central])
+                texts = [contents[ids[i]]['content'] for i in central if ids[i] in contents]
+                if not texts:
+                    continue
+                rows.append({
+                    "id": f"summary_{version}_{c}",
+                    "cluster": c,
+                    "version": version,
+                    "content": summarize(texts),
+                    "size": int(sizes[c]),
+                    "member_ids": [ids[i] for i in members]
+                })
+
+            for row, embedding in zip(rows, embed([row['content'] for row in rows]) if rows else []):
+                row['embedding'] = embedding
+            if rows:
+                neo4j.upsert_summaries(rows)
+            for row in rows:
+                state["clusters"][str(row['cluster'])] = row['size']
+            summarized_count += len(rows)
+            self._save_state(state, len(assign))
+
+        # Grown but still fresh: only link the new members
+        linked = 0
+        new_labels = assign[new_from:]
+        for c in grown:
+            if str(c) not in state["clusters"]:
+                continue
+            new_members = [ids[new_from + i] for i in np.flatnonzero(new_labels == c)]
+            linked += neo4j.add_summary_members(f"summary_{version}_{c}", new_members, size=int(sizes[c]))
+
+        deleted = neo4j.delete_summaries(keep_version=version)
+        self._save_state(state, len(assign))
+
+        return {
+            "version": version,
+            "clusters": len(state["clusters"]),
+            "summarized": summarized_count,
+            "linked": linked,
+            "deleted": deleted,
+            "retrained": retrained,
+            "seconds": round(time.time() - start, 1)
+        }
+
+    def get_stats(self) -> Dict:
+        """Cluster count, sizes and how far the assignment lags the store."""
+        centroids, assign, state = self._load()
+        if centroids is None:
+            return {"trained": False, "store_rows": len(self.store)}
+        sizes = np.bincount(assign, minlength=len(centroids))
+        return {
+            "trained": True,
+            "version": state["version"],
+            "clusters": len(centroids),
+            "summarized_clusters": len(state["clusters"]),
+            "max_cluster_size": int(sizes.max()) if len(sizes) else 0,
+            "median_cluster_size": float(np.median(sizes)) if len(sizes) else 0.0,
+            "assigned_rows": len(assign),
+            "store_rows": len(self.store),
+            "updated_at": state.get("updated_at")
+        }
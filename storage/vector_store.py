@@ -0,0 +1,404 @@
+"""
+Local Vector Store for Living Knowledge Ecosystem
+
+Append-only, memory-mapped mirror of every proposition embedding:
+- <path>.f32  float32 matrix (N x dims), rows L2-normalized (cosine = dot)
+- <path>.ids  proposition ids, one per line (line i ↔ row i)
+- <path>.lock flock() target serializing writers across processes
+
+Neo4j = Source of truth (graph, vector index)
+Local store = Offline batch analytics (edge rebuilds, clustering, dedup)
+              without pulling embeddings over Bolt
+"""
+
+import os
+import fcntl
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Dict, Optional, Iterable
+
+import numpy as np
+
+
+class LocalVectorStore:
+    """Memory-mapped float32 embedding matrix with an id map."""
+
+    def __init__(self, path: str = "data/proposition_vectors", dimensions: int = 1536, block_rows: int = 65536):
+        """
+        Open (or create) a local vector store.
+
+        Args:
+            path: File prefix (".f32" and ".ids" are appended)
+            dimensions: Embedding dimensionality
+            block_rows: Rows scored per block in knn() (peak memory bound)
+        """
+        base = Path(path)
+        base.parent.mkdir(parents=True, exist_ok=True)
+
+        self.path = str(base)
+        self.dimensions = dimensions
+        self.block_rows = block_rows
+        self.matrix_path = f"{self.path}.f32"
+        self.ids_path = f"{self.path}.ids"
+        self.lock_path = f"{self.path}.lock"
+
+        self._lock = threading.Lock()
+        self._ids: List[str] = []
+        self._id_to_row: Dict[str, int] = {}
+        self._matrix = None
+        self._loaded_sizes = None
+
+        with self._file_lock():
+            self._repair()
+        self.refresh()
+
+    # =========================================================================
+    # LOADING
+    # =========================================================================
+
+    def refresh(self):
+        """
+        Reload the id map if the files changed on disk (e.g. another process
+        appended or a rebuild replaced them).
+
+        Read-only: an append in flight (vectors written, ids not yet) is
+        hidden by trimming to the shorter of the two in memory. Files are
+        only repaired by writers, under the file lock (see _repair).
+        """
+        with self._lock:
+            sizes = self._file_sizes()
+            if sizes == self._loaded_sizes:
+                return
+
+            ids = self._read_ids()
+            rows = min(len(ids), sizes[0] // (self.dimensions * 4))
+
+            self._ids = ids[:rows]
+            self._id_to_row = {pid: i for i, pid in enumerate(self._ids)}
+            self._matrix = None
+            self._loaded_sizes = sizes
+
+    def _file_sizes(self) -> tuple:
+        return tuple(
+            os.path.getsize(path) if os.path.exists(path) else 0
+            for path in (self.matrix_path, self.ids_path)
+        )
+
+    def _read_ids(self) -> List[str]:
+        """Complete lines of the id file (a partially written last line is skipped)."""
+        if not os.path.exists(self.ids_path):
+            return []
+        with open(self.ids_path, "r", encoding="utf-8") as f:
+            text = f.read()
+        return text[:text.rfind("\n") + 1].splitlines()
+
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive lock on <path>.lock, held by writers across processes."""
+        with open(self.lock_path, "a") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _repair(self):
+        """
+        Trim both files to their common row count (crash recovery).
+
+        Caller holds the file lock, so a mismatch here is a torn append
+        from a writer that died, never one still in progress.
+        """
+        matrix_bytes = os.path.getsize(self.matrix_path) if os.path.exists(self.matrix_path) else 0
+        text = ""
+        if os.path.exists(self.ids_path):
+            with open(self.ids_path, "r", encoding="utf-8") as f:
+                text = f.read()
+        complete = text.rfind("\n") + 1
+        ids = text[:complete].splitlines()
+        row_bytes = self.dimensions * 4
+        rows = min(len(ids), matrix_bytes // row_bytes)
+
+        if rows * row_bytes != matrix_bytes or rows != len(ids) or complete != len(text):
+            with open(self.matrix_path, "ab") as f:
+                f.truncate(rows * row_bytes)
+            with open(self.ids_path, "w", encoding="utf-8") as f:
+                f.write("".join(f"{pid}\n" for pid in ids[:rows]))
+
+    # =========================================================================
+    # WRITES
+    # =========================================================================
+
+    def append(self, ids: List[str], embeddings: Iterable[List[float]]) -> int:
+        """
+        Append embeddings for new propositions.
+
+        Ids already present are skipped, so replaying a turn is harmless.
+
+        Args:
+            ids: Proposition IDs (same as Neo4j)
+            embeddings: One vector per id
+
+        Returns:
+            Number of rows appended
+        """
+        with self._file_lock():
+            if self._file_sizes() != self._loaded_sizes:
+                self._repair()
+                self.refresh()
+
+            with self._lock:
+                rows = []
+                new_ids = []
+                seen = set()
+                for pid, embedding in zip(ids, embeddings):
+                    if pid in self._id_to_row or pid in seen:
+                        continue
+                    seen.add(pid)
+                    rows.append(embedding)
+                    new_ids.append(pid)
+
+                if not new_ids:
+                    return 0
+
+                block = _normalize(np.asarray(rows, dtype=np.float32).reshape(len(rows), self.dimensions))
+
+                # Vectors first, ids second: a crash in between leaves extra
+                # rows that readers ignore and the next writer trims, never
+                # ids pointing at missing rows
+                with open(self.matrix_path, "ab") as f:
+                    f.write(block.tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+                with open(self.ids_path, "a", encoding="utf-8") as f:
+                    f.write("".join(f"{pid}\n" for pid in new_ids))
+
+                start = len(self._ids)
+                self._ids.extend(new_ids)
+                for offset, pid in enumerate(new_ids):
+                    self._id_to_row[pid] = start + offset
+                self._matrix = None
+                self._loaded_sizes = self._file_sizes()
+
+                return len(new_ids)
+
+    def rebuild_from_neo4j(self, neo4j, batch_size: int = 1000) -> int:
+        """
+        Regenerate the store from the graph (source of truth).
+
+        Writes to temporary files and swaps them in atomically, so readers
+        never observe a half-built store.
+
+        Args:
+            neo4j: Neo4jClient instance
+            batch_size: Embeddings per Bolt round trip
+
+        Returns:
+            Number of rows written
+        """
+        return self._rebuild(
+            ([row['id'] for row in batch], np.asarray([row['embedding'] for row in batch], dtype=np.float32))
+            for batch in neo4j.iter_embeddings(batch_size=batch_size)
+        )
+
+    def rebuild_from_archive(self, archive, batch_size: int = 10000, model: Optional[str] = None) -> int:
+        """
+        Regenerate the store from embeddings persisted in the SQLite archive.
+
+        No Neo4j round trips and no re-embedding: batches come straight
+        from ArchiveDB.iter_embedding_batches() as float32 matrices.
+
+        Args:
+            archive: ArchiveDB instance
+            batch_size: Rows per archive batch
+            model: Only embeddings from this model (None = any)
+
+        Returns:
+            Number of rows written
+        """
+        return self._rebuild(archive.iter_embedding_batches(batch_size=batch_size, model=model))
+
+    def _rebuild(self, batches) -> int:
+        """Write (ids, matrix) batches to tmp files and swap them in."""
+        tmp_matrix = f"{self.matrix_path}.tmp"
+        tmp_ids = f"{self.ids_path}.tmp"
+        count = 0
+
+        with open(tmp_matrix, "wb") as fm, open(tmp_ids, "w", encoding="utf-8") as fi:
+            for ids, block in batches:
+                if len(ids) and block.shape[1] != self.dimensions:
+                    fm.close()
+                    fi.close()
+                    os.remove(tmp_matrix)
+                    os.remove(tmp_ids)
+                    raise ValueError(
+                        f"Embedding dim {block.shape[1]} != store dim {self.dimensions} "
+                        f"(mixed models in the source? rebuild with model=...)"
+                    )
+                fm.write(_normalize(block).tobytes())
+                fi.write("".join(f"{pid}\n" for pid in ids))
+                count += len(ids)
+            fm.flush()
+            os.fsync(fm.fileno())
+
+        with self._file_lock(), self._lock:
+            os.replace(tmp_matrix, self.matrix_path)
+            os.replace(tmp_ids, self.ids_path)
+            self._loaded_sizes = None
+
+        self.refresh()
+        return count
+
+    # =========================================================================
+    # READS
+    # =========================================================================
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, proposition_id: str) -> bool:
+        return proposition_id in self._id_to_row
+
+    @property
+    def ids(self) -> List[str]:
+        """Proposition ids in row order."""
+        return self._ids
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """
+        Zero-copy read-only view of all embeddings (N x dims, float32).
+
+        Backed by np.memmap: pages are loaded lazily by the OS, so batch
+        analytics over millions of rows never copy the file into RAM.
+        """
+        self.refresh()
+        if self._matrix is None:
+            if not self._ids:
+                self._matrix = np.empty((0, self.dimensions), dtype=np.float32)
+            else:
+                self._matrix = np.memmap(
+                    self.matrix_path,
+                    dtype=np.float32,
+                    mode="r",
+                    shape=(len(self._ids), self.dimensions)
+                )
+        return self._matrix
+
+    def row_of(self, proposition_id: str) -> Optional[int]:
+        """Row index of a proposition (None if not mirrored)."""
+        return self._id_to_row.get(proposition_id)
+
+    def get(self, proposition_id: str) -> Optional[np.ndarray]:
+        """Normalized embedding of a proposition (None if not mirrored)."""
+        row = self.row_of(proposition_id)
+        return None if row is None else self.matrix[row]
+
+    def knn(
+        self,
+        query_embedding: List[float],
+        k: int = 10,
+        min_similarity: float = 0.0,
+        block_rows: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Exact (brute-force) cosine kNN, bypassing the database.
+
+        Scores the matrix in blocks of `block_rows` so peak memory stays
+        bounded regardless of store size.
+
+        Args:
+            query_embedding: Query vector
+            k: Number of results
+            min_similarity: Minimum cosine similarity threshold
+            block_rows: Rows scored per block (default: self.block_rows)
+
+        Returns:
+            List of {"id", "similarity"} sorted by similarity (desc),
+            same shape as Neo4jClient.vector_search
+        """
+        matrix = self.matrix
+        if len(matrix) == 0 or k <= 0:
+            return []
+
+        query = _normalize(np.asarray(query_embedding, dtype=np.float32).reshape(1, -1))[0]
+        block_rows = block_rows or self.block_rows
+
+        best_rows = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+
+        for start in range(0, len(matrix), block_rows):
+            scores = matrix[start:start + block_rows] @ query
+            top = _top_k_indices(scores, k)
+            best_rows = np.concatenate([best_rows, top + start])
+            best_scores = np.concatenate([best_scores, scores[top]])
+
+            if len(best_rows) > k:
+                keep = _top_k_indices(best_scores, k)
+                best_rows, best_scores = best_rows[keep], best_scores[keep]
+
+        order = np.argsort(-best_scores)
+        return [
+            {"id": self._ids[best_rows[i]], "similarity": float(best_scores[i])}
+            for i in order
+            if best_scores[i] >= min_similarity
+        ]
+
+    def get_stats(self) -> Dict:
+        """Get store statistics."""
+        return {
+            "rows": len(self._ids),
+            "dimensions": self.dimensions,
+            "size_mb": round(len(self._ids) * self.dimensions * 4 / 1e6, 2)
+        }
+
+
+# =============================================================================
+# Utility Functions
+# =============================================================================
+
+def _normalize(block: np.ndarray) -> np.ndarray:
+    """L2-normalize rows (zero rows stay zero)."""
+    norms = np.linalg.norm(block, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (block / norms).astype(np.float32, copy=False)
+
+
+def _top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest scores (unordered)."""
+    if len(scores) <= k:
+        return np.arange(len(scores))
+    return np.argpartition(-scores, k - 1)[:k]
+
+
+# =============================================================================
+# Example Usage
+# =============================================================================
+
+if __name__ == "__main__":
+    # Rebuild the local mirror from Neo4j (or the SQLite archive)
+    import sys
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from storage.neo4j_client import Neo4jClient
+    from storage.archive_segments import SegmentedArchiveDB
+    from config import Neo4jConfig, SQLiteConfig, VectorStoreConfig, EmbeddingConfig
+
+    store = LocalVectorStore(VectorStoreConfig.PATH, EmbeddingConfig.DIMENSIONS, VectorStoreConfig.BLOCK_ROWS)
+
+    if len(sys.argv) > 1 and sys.argv[1] == "rebuild":
+        print("🔄 Rebuilding local vector store from Neo4j...")
+        with Neo4jClient(Neo4jConfig.URI, Neo4jConfig.USER, Neo4jConfig.PASSWORD) as neo4j:
+            count = store.rebuild_from_neo4j(neo4j)
+        print(f"✅ Mirrored {count} embeddings")
+
+    elif len(sys.argv) > 1 and sys.argv[1] == "rebuild-archive":
+        print("🔄 Rebuilding local vector store from the SQLite archive...")
+        archive = SegmentedArchiveDB(SQLiteConfig.DATABASE_PATH, SQLiteConfig.SEGMENTS_DIR)
+        count = store.rebuild_from_archive(archive, model=EmbeddingConfig.MODEL)
+        archive.close()
+        print(f"✅ Mirrored {count} embeddings")
+
+    print(f"📊 Local vector store: {store.get_stats()}")
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Stress test ArchiveDB under concurrent extraction (writer thread + read pool)
+
+Simulates many background extraction threads archiving turns while other
+threads run lineage/stats queries. No Neo4j or API keys needed.
+
+Run: python3 test_archive_concurrency.py   (or via pytest)
+"""
+
+import sys
+import os
+import uuid
+import shutil
+import sqlite3
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from storage.archive_db import ArchiveDB
+
+WRITER_THREADS = 16
+TURNS_PER_THREAD = 50
+PROPS_PER_TURN = 6
+READER_THREADS = 8
+
+
+def _archive_turn(archive, thread_no, turn_no):
+    """Archive one turn exactly like store_propositions does."""
+    msg_id = f"t{thread_no}_msg_{turn_no:03d}"
+    unit_id = f"{msg_id}_su"
+    with archive.transaction():
+        archive.store_messages_many([
+            {"message_id": msg_id, "role": "user", "content": f"message {turn_no}",
+             "timestamp": f"2026-01-01T00:{thread_no:02d}:{turn_no:02d}"}
+        ])
+        archive.store_semantic_units_many([
+            {"unit_id": unit_id, "message_id": msg_id, "content": "su",
+             "metadata": {"type": "fact", "concepts": ["stress"]}}
+        ])
+        prop_ids = [str(uuid.uuid4()) for _ in range(PROPS_PER_TURN)]
+        archive.store_propositions_many([
+            {"proposition_id": pid, "semantic_unit_id": unit_id, "content": f"prop {i}",
+             "metadata": {"type": "fact", "certainty": "high"}}
+            for i, pid in enumerate(prop_ids)
+        ])
+    return prop_ids
+
+
+def test_concurrent_extraction_writes():
+    tmp_dir = tempfile.mkdtemp()
+    archive = ArchiveDB(os.path.join(tmp_dir, "stress.db"))
+    errors = []
+    written = []
+    written_lock = threading.Lock()
+    done = threading.Event()
+
+    def writer(thread_no):
+        try:
+            for turn_no in range(TURNS_PER_THREAD):
+                ids = _archive_turn(archive, thread_no, turn_no)
+                with written_lock:
+                    written.extend(ids)
+            # A failing transaction must leave nothing behind
+            try:
+                with archive.transaction():
+                    archive.store_message(f"t{thread_no}_rolled_back", "user", "x", "2026-01-01")
+                    raise RuntimeError("abort")
+            except RuntimeError:
+                pass
+        except Exception as e:
+            errors.append(e)
+
+    def reader():
+        try:
+            while not done.is_set():
+                with written_lock:
+                    sample = written[-1] if written else None
+                if sample:
+                    # Writes are synchronous: anything already returned must be visible
+                    lineage = archive.get_full_lineage(sample)
+                    assert lineage is not None, f"lineage missing for {sample}"
+                archive.get_stats()
+        except Exception as e:
+            errors.append(e)
+
+    writers = [threading.Thread(target=writer, args=(n,)) for n in range(WRITER_THREADS)]
+    readers = [threading.Thread(target=reader) for _ in range(READER_THREADS)]
+
+    try:
+        for t in readers + writers:
+            t.start()
+        for t in writers:
+            t.join()
+        done.set()
+        for t in readers:
+            t.join()
+
+        assert not errors, f"{len(errors)} errors, first: {errors[0]!r}"
+
+        stats = archive.get_stats()
+        turns = WRITER_THREADS * TURNS_PER_THREAD
+        assert stats["messages"] == turns, stats
+        assert stats["semantic_units"] == turns, stats
+        assert stats["propositions"] == turns * PROPS_PER_TURN, stats
+        assert archive.get_message("t0_rolled_back") is None
+
+        print(f"✅ {turns} turns from {WRITER_THREADS} threads, "
+              f"{READER_THREADS} concurrent readers: {stats}")
+    finally:
+        archive.close()
+        shutil.rmtree(tmp_dir)
+
+
+def test_writer_failure_fails_pending_writes():
+    tmp_dir = tempfile.mkdtemp()
+    archive = ArchiveDB(os.path.join(tmp_dir, "archive.db"))
+    try:
+        # A failing unit is rolled back on its own; the writer keeps going
+        try:
+            archive._submit([lambda conn: conn.execute("INSERT INTO no_such_table VALUES (1)")]).result(timeout=10)
+            raise AssertionError("bad write must raise")
+        except sqlite3.OperationalError:
+            pass
+        _archive_turn(archive, 0, 0)
+
+        # An error that escapes the rollback (connection gone) kills the writer
+        gate = threading.Event()
+        first = archive._submit([lambda conn: gate.wait(10), lambda conn: conn.close()])
+        queued = [archive._submit([lambda conn: None]) for _ in range(5)]
+        gate.set()
+
+        for future in [first] + queued:
+            try:
+                future.result(timeout=10)
+                raise AssertionError("pending writes must fail, not hang")
+            except sqlite3.ProgrammingError:
+                pass
+
+        try:
+            _archive_turn(archive, 0, 1)
+            raise AssertionError("writes after a writer failure must raise")
+        except RuntimeError:
+            pass
+
+        # Reads still work; shared() hands out a fresh instance
+        assert archive.get_message("t0_msg_000") is not None
+        assert ArchiveDB.shared(archive.db_path) is not archive
+        ArchiveDB.shared(archive.db_path).close()
+        print("✅ Writer failure fails pending writes instead of hanging")
+    finally:
+        archive.close()
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    print("="*60)
+    print("🔬 ARCHIVE CONCURRENCY STRESS TEST")
+    print("="*60)
+    test_concurrent_extraction_writes()
+    test_writer_failure_fails_pending_writes()
@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+"""Offline tests for the SQLite archive storage layer
+
+Embedding batches, batched writes and keyset streams, compression
+round trips, FTS search, monthly segments and the outbox projector. No Neo4j or API keys needed.
+
+Run: python3 test_archive_storage.py   (or via pytest)
+"""
+
+import sys
+import os
+import json
+import shutil
+import sqlite3
+import tempfile
+from datetime import datetime
+
+import numpy as np
+from neo4j.exceptions import ServiceUnavailable
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from storage.archive_db import ArchiveDB
+from storage.archive_segments import SegmentedArchiveDB
+from storage.projector import OutboxProjector
+from storage.compression import TextCodec, zstandard
+from storage.vector_store import LocalVectorStore
+
+
+def _store_props(archive, rows):
+    """rows: (proposition_id, embedding, model)"""
+    archive.store_propositions_many([
+        {"proposition_id": pid, "semantic_unit_id": "su", "content": f"content {pid}",
+         "metadata": {"type": "fact"}, "embedding": embedding, "embedding_model": model}
+        for pid, embedding, model in rows
+    ])
+
+
+def _store_turn(archive, message_id, timestamp, text, embedding):
+    """One message → semantic unit → proposition lineage."""
+    archive.store_messages_many([
+        {"message_id": message_id, "role": "user", "content": f"message {text}", "timestamp": timestamp}
+    ])
+    archive.store_semantic_units_many([
+        {"unit_id": f"su_{message_id}", "message_id": message_id, "content": f"unit {text}",
+         "metadata": {"type": "fact"}}
+    ])
+    archive.store_propositions_many([
+        {"proposition_id": f"p_{message_id}", "semantic_unit_id": f"su_{message_id}",
+         "content": f"proposition {text}", "metadata": {"type": "fact", "message_id": message_id},
+         "embedding": embedding, "embedding_model": "small"}
+    ])
+
+
+def test_embedding_batches_keep_mixed_dims():
+    tmp_dir = tempfile.mkdtemp()
+    archive = ArchiveDB(os.path.join(tmp_dir, "archive.db"))
+    try:
+        rng = np.random.default_rng(0)
+        rows = [(f"a{i}", rng.normal(size=8), "small") for i in range(5)]
+        rows += [(f"b{i}", rng.normal(size=4), "tiny") for i in range(3)]
+        rows += [(f"c{i}", rng.normal(size=8), "small") for i in range(4)]
+        _store_props(archive, rows)
+
+        batches = list(archive.iter_embedding_batches(batch_size=100))
+        seen = [pid for ids, _ in batches for pid in ids]
+        assert seen == [pid for pid, _, _ in rows], "rows of another dim must not be dropped"
+        assert [m.shape[1] for _, m in batches] == [8, 4, 8]
+        for ids, matrix in batches:
+            for pid, row in zip(ids, matrix):
+                expected = dict((p, e) for p, e, _ in rows)[pid]
+                assert np.allclose(row, expected, atol=1e-6)
+
+        # Small batch size: same rows, still no loss
+        small = [pid for ids, _ in archive.iter_embedding_batches(batch_size=2) for pid in ids]
+        assert small == seen
+
+        # model filter: one dim only
+        filtered = [pid for ids, _ in archive.iter_embedding_batches(model="small") for pid in ids]
+        assert filtered == [pid for pid, _, model in rows if model == "small"]
+
+        # A store rebuilt from a mixed archive fails loudly instead of corrupting rows
+        store = LocalVectorStore(os.path.join(tmp_dir, "vectors"), dimensions=8)
+        assert store.rebuild_from_archive(archive, model="small") == 9
+        try:
+            store.rebuild_from_archive(archive)
+            raise AssertionError("mixed dims must raise")
+        except ValueError:
+            pass
+        assert len(store) == 9
+        print("✅ Mixed-dimension embedding batches")
+    finally:
+        archive.close()
+        shutil.rmtree(tmp_dir)
+
+
+def _metadata(i):
+    """Realistic proposition metadata JSON: same keys every row."""
+    return {"type": "fact", "certainty": "high", "concepts": [f"concept{i % 7}", "postgres"],
+            "speaker": "user", "message_id": f"m{i}", "session_id": "s1", "seq": i,
+            "block_metadata": {"decision": {"choice": f"option {i % 3}", "reason": "latency budget"}}}
+
+
+def test_keyset_streams_resume_at_any_cursor():
+    tmp_dir = tempfile.mkdtemp()
+    archive = ArchiveDB(os.path.join(tmp_dir, "archive.db"))
+    try:
+        assert list(archive.iter_messages()) == [] and list(archive.iter_propositions(chunk_size=1)) == []
+
+        # Timestamp ties (m3/m4/m5) are ordered by id
+        timestamps = ["2024-01-01T10:00:00", "2024-01-01T09:00:00", "2024-01-02T10:00:00",
+                      "2024-01-03T10:00:00", "2024-01-03T10:00:00", "2024-01-03T10:00:00",
+                      "2024-01-04T10:00:00"]
+        archive.store_messages_many([
+            {"message_id": f"m{i}", "role": "user", "content": f"message {i}", "timestamp": ts}
+            for i, ts in enumerate(timestamps)
+        ])
+        expected = ["m1", "m0", "m2", "m3", "m4", "m5", "m6"]
+
+        # Chunk smaller than, dividing, equal to and larger than the table
+        for chunk_size in (1, 3, 7, 100):
+            assert [m['id'] for m in archive.iter_messages(chunk_size=chunk_size)] == expected
+
+        # Resume after every row, including inside the tie and after the last row
+        full = list(archive.iter_messages(chunk_size=2))
+        for i, row in enumerate(full):
+            resumed = archive.iter_messages(chunk_size=2, after=(row['timestamp'], row['id']))
+            assert [m['id'] for m in resumed] == expected[i + 1:]
+        assert full[3]['content'] == "message 3", "rows are decoded"
+
+        # One batch shares created_at: propositions page on the id alone
+        _store_props(archive, [(f"p{i:02d}", None, None) for i in range(5)])
+        props = list(archive.iter_propositions(chunk_size=2))
+        assert [p['proposition_id'] for p in props] == [f"p{i:02d}" for i in range(5)]
+        cursor = (props[1]['created_at'], props[1]['proposition_id'])
+        assert [p['proposition_id'] for p in archive.iter_propositions(chunk_size=2, after=cursor)] == ["p02", "p03", "p04"]
+        print("✅ Keyset streams resume at any cursor")
+    finally:
+        archive.close()
+        shutil.rmtree(tmp_dir)
+
+
+def test_store_many_batches_are_atomic():
+    tmp_dir = tempfile.mkdtemp()
+    archive = ArchiveDB(os.path.join(tmp_dir, "archive.db"))
+    empty = {"messages": 0, "semantic_units": 0, "propositions": 0}
+
+    def counts():
+        stats = archive.get_stats()
+        return {key: stats[key] for key in empty}
+
+    try:
+        # Empty batches are no-ops, inside a transaction or not
+        archive.store_messages_many([])
+        archive.store_semantic_units_many([])
+        archive.store_propositions_many([])
+        with archive.transaction():
+            archive.store_propositions_many([])
+        assert counts() == empty
+
+        # A row the database rejects rolls back the whole transaction
+        try:
+            with archive.transaction():
+                _store_turn(archive, "m1", "2024-01-01T10:00:00", "ok", [1.0, 0.0])
+                archive.store_propositions_many([
+                    {"proposition_id": "p_good", "semantic_unit_id": "su_m1", "content": "good",
+                     "metadata": {"type": "fact"}},
+                    {"proposition_id": "p_bad", "semantic_unit_id": "su_m1", "content": None,
+                     "metadata": {"type": "fact"}}
+                ])
+            raise AssertionError("NULL content must fail the commit")
+        except sqlite3.IntegrityError:
+            pass
+        assert counts() == empty and archive.get_proposition("p_good") is None
+
+        # An exception before the commit discards the buffered writes
+        try:
+            with archive.transaction():
+                _store_turn(archive, "m2", "2024-01-01T11:00:00", "ok", [1.0, 0.0])
+                raise ValueError("extraction failed")
+        except ValueError:
+            pass
+        assert counts() == empty
+
+        # A failed unit does not take the writer down
+        _store_turn(archive, "m3", "2024-01-01T12:00:00", "after", [0.0, 1.0])
+        assert counts() == {"messages": 1, "semantic_units": 1, "propositions": 1}
+        assert archive.get_full_lineage("p_m3")['message']['content'] == "message after"
+        print("✅ store_*_many batches are atomic")
+    finally:
+        archive.close()
+        shutil.rmtree(tmp_dir)
+
+
+def test_codec_round_trips():
+    long_text = "The migration moved every JSONB column to a typed table. " * 20
+    for algorithm in ("zstd", "zlib", "none"):
+        codec = TextCodec(algorithm, min_bytes=256)
+        packed = codec.pack(long_text)
+        if algorithm == "none":
+            assert packed == long_text
+        else:
+            assert isinstance(packed, bytes) and len(packed) < len(long_text)
+        assert codec.unpack(packed) == long_text
+        assert TextCodec.raw_size(packed) == len(long_text.encode("utf-8"))
+
+    codec = TextCodec("zstd", min_bytes=256)
+    assert codec.pack("short") == "short", "short values stay plain TEXT"
+    assert codec.pack(None) is None and codec.unpack(None) is None
+    unicode_text = "Entscheidung: Größe → 大きい ✅ " * 40
+    assert codec.unpack(codec.pack(unicode_text)) == unicode_text
+
+    # Reads decode any codec, whatever the reader writes with
+    assert TextCodec("none").unpack(TextCodec("zlib").pack(long_text)) == long_text
+
+    if zstandard is not None:
+        samples = [json.dumps(_metadata(i)).encode("utf-8") for i in range(500)]
+        data = TextCodec.train_dictionary(samples, dict_size=4096)
+        writer = TextCodec("zstd", min_bytes=256, dict_min_bytes=64)
+        writer.add_dictionary(7, data, active=True)
+
+        text = json.dumps(_metadata(1000))
+        packed = writer.pack(text, dictionary=True)
+        assert isinstance(packed, bytes) and len(packed) < len(text) / 2
+        plain = writer.pack(text)
+        assert len(packed) < (len(plain) if isinstance(plain, bytes) else len(text)), "dictionary beats plain zstd"
+
+        # Another process loads the dictionary lazily by id
+        reader = TextCodec("zstd", dictionary_loader=lambda dict_id: data if dict_id == 7 else None)
+        assert reader.unpack(packed) == text
+        try:
+            TextCodec("zstd").unpack(packed)
+            raise AssertionError("unknown dictionary must raise")
+        except KeyError:
+            pass
+    print("✅ Codec round trips")
+
+
+def test_archive_compression_and_dictionaries():
+    tmp_dir = tempfile.mkdtemp()
+    path = os.path.join(tmp_dir, "archive.db")
+    try:
+        long_message = "We decided to keep Postgres and drop Mongo because of joins. " * 10
+        archive = ArchiveDB(path, compression="none")
+        _store_turn(archive, "m0", "2026-01-01T10:00:00", "first", [1.0, 0.0])
+        archive.store_messages_many([
+            {"message_id": "long", "role": "user", "content": long_message, "timestamp": "2026-01-01T11:00:00"}
+        ])
+        archive.store_propositions_many([
+            {"proposition_id": f"p{i}", "semantic_unit_id": "su_m0", "content": f"fact {i}", "metadata": _metadata(i)}
+            for i in range(200)
+        ])
+        assert archive.get_compression_stats()['total']['ratio'] == 1.0
+        archive.close()
+
+        # Migration of plain rows, then a trained dictionary
+        archive = ArchiveDB(path, compression="zstd")
+        report = archive.compress_existing()
+        assert report["messages.content"] >= 1
+        assert archive.get_message("long")['content'] == long_message
+        if zstandard is not None:
+            dict_id = archive.train_compression_dictionary(dict_size=4096)
+            archive.compress_existing(recompress=True)
+            stats = archive.get_compression_stats()
+            assert stats["propositions_archive.metadata"]['compressed_rows'] >= 200
+            assert stats['total']['ratio'] > 1.5
+            # New writes use the dictionary; a fresh instance reads them back
+            archive.store_propositions_many([
+                {"proposition_id": "new", "semantic_unit_id": "su_m0", "content": "new fact", "metadata": _metadata(5000)}
+            ])
+            archive.close()
+            archive = ArchiveDB(path)
+            assert archive._codec.active_dict_id == dict_id
+        assert archive.get_proposition("p42")['metadata'] == _metadata(42)
+        assert archive.get_full_lineage("p_m0")['message']['content'] == "message first"
+
+        # FTS still matches compressed message content
+        assert [h['message_id'] for h in archive.search("Mongo joins", kinds=("message",))] == ["long"]
+        archive.close()
+        print("✅ Archive compression + dictionaries")
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_fts_search():
+    tmp_dir = tempfile.mkdtemp()
+    archive = ArchiveDB(os.path.join(tmp_dir, "archive.db"))
+    try:
+        _store_turn(archive, "m1", "2026-01-01T10:00:00", "see https://example.com/docs/v2 for setup", [1.0, 0.0])
+        _store_turn(archive, "m2", "2026-01-01T11:00:00", "error E1234 in config.yaml", [0.0, 1.0])
+        _store_turn(archive, "m3", "2026-01-01T12:00:00", "postgres replication lag alert", [1.0, 1.0])
+
+        def found(query, **kwargs):
+            return {h['proposition_id'] for h in archive.search(query, kinds=("proposition",), **kwargs)}
+
+        # Tokens are quoted: URLs, file names and codes match literally
+        assert found("https://example.com/docs/v2") == {"p_m1"}
+        assert found("config.yaml E1234") == {"p_m2"}
+        assert found("postgres missing") == set(), "implicit AND"
+        assert found('"quoted" (parens) AND -minus') == set(), "syntax characters do not raise"
+        assert found("") == set()
+
+        # raw=True: FTS5 syntax
+        assert found("postgres OR config", raw=True) == {"p_m2", "p_m3"}
+        assert found("repl*", raw=True) == {"p_m3"}
+
+        # All three levels, with lineage ids, best first
+        hits = archive.search("replication")
+        assert {h['kind'] for h in hits} == {"proposition", "semantic_unit", "message"}
+        assert all(h['message_id'] == "m3" or h['kind'] != "message" for h in hits)
+        assert [h['rank'] for h in hits] == sorted(h['rank'] for h in hits)
+        assert len(archive.search("replication", limit=2)) == 2
+
+        # Rewritten rows are re-indexed (INSERT OR REPLACE)
+        archive.store_propositions_many([
+            {"proposition_id": "p_m3", "semantic_unit_id": "su_m3", "content": "mysql failover",
+             "metadata": {"type": "fact"}}
+        ])
+        assert found("replication") == set() and found("failover") == {"p_m3"}
+        print("✅ FTS search")
+    finally:
+        archive.close()
+        shutil.rmtree(tmp_dir)
+
+
+def test_segmented_reads_see_sealed_months():
+    tmp_dir = tempfile.mkdtemp()
+    archive = SegmentedArchiveDB(
+        os.path.join(tmp_dir, "archive.db"),
+        segments_dir=os.path.join(tmp_dir, "segments")
+    )
+    try:
+        now = datetime.now().isoformat()
+        _store_turn(archive, "old1", "2024-01-05T10:00:00", "postgres jsonb migration", [1.0, 0.0, 0.0, 0.0])
+        _store_turn(archive, "old2", "2024-02-07T10:00:00", "redis eviction policy", [0.0, 1.0, 0.0, 0.0])
+        _store_turn(archive, "new1", now, "postgres vacuum tuning", [0.0, 0.0, 1.0, 0.0])
+
+        sealed = archive.rollover(keep_periods=1)
+        assert [s['period'] for s in sealed] == ["2024-01", "2024-02"]
+        assert archive.get_periods() == [now[:7]], "sealed months leave the hot archive"
+
+        # Graph rows (projector), lineage and id lookups route into segments
+        rows = archive.get_graph_rows(["p_old1", "p_old2", "p_new1", "missing"])
+        assert set(rows) == {"p_old1", "p_old2", "p_new1"}
+        assert rows["p_old1"]['rowid'][0] == "2024-01" and rows["p_new1"]['rowid'][0] == "hot"
+        assert np.allclose(rows["p_old2"]['embedding'], [0.0, 1.0, 0.0, 0.0])
+
+        lineage = archive.get_lineage_many(["p_old1", "p_new1"])
+        assert lineage["p_old1"]['message']['content'] == "message postgres jsonb migration"
+        assert archive.get_full_lineage("p_old2")['semantic_unit']['content'] == "unit redis eviction policy"
+        assert archive.get_message("old2")['role'] == "user"
+
+        # FTS merges hot + sealed hits
+        hits = archive.search("postgres", kinds=("proposition",))
+        assert {h['proposition_id'] for h in hits} == {"p_old1", "p_new1"}
+
+        # Streams: segments oldest → newest, then hot
+        assert [pid for ids, _ in archive.iter_embedding_batches() for pid in ids] == ["p_old1", "p_old2", "p_new1"]
+        assert archive.get_stats()['propositions'] == 3
+        try:
+            archive.seal_period("2024-01", archive.segments_dir)
+            raise AssertionError("sealing twice must raise")
+        except ValueError:
+            pass
+        print("✅ Segmented reads see sealed months")
+    finally:
+        archive.close()
+        shutil.rmtree(tmp_dir)
+
+
+def test_seal_aborts_on_rows_written_during_copy():
+    tmp_dir = tempfile.mkdtemp()
+    archive = SegmentedArchiveDB(
+        os.path.join(tmp_dir, "archive.db"),
+        segments_dir=os.path.join(tmp_dir, "segments")
+    )
+    compress_existing = ArchiveDB.compress_existing
+    try:
+        _store_turn(archive, "m1", "2024-01-05T10:00:00", "kafka partition rebalance", [1.0, 0.0])
+
+        # A late turn of the month lands between the copy and the hand-over
+        def late_write(segment):
+            ArchiveDB.compress_existing = compress_existing
+            _store_turn(archive, "m2", "2024-01-20T10:00:00", "kafka consumer lag", [0.0, 1.0])
+            return compress_existing(segment)
+
+        ArchiveDB.compress_existing = late_write
+        try:
+            archive.seal_period("2024-01", archive.segments_dir)
+            raise AssertionError("rows written during sealing must abort the hand-over")
+        except RuntimeError as e:
+            assert "changed while sealing" in str(e)
+        finally:
+            ArchiveDB.compress_existing = compress_existing
+
+        assert archive.list_segments() == []
+        assert archive.get_full_lineage("p_m2")['message']['content'] == "message kafka consumer lag"
+        assert archive.get_stats()['propositions'] == 2, "nothing deleted"
+
+        # Retrying seals both turns
+        sealed = archive.seal_period("2024-01", archive.segments_dir)
+        assert (sealed['messages'], sealed['propositions']) == (2, 2)
+        assert archive.get_periods() == []
+        assert set(archive.get_graph_rows(["p_m1", "p_m2"])) == {"p_m1", "p_m2"}
+        print("✅ Sealing aborts on rows written during the copy")
+    finally:
+        ArchiveDB.compress_existing = compress_existing
+        archive.close()
+        shutil.rmtree(tmp_dir)
+
+
+class _FakeNeo4j:
+    """Records projected nodes; fails on `poison` ids, or while `down`."""
+
+    def __init__(self, poison=()):
+        self.poison = set(poison)
+        self.down = 0
+        self.nodes = []
+
+    def create_propositions_batch(self, rows):
+        if self.down:
+            self.down -= 1
+            raise ServiceUnavailable("neo4j down")
+        bad = [row['id'] for row in rows if row['id'] in self.poison]
+        if bad:
+            raise ValueError(f"cannot project {bad}")
+        self.nodes.extend(row['id'] for row in rows)
+
+    def create_temporal_edges_batch(self, edges):
+        pass
+
+    def link_turn(self, *args):
+        pass
+
+    def link_semantic_neighbors(self, *args, **kwargs):
+        pass
+
+
+def test_outbox_dead_letters_poison_entry():
+    tmp_dir = tempfile.mkdtemp()
+    archive = ArchiveDB(os.path.join(tmp_dir, "archive.db"))
+    try:
+        ids = [f"p{i:02d}" for i in range(40)]
+        _store_props(archive, [(pid, [1.0, 0.0, 0.0, 0.0], "small") for pid in ids])
+        archive.enqueue_outbox([{"kind": "node", "payload": {"proposition_id": pid}} for pid in ids])
+
+        neo4j = _FakeNeo4j(poison={"p13"})
+        neo4j.down = 3  # Outage first: never counted against the entries
+        projector = OutboxProjector(archive, neo4j, k=5, min_similarity=0.5, max_degree=10,
+                                    neighbor_search=lambda *args: [], batch_size=16, max_attempts=4)
+
+        failures = 0
+        while True:
+            try:
+                if not projector.run_once():
+                    break
+            except (ServiceUnavailable, ValueError):
+                failures += 1
+                assert failures < 50, "poison entry must not block the outbox forever"
+
+        assert neo4j.nodes == [pid for pid in ids if pid != "p13"], "order kept, everything else applied"
+        stats = projector.get_stats()
+        assert stats['pending'] == 0 and stats['dead_letters'] == 1 and stats['dead_lettered'] == 1
+        dead = archive.fetch_dead_outbox()
+        assert [e['payload']['proposition_id'] for e in dead] == ["p13"]
+        assert dead[0]['attempts'] == 4 and "cannot project" in dead[0]['last_error']
+
+        # Requeued after the cause is fixed
+        neo4j.poison.clear()
+        assert archive.requeue_dead_outbox() == 1
+        assert projector.drain() and neo4j.nodes[-1] == "p13"
+        assert archive.get_outbox_stats()['dead_letters'] == 0
+        print("✅ Poison outbox entry dead-lettered, the rest projected")
+    finally:
+        archive.close()
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    print("="*60)
+    print("🔬 ARCHIVE STORAGE TESTS")
+    print("="*60)
+    test_embedding_batches_keep_mixed_dims()
+    test_keyset_streams_resume_at_any_cursor()
+    test_store_many_batches_are_atomic()
+    test_codec_round_trips()
+    test_archive_compression_and_dictionaries()
+    test_fts_search()
+    test_segmented_reads_see_sealed_months()
+    test_seal_aborts_on_rows_written_during_copy()
+    test_outbox_dead_letters_poison_entry()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Offline tests for storage/cache.py (LRU, TTL, write generations)
+
+No Neo4j or API keys needed.
+
+Run: python3 test_cache.py   (or via pytest)
+"""
+
+import sys
+import os
+import time
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from storage.cache import LRUCache
+
+
+def test_lru_eviction_and_stats():
+    cache = LRUCache(maxsize=3)
+    for key in "abc":
+        cache.put(key, key.upper())
+    assert cache.get("a") == "A"  # a is now most recent
+    cache.put("d", "D")
+    assert cache.get("b") is None, "least recently used goes first"
+    assert [cache.get(key) for key in "acd"] == ["A", "C", "D"]
+    assert cache.get("missing", default=0) == 0
+
+    stats = cache.get_stats()
+    assert stats['size'] == 3 and stats['hits'] == 4 and stats['misses'] == 2
+    assert stats['hit_rate'] == round(4 / 6, 3)
+
+    cache.invalidate(["a", "zzz"])
+    cache.invalidate_where(lambda key, value: value == "C")
+    assert len(cache) == 1 and cache.get("d") == "D"
+
+    disabled = LRUCache(maxsize=0)
+    disabled.put("a", 1)
+    assert disabled.get("a") is None and len(disabled) == 0
+    print("✅ LRU eviction + stats")
+
+
+def test_ttl_expiry():
+    cache = LRUCache(maxsize=10, ttl=0.2)
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    time.sleep(0.25)
+    assert cache.get("a") is None
+    assert cache.get_stats()['expired'] == 1 and len(cache) == 0
+
+    # put() refreshes the deadline
+    cache.put("b", 2)
+    time.sleep(0.12)
+    cache.put("b", 3)
+    time.sleep(0.12)
+    assert cache.get("b") == 3
+    print("✅ TTL expiry")
+
+
+def test_generation_drops_racing_puts():
+    cache = LRUCache()
+    generation = cache.generation  # Reader captures it before querying
+    cache.bump()                   # A write commits meanwhile
+    cache.put("row", "stale", generation=generation)
+    assert cache.get("row") is None, "value read before the commit is not cached"
+
+    cache.put("row", "fresh", generation=cache.generation)
+    assert cache.get("row") == "fresh"
+
+    generation = cache.generation
+    cache.clear()
+    assert len(cache) == 0 and cache.generation == generation + 1
+    print("✅ Generation drops racing puts")
+
+
+def test_concurrent_access():
+    cache = LRUCache(maxsize=64)
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(2000):
+                key = (n * 7 + i) % 100
+                cache.put(key, key)
+                value = cache.get(key)
+                assert value is None or value == key
+                if i % 100 == 0:
+                    cache.bump()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors, errors[0]
+    assert len(cache) <= 64
+    print("✅ Concurrent access")
+
+
+if __name__ == "__main__":
+    print("="*60)
+    print("🔬 CACHE TESTS")
+    print("="*60)
+    test_lru_eviction_and_stats()
+    test_ttl_expiry()
+    test_generation_drops_racing_puts()
+    test_concurrent_access()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""Offline tests for the in-memory PPR graph snapshot (storage/ppr_graph.py)
+
+Full export, delta merge, eviction-triggered re-export and save/load,
+against a fake Neo4jClient. No Neo4j or API keys needed.
+
+Run: python3 test_graph_snapshot.py   (or via pytest)
+"""
+
+import sys
+import os
+import time
+import shutil
+import tempfile
+from datetime import datetime
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from storage.neo4j_client import Neo4jClient
+from storage.ppr_graph import GraphSnapshot
+
+
+class _FakeGraph:
+    """The three Neo4jClient calls GraphSnapshot makes, over a dict of edges."""
+
+    def __init__(self):
+        self.nodes = set()
+        self.edges = {}  # (from_id, to_id, type) -> (weight, created_at)
+        self.evicted_at = None
+
+    def add(self, from_id, to_id, rel_type="COHERENT", weight=None):
+        self.nodes |= {from_id, to_id}
+        self.edges[(from_id, to_id, rel_type)] = (weight, datetime.now().isoformat())
+        time.sleep(0.001)  # Distinct created_at values
+
+    def evict(self, from_id, to_id, stamp=True):
+        del self.edges[(from_id, to_id, "COHERENT")]
+        if stamp:
+            self.evicted_at = datetime.now().isoformat()
+
+    def iter_adjacency(self, batch_size=5000):
+        ids = sorted(self.nodes)
+        for start in range(0, len(ids), batch_size):
+            page = ids[start:start + batch_size]
+            yield page, [(a, b, t, w) for (a, b, t), (w, _) in self.edges.items() if a in page]
+
+    def iter_edges_since(self, since, batch_size=10000):
+        edges = [(a, b, t, w, at) for (a, b, t), (w, at) in self.edges.items() if at > since]
+        for start in range(0, len(edges), batch_size):
+            yield edges[start:start + batch_size]
+
+    def get_edges_evicted_at(self):
+        return self.evicted_at
+
+
+class _FakeSession:
+    """Answers link_semantic_neighbors' query and records the eviction marker."""
+
+    def __init__(self, graph, evicted):
+        self.graph, self.evicted = graph, evicted
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query, params=None):
+        if "GraphMaintenance" in query:
+            self.graph.evicted_at = params['now']
+        return self
+
+    def single(self):
+        return {"evicted": self.evicted, "touched": 1}
+
+
+class _FakeDriver:
+    def __init__(self, graph, evicted):
+        self.graph, self.evicted = graph, evicted
+
+    def session(self):
+        return _FakeSession(self.graph, self.evicted)
+
+
+def _client(graph, evicted):
+    """Neo4jClient over a fake driver (no connection)."""
+    client = Neo4jClient.__new__(Neo4jClient)
+    client.driver = _FakeDriver(graph, evicted)
+    return client
+
+
+def _dense(snapshot, order):
+    """Adjacency as a dense matrix in a fixed id order (snapshots number nodes differently)."""
+    rows = [snapshot.index[pid] for pid in order]
+    return snapshot.adjacency.toarray()[np.ix_(rows, rows)]
+
+
+def test_delta_merge_matches_full_export():
+    graph = _FakeGraph()
+    graph.add("a", "b", weight=0.9)
+    graph.add("b", "c", weight=0.8)
+    graph.add("a", "b", "NEXT")
+
+    snapshot = GraphSnapshot(next_weight=0.3)
+    assert snapshot.refresh(graph)['kind'] == "full"
+    assert np.isclose(snapshot.adjacency[snapshot.index["a"], snapshot.index["b"]], 0.9 + 0.3)
+
+    # New node, new edge, re-weighted edge
+    time.sleep(0.002)
+    graph.add("c", "d", weight=0.7)
+    graph.add("b", "c", weight=0.5)
+    result = snapshot.refresh(graph)
+    assert result['kind'] == "delta" and result['new_nodes'] == 1 and result['edges'] == 2
+
+    reference = GraphSnapshot(next_weight=0.3)
+    reference.full_export(graph)
+    order = sorted(graph.nodes)
+    assert np.allclose(_dense(snapshot, order), _dense(reference, order))
+    assert np.allclose(_dense(snapshot, order), _dense(snapshot, order).T), "edges are symmetric"
+
+    ranked = snapshot.personalized_pagerank({"a": 1.0}, k=4, include_seeds=False)
+    assert ranked[0]['id'] == "b"
+    print("✅ Delta merge matches a full export")
+
+
+def test_refresh_reexports_after_eviction():
+    graph = _FakeGraph()
+    graph.add("a", "b", weight=0.9)
+    graph.add("a", "c", weight=0.4)
+    snapshot = GraphSnapshot()
+    snapshot.refresh(graph)
+
+    # A delta cannot see deletions: enforce_degree_cap must force a full export
+    time.sleep(0.002)
+    graph.evict("a", "c")
+    assert snapshot.refresh(graph)['kind'] == "full"
+    assert snapshot.adjacency[snapshot.index["a"], snapshot.index["c"]] == 0
+    assert snapshot.full_exports == 2
+
+    # Eviction already reflected: back to deltas
+    assert snapshot.refresh(graph)['kind'] == "delta"
+    print("✅ Eviction forces a full export")
+
+
+def test_refresh_reexports_after_incremental_eviction():
+    graph = _FakeGraph()
+    graph.add("a", "b", weight=0.9)
+    graph.add("a", "c", weight=0.4)
+    snapshot = GraphSnapshot()
+    snapshot.refresh(graph)
+
+    # No eviction on insert: marker untouched, refresh stays incremental
+    time.sleep(0.002)
+    graph.add("a", "d", weight=0.8)
+    assert _client(graph, evicted=0).link_semantic_neighbors("a", [{"id": "d", "similarity": 0.8}], max_degree=3) == 0
+    assert graph.get_edges_evicted_at() is None
+    assert snapshot.refresh(graph)['kind'] == "delta"
+
+    # Inserting "e" pushes "a" past its cap: link_semantic_neighbors drops a-c
+    time.sleep(0.002)
+    graph.add("a", "e", weight=0.7)
+    graph.evict("a", "c", stamp=False)  # Deleted by the client's query below
+    assert _client(graph, evicted=1).link_semantic_neighbors("a", [{"id": "e", "similarity": 0.7}], max_degree=3) == 1
+    assert graph.get_edges_evicted_at() is not None, "incremental eviction stamps the marker"
+
+    assert snapshot.refresh(graph)['kind'] == "full"
+    assert snapshot.adjacency[snapshot.index["a"], snapshot.index["c"]] == 0
+    assert snapshot.adjacency[snapshot.index["a"], snapshot.index["e"]] > 0
+    print("✅ Incremental eviction forces a full export")
+
+
+def test_snapshot_save_load():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        graph = _FakeGraph()
+        graph.add("a", "b", weight=0.9)
+        graph.add("b", "c", "NEXT")
+        snapshot = GraphSnapshot(next_weight=0.3)
+        snapshot.full_export(graph)
+
+        path = os.path.join(tmp_dir, "snapshot.npz")
+        snapshot.save(path)
+        loaded = GraphSnapshot(next_weight=0.3)
+        assert loaded.load(path)
+        assert loaded.ids == snapshot.ids and loaded.exported_at == snapshot.exported_at
+        assert np.allclose(loaded.adjacency.toarray(), snapshot.adjacency.toarray())
+        assert not GraphSnapshot(next_weight=0.5).load(path), "other next_weight = other graph"
+        print("✅ Snapshot save/load")
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    print("="*60)
+    print("🔬 GRAPH SNAPSHOT TESTS")
+    print("="*60)
+    test_delta_merge_matches_full_export()
+    test_refresh_reexports_after_eviction()
+    test_refresh_reexports_after_incremental_eviction()
+    test_snapshot_save_load()
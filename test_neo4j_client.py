@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Offline tests for Neo4jClient helpers that need no database
+
+Full-text query sanitizing and the retrieval cache (write generations,
+keys), against a fake driver. No Neo4j or API keys needed.
+
+Run: python3 test_neo4j_client.py   (or via pytest)
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from storage.neo4j_client import Neo4jClient, _escape_lucene
+
+
+class _FakeResult:
+    def __init__(self, records):
+        self.records = records
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def single(self):
+        return self.records[0] if self.records else None
+
+
+class _FakeSession:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query, params=None):
+        self.driver.runs += 1
+        if "MERGE (s:Summary" in str(getattr(query, "text", query)):
+            return _FakeResult([{"count": len(params['rows'])}])
+        return _FakeResult([dict(self.driver.row)])
+
+
+class _FakeDriver:
+    """Counts round trips; every read returns one retrieval row."""
+
+    def __init__(self):
+        self.runs = 0
+        self.row = {
+            "id": "p1", "content": "postgres vacuum", "speaker": "user", "type": "fact",
+            "concepts": [], "block_metadata": None, "timestamp": "2024-01-01T00:00:00",
+            "score": 0.9, "hop": 0, "via": None, "seed_count": 1, "total": 1
+        }
+
+    def session(self):
+        return _FakeSession(self)
+
+
+def _client(uri="bolt://fake:7687"):
+    """Neo4jClient over a fake driver; hybrid_search's two sides are counted stubs."""
+    client = Neo4jClient.__new__(Neo4jClient)
+    client.driver = _FakeDriver()
+    client.uri = uri
+    client._executor = None
+    client.side_calls = 0
+
+    def side(*args, **kwargs):
+        client.side_calls += 1
+        return [{"id": "p1", "content": "postgres vacuum", "similarity": 0.9, "lexical_score": 2.0}]
+
+    client.fulltext_search = side
+    client.vector_search = side
+    return client
+
+
+def test_fulltext_query_has_no_operators():
+    # Syntax characters are escaped one by one
+    assert _escape_lucene('title:"x" (a || b) && c*') == r'title\:\"x\" \(a \|\| b\) \&\& c\*'
+    assert _escape_lucene("-1 + 2 ~ ^3 / ?") == r"\-1 \+ 2 \~ \^3 \/ \?"
+    assert _escape_lucene(r"C:\temp") == r"C\:\\temp"
+
+    # Bare keywords become plain terms: "NOT" alone or "a OR" no longer parse as operators
+    assert _escape_lucene("NOT") == "not"
+    assert _escape_lucene("a OR") == "a or"
+    assert _escape_lucene("cats AND dogs NOT birds") == "cats and dogs not birds"
+    assert _escape_lucene("[1 TO 5]") == r"\[1 to 5\]"
+
+    # Only whole upper-case words: other words and lower-case text are untouched
+    assert _escape_lucene("ANDROID NOTE TOKYO") == "ANDROID NOTE TOKYO"
+    assert _escape_lucene("and or not") == "and or not"
+    assert _escape_lucene("   ") == ""
+    print("✅ Full-text query has no operators")
+
+
+def test_write_invalidates_cached_retrieval():
+    Neo4jClient.retrieval_cache.clear()
+    client = _client()
+    embedding = [0.1, 0.2, 0.3]
+
+    first = client.retrieve(embedding)
+    assert client.retrieve(embedding) is first and client.driver.runs == 1
+    fused = client.hybrid_search("postgres", embedding)
+    assert client.hybrid_search("postgres", embedding) is fused and client.side_calls == 2
+
+    # A write bumps the generation: both cached results are dropped
+    generation = Neo4jClient.retrieval_cache.generation
+    client.upsert_summaries([{"id": "s1", "cluster": 0, "version": 1, "content": "summary",
+                              "embedding": embedding, "size": 1, "member_ids": ["p1"]}])
+    assert Neo4jClient.retrieval_cache.generation == generation + 1
+    runs = client.driver.runs
+
+    assert client.retrieve(embedding) is not first and client.driver.runs == runs + 1
+    assert client.hybrid_search("postgres", embedding) is not fused and client.side_calls == 4
+
+    # So does an explicit invalidation (projector ack, storage node)
+    Neo4jClient.invalidate_retrieval_cache()
+    client.retrieve(embedding)
+    assert client.driver.runs == runs + 2
+    print("✅ Writes invalidate cached retrieval")
+
+
+def test_cache_keys_cover_arguments():
+    Neo4jClient.retrieval_cache.clear()
+    client = _client()
+    embedding = [0.1, 0.2, 0.3]
+
+    client.retrieve(embedding, max_hops=1)
+    client.retrieve(embedding, max_hops=2)
+    assert client.driver.runs == 2, "different kwargs, different keys"
+
+    # Defaults are bound: positional, keyword and omitted spell the same call
+    client.retrieve(embedding, 5, 1)
+    client.retrieve(query_embedding=embedding, seeds=5, max_hops=1)
+    assert client.driver.runs == 2
+
+    client.retrieve([0.1, 0.2, 0.31], max_hops=1)
+    assert client.driver.runs == 3, "embedding is part of the key"
+    other = _client("bolt://other:7687")
+    other.retrieve(embedding, max_hops=1)
+    assert other.driver.runs == 1, "so is the server"
+
+    client.hybrid_search("postgres", embedding)
+    client.hybrid_search("postgres", embedding, k=5)
+    client.hybrid_search("vacuum", embedding)
+    assert client.side_calls == 6
+    client.hybrid_search("postgres", embedding, 10)
+    assert client.side_calls == 6
+    print("✅ Cache keys cover every argument")
+
+
+if __name__ == "__main__":
+    print("="*60)
+    print("🔬 NEO4J CLIENT TESTS")
+    print("="*60)
+    test_fulltext_query_has_no_operators()
+    test_write_invalidates_cached_retrieval()
+    test_cache_keys_cover_arguments()
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""Offline tests for the local vector store, the IVF index, the
+offline kNN graph rebuild and cluster summaries
+
+No Neo4j or API keys needed.
+
+Run: python3 test_vector_store.py   (or via pytest)
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from storage.vector_store import LocalVectorStore
+from storage.ann_index import IVFIndex
+from storage.knn_graph import blocked_topk, rebuild_coherent_edges
+from storage.summaries import ClusterSummaries
+
+
+def _clustered(rng, n, dims=16, centers=8):
+    """n points around `centers` random directions."""
+    means = rng.normal(size=(centers, dims))
+    return means[rng.integers(0, centers, size=n)] + 0.1 * rng.normal(size=(n, dims))
+
+
+def _exact_ids(matrix, ids, query, k):
+    normed = matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+    scores = normed @ (query / np.linalg.norm(query))
+    return [ids[i] for i in np.argsort(-scores)[:k]]
+
+
+class _Batches:
+    """Stand-in archive for rebuild_from_archive (ids, matrix) batches."""
+
+    def __init__(self, ids, matrix):
+        self.ids, self.matrix = ids, matrix
+
+    def iter_embedding_batches(self, batch_size=10000, model=None):
+        for start in range(0, len(self.ids), batch_size):
+            yield self.ids[start:start + batch_size], self.matrix[start:start + batch_size]
+
+
+def test_knn_blocks_match_exact():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        rng = np.random.default_rng(2)
+        vectors = rng.normal(size=(1000, 16)).astype(np.float32)
+        ids = [f"p{i}" for i in range(1000)]
+
+        store = LocalVectorStore(os.path.join(tmp_dir, "vectors"), dimensions=16, block_rows=64)
+        assert store.append(ids, vectors) == 1000
+        assert store.append(ids[:10], vectors[:10]) == 0, "replayed ids are skipped"
+
+        for q in (0, 333, 999):
+            expected = _exact_ids(vectors, ids, vectors[q], 10)
+            assert [r['id'] for r in store.knn(vectors[q], k=10, min_similarity=-1.0)] == expected
+            # Per-call override and a block larger than the store agree
+            assert [r['id'] for r in store.knn(vectors[q], k=10, min_similarity=-1.0, block_rows=7)] == expected
+            assert [r['id'] for r in store.knn(vectors[q], k=10, min_similarity=-1.0, block_rows=10 ** 6)] == expected
+
+        results = store.knn(vectors[5], k=50, min_similarity=0.3)
+        assert results[0]['id'] == "p5" and np.isclose(results[0]['similarity'], 1.0, atol=1e-5)
+        assert all(r['similarity'] >= 0.3 for r in results)
+        assert [r['similarity'] for r in results] == sorted((r['similarity'] for r in results), reverse=True)
+        assert store.knn(vectors[0], k=0) == []
+
+        # Another process' view: same rows after reopening
+        reopened = LocalVectorStore(store.path, dimensions=16)
+        assert len(reopened) == 1000 and reopened.row_of("p42") == 42
+        assert np.allclose(reopened.get("p42"), vectors[42] / np.linalg.norm(vectors[42]), atol=1e-6)
+        print("✅ Blocked kNN matches exact search")
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_refresh_leaves_inflight_append_alone():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        rng = np.random.default_rng(3)
+        vectors = rng.normal(size=(6, 16)).astype(np.float32)
+        writer = LocalVectorStore(os.path.join(tmp_dir, "vectors"), dimensions=16)
+        writer.append(["p0", "p1", "p2"], vectors[:3])
+        reader = LocalVectorStore(writer.path, dimensions=16)
+
+        # Another process mid-append: vectors written, ids only partially
+        with open(writer.matrix_path, "ab") as f:
+            f.write(vectors[3:5].tobytes())
+        with open(writer.ids_path, "a", encoding="utf-8") as f:
+            f.write("p3\np")
+        matrix_bytes = os.path.getsize(writer.matrix_path)
+
+        reader.refresh()
+        assert reader.ids == ["p0", "p1", "p2", "p3"], "rows without a complete id stay hidden"
+        assert os.path.getsize(writer.matrix_path) == matrix_bytes, "readers never truncate"
+
+        with open(writer.ids_path, "a", encoding="utf-8") as f:
+            f.write("4\n")
+        reader.refresh()
+        assert reader.ids == ["p0", "p1", "p2", "p3", "p4"] and reader.row_of("p4") == 4
+
+        # A writer that died between the two writes is repaired by the next one
+        with open(writer.matrix_path, "ab") as f:
+            f.write(vectors[5:].tobytes())
+        assert writer.append(["p5"], vectors[5:]) == 1
+        assert writer.ids == ["p0", "p1", "p2", "p3", "p4", "p5"]
+        assert os.path.getsize(writer.matrix_path) == 6 * 16 * 4
+        assert np.allclose(writer.get("p5"), vectors[5] / np.linalg.norm(vectors[5]), atol=1e-6)
+        print("✅ Refresh leaves an in-flight append alone")
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_ivf_discarded_after_store_rebuild():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        rng = np.random.default_rng(0)
+        vectors = _clustered(rng, 400).astype(np.float32)
+        ids = [f"p{i}" for i in range(400)]
+
+        store = LocalVectorStore(os.path.join(tmp_dir, "vectors"), dimensions=16)
+        store.append(ids, vectors)
+        index = IVFIndex(store, nlist=8, nprobe=8, min_train_rows=10)
+        index.train()
+        assert index.is_trained and os.path.exists(index.meta_path)
+
+        # Reopening an unchanged store keeps the index
+        assert IVFIndex(LocalVectorStore(store.path, dimensions=16), nlist=8).is_trained
+
+        # Rebuild in reverse order: the old lists would point at the wrong rows
+        order = np.arange(400)[::-1]
+        store.rebuild_from_archive(_Batches([ids[i] for i in order], vectors[order]))
+
+        reopened = IVFIndex(LocalVectorStore(store.path, dimensions=16), nlist=8, min_train_rows=10 ** 6)
+        assert not reopened.is_trained, "stale IVF files must be discarded on load"
+        assert not os.path.exists(reopened.assign_path)
+
+        # The live instance falls back to exact search, then sync() retrains
+        query = vectors[7]
+        assert [r['id'] for r in index.search(query, k=5)] == _exact_ids(vectors, ids, query, 5)
+        assert index.sync() == 0, "training runs off the request path"
+        index.join_training()
+        assert index.is_trained and not index.is_training
+        assert [r['id'] for r in index.search(query, k=5)] == _exact_ids(vectors, ids, query, 5)
+        print("✅ IVF index discarded after store rebuild")
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_ivf_sync_trains_in_background():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        rng = np.random.default_rng(1)
+        vectors = _clustered(rng, 600).astype(np.float32)
+        ids = [f"p{i}" for i in range(600)]
+
+        store = LocalVectorStore(os.path.join(tmp_dir, "vectors"), dimensions=16)
+        index = IVFIndex(store, nlist=8, nprobe=2, min_train_rows=500)
+
+        store.append(ids[:400], vectors[:400])
+        assert index.sync() == 0 and not index.is_training, "below min_train_rows: stay exact"
+
+        store.append(ids[400:500], vectors[400:500])
+        index.sync()
+        # Exact results while (or before) the trainer runs
+        assert [r['id'] for r in index.search(vectors[3], k=5)] == _exact_ids(vectors[:500], ids[:500], vectors[3], 5)
+        index.join_training()
+        assert index.is_trained and index.get_stats()['indexed_rows'] == 500
+
+        # Rows appended after training go to the tails
+        store.append(ids[500:], vectors[500:])
+        assert index.sync() == 100
+        assert IVFIndex(LocalVectorStore(store.path, dimensions=16), nlist=8).get_stats()['indexed_rows'] == 600
+
+        hits = 0
+        for q in range(0, 600, 30):
+            truth = set(_exact_ids(vectors, ids, vectors[q], 10))
+            hits += len(truth & {r['id'] for r in index.search(vectors[q], k=10, nprobe=4)})
+        assert hits / (20 * 10) >= 0.9
+        print("✅ IVF background training + incremental sync")
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+class _FakeEdgeWriter:
+    """Undirected MERGE semantics of Neo4jClient.create_semantic_edges_batch."""
+
+    def __init__(self, fail_after=None):
+        self.edges = {}
+        self.calls = 0
+        self.fail_after = fail_after
+
+    def delete_semantic_edges(self):
+        deleted, self.edges = len(self.edges), {}
+        return deleted
+
+    def create_semantic_edges_batch(self, edges, created_by="rebuild"):
+        self.calls += 1
+        if self.fail_after is not None and self.calls > self.fail_after:
+            raise RuntimeError("connection lost")
+        created = 0
+        for e in edges:
+            key = frozenset((e['a'], e['b']))
+            created += key not in self.edges
+            self.edges[key] = e['weight']
+        return created
+
+
+def test_knn_graph_rebuild_counts_distinct_edges():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        rng = np.random.default_rng(3)
+        vectors = _clustered(rng, 300).astype(np.float32)
+        ids = [f"p{i}" for i in range(300)]
+        store = LocalVectorStore(os.path.join(tmp_dir, "vectors"), dimensions=16)
+        store.append(ids, vectors)
+
+        # blocked_topk == brute force, self excluded
+        normed = np.asarray(store.matrix)
+        full = normed @ normed.T
+        np.fill_diagonal(full, -np.inf)
+        for row_start, idx, scores in blocked_topk(store.matrix, 5, block_rows=64, block_cols=50):
+            for r in range(len(idx)):
+                a = row_start + r
+                assert set(idx[r]) == set(np.argsort(-full[a])[:5])
+                assert np.all(np.diff(scores[r]) <= 0)
+
+        expected = set()
+        for a in range(300):
+            for j in np.argsort(-full[a])[:5]:
+                if full[a, j] >= 0.8:
+                    expected.add(frozenset((ids[a], ids[j])))
+
+        checkpoint = os.path.join(tmp_dir, "rebuild.checkpoint.json")
+        neo4j = _FakeEdgeWriter()
+        result = rebuild_coherent_edges(neo4j, store, k=5, min_similarity=0.8,
+                                        checkpoint_path=checkpoint, block_rows=64)
+        assert set(neo4j.edges) == expected
+        assert result['edges_written'] == len(expected), "mutual pairs are counted once"
+        assert not os.path.exists(checkpoint)
+
+        # Interrupted run resumes from the checkpoint with the same totals
+        neo4j = _FakeEdgeWriter(fail_after=2)
+        try:
+            rebuild_coherent_edges(neo4j, store, k=5, min_similarity=0.8,
+                                   checkpoint_path=checkpoint, block_rows=64, write_batch_size=10 ** 6)
+            raise AssertionError("writer failure must propagate")
+        except RuntimeError:
+            pass
+        neo4j.fail_after = None
+        result = rebuild_coherent_edges(neo4j, store, k=5, min_similarity=0.8,
+                                        checkpoint_path=checkpoint, block_rows=64, write_batch_size=10 ** 6)
+        assert result['resumed_from'] == 128
+        assert set(neo4j.edges) == expected and result['edges_written'] == len(expected)
+        print("✅ kNN graph rebuild writes each undirected edge once")
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+class _FakeSummaryGraph:
+    """The Neo4jClient calls ClusterSummaries.refresh makes."""
+
+    def __init__(self):
+        self.summaries = {}  # id -> row (member_ids kept up to date)
+
+    def get_propositions(self, ids):
+        return {pid: {"id": pid, "content": f"content of {pid}"} for pid in ids}
+
+    def upsert_summaries(self, rows):
+        for row in rows:
+            self.summaries[row['id']] = {**row, "member_ids": list(row['member_ids'])}
+        return len(rows)
+
+    def add_summary_members(self, summary_id, ids, size):
+        self.summaries[summary_id]['member_ids'] += ids
+        self.summaries[summary_id]['size'] = size
+        return len(ids)
+
+    def delete_summaries(self, keep_version=None):
+        old = [sid for sid, row in self.summaries.items() if row['version'] != keep_version]
+        for sid in old:
+            del self.summaries[sid]
+        return len(old)
+
+
+def test_summaries_refresh_incremental_and_rebuild():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        rng = np.random.default_rng(4)
+        means = rng.normal(size=(4, 16)) * 3
+        labels = np.repeat(np.arange(4), 50)
+        vectors = (means[labels] + 0.1 * rng.normal(size=(200, 16))).astype(np.float32)
+        ids = [f"p{i}" for i in range(200)]
+
+        store = LocalVectorStore(os.path.join(tmp_dir, "vectors"), dimensions=16)
+        store.append(ids, vectors)
+        summaries = ClusterSummaries(store, clusters=4, min_cluster_size=5, max_members=10, stale_fraction=0.25)
+        graph = _FakeSummaryGraph()
+        calls = []
+
+        def summarize(contents):
+            calls.append(contents)
+            return f"summary of {len(contents)}"
+
+        def embed(texts):
+            return [[0.0] * 16 for _ in texts]
+
+        result = summaries.refresh(graph, summarize=summarize, embed=embed)
+        assert result['retrained'] and result['summarized'] == 4 and result['clusters'] == 4
+        assert all(len(contents) == 10 for contents in calls), "max_members most central"
+        members = sorted(pid for row in graph.summaries.values() for pid in row['member_ids'])
+        assert members == sorted(ids), "every row summarized exactly once"
+
+        # Small growth: new rows are linked, nothing re-summarized
+        calls.clear()
+        extra = (means[labels[:8]] + 0.1 * rng.normal(size=(8, 16))).astype(np.float32)
+        store.append([f"x{i}" for i in range(8)], extra)
+        result = summaries.refresh(graph, summarize=summarize, embed=embed)
+        assert not result['retrained'] and result['summarized'] == 0 and result['linked'] == 8 and not calls
+        assert sum(row['size'] for row in graph.summaries.values()) == 208
+
+        # A cluster growing past stale_fraction is re-summarized
+        grown = (means[[1] * 60] + 0.1 * rng.normal(size=(60, 16))).astype(np.float32)
+        store.append([f"g{i}" for i in range(60)], grown)
+        result = summaries.refresh(graph, summarize=summarize, embed=embed)
+        assert 1 <= result['summarized'] < 4 and len(calls) == result['summarized']
+        assert summaries.get_stats()['assigned_rows'] == 268
+
+        # Store rebuilt in another order: assignments are stale → retrain, old version deleted
+        version = result['version']
+        order = np.arange(200)[::-1]
+        store.rebuild_from_archive(_Batches([ids[i] for i in order], vectors[order]))
+        assert not summaries.get_stats()['trained']
+        result = summaries.refresh(graph, summarize=summarize, embed=embed)
+        assert result['retrained'] and result['version'] != version and result['deleted'] == 4
+        assert {row['version'] for row in graph.summaries.values()} == {result['version']}
+        assert sorted(pid for row in graph.summaries.values() for pid in row['member_ids']) == sorted(ids)
+        print("✅ Cluster summaries: incremental refresh + rebuild invalidation")
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    print("="*60)
+    print("🔬 VECTOR STORE TESTS")
+    print("="*60)
+    test_knn_blocks_match_exact()
+    test_refresh_leaves_inflight_append_alone()
+    test_ivf_discarded_after_store_rebuild()
+    test_ivf_sync_trains_in_background()
+    test_knn_graph_rebuild_counts_distinct_edges()
+    test_summaries_refresh_incremental_and_rebuild()